@@ -0,0 +1,217 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# Compare the page counts of PDF files read from their page tree (PdfInfo)
+# with the former search in the whole file (and pdftk), and time both.
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+
+import re
+import time
+import getopt
+
+import sys
+import os.path
+sys.path.append( os.path.join(os.path.dirname(os.path.dirname( os.path.abspath(__file__))), "src") )
+
+from TagPDF.pdfinfo import PdfInfo
+import TagPDF.utils as utils
+
+# ---------------------------------------------------------------------------
+
+
+def usage(output):
+    """
+    Print the usage on an output
+
+    @param output is a string representing the output (for example: sys.stdout)
+
+    """
+    output.write('bench-pages.py [options] where options are:\n')
+    output.write('      -i input                Input PDF file or directory of PDF files [REQUIRED]\n')
+    output.write('      -t "tool"               Reference program: pdftk or qpdf (Default: pdftk)\n')
+    output.write('      -v                      Print the page count of each file\n')
+    output.write('      --help                  Print this help\n\n')
+
+# End usage
+# ----------------------------------------------------------------------
+
+
+def Quit(message=None, status=0, usageoutput=None):
+    """
+    Quit the program with the appropriate exit status.
+
+    @param message is a text to communicate to the user on sys.stderr.
+    @param status is an integer of the status exit value.
+    @param usageoutput is a file descriptor.
+
+    """
+    if message: sys.stderr.write('bench-pages.py '+message)
+    if usageoutput: usage(usageoutput)
+    sys.exit(status)
+
+# End Quit
+# ----------------------------------------------------------------------
+
+
+def count_pdfinfo(filename):
+    """
+    Return the number of pages of a PDF file, from its page tree.
+
+    """
+    pdfinfo = PdfInfo( filename )
+    try:
+        return pdfinfo.get_pages()
+    finally:
+        pdfinfo.close()
+
+# End count_pdfinfo
+# ----------------------------------------------------------------------
+
+
+def count_former(filename, tool, spawns):
+    """
+    Return the number of pages of a PDF file as countPages did before
+    PdfInfo: the page objects are searched in the whole file, and the
+    external tool is run if none is found (in compressed object streams).
+
+    @param spawns (list) The name of the file is appended if the tool is run.
+
+    """
+    data = open(filename, "rb").read()
+    nbpages = len( re.findall(r"/Type\s*/Page([^s]|$)", data, re.MULTILINE|re.DOTALL) )
+    if nbpages == 0:
+        spawns.append( filename )
+        nbpages = tool.count_pages( filename )
+    return nbpages
+
+# End count_former
+# ----------------------------------------------------------------------
+
+
+def measure(function, filenames):
+    """
+    Apply a function to all files.
+
+    @return the results (a count, or None if the function failed), the
+    number of failures and the time.
+
+    """
+    results  = []
+    failures = 0
+    start = time.time()
+    for filename in filenames:
+        try:
+            results.append( function(filename) )
+        except Exception:
+            results.append( None )
+            failures += 1
+    return results, failures, time.time() - start
+
+# End measure
+# ----------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+
+    # ##################################################################### #
+    # Verify and extract args:
+    # ##################################################################### #
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "i:t:v", ["help"])
+    except getopt.GetoptError, err:
+        Quit(message="Error: "+str(err)+".\nUse option --help for any help.\n", status=1)
+
+    inputname = None
+    toolname  = "pdftk"
+    verbose   = False
+
+    for o, a in opts:
+        if o == "-i":
+            inputname = a
+        elif o == "-t":
+            toolname = a
+        elif o == "-v":
+            verbose = True
+        elif o == "--help":
+            Quit(message='Help', status=0, usageoutput=sys.stdout)
+
+    if inputname is None or not os.path.exists(inputname):
+        Quit(status=1, usageoutput=sys.stderr)
+    try:
+        tool = utils.get_pdf_tool( toolname )
+    except TypeError:
+        Quit(message="Error: unknown tool "+toolname+".\n", status=1)
+
+    if os.path.isdir(inputname):
+        filenames = [ os.path.join(inputname, f) for f in sorted(os.listdir(inputname)) if f.lower().endswith(".pdf") ]
+    else:
+        filenames = [ inputname ]
+    size = sum( os.path.getsize(f) for f in filenames )
+    sys.stdout.write('%d files, %.1f MB\n' % (len(filenames), size/1048576.))
+
+    # ##################################################################### #
+    # Count the pages, then compare with the tool
+    # ##################################################################### #
+    spawns = []
+    pdfinfo, failures, elapsed = measure( count_pdfinfo, filenames )
+    sys.stdout.write('PdfInfo:  %.3fs, %d files not read\n' % (elapsed, failures))
+    former, failures, elapsed = measure( lambda f: count_former(f, tool, spawns), filenames )
+    sys.stdout.write('Former:   %.3fs, %d files not read, %s run %d times\n' % (elapsed, failures, tool.name, len(spawns)))
+
+    reference = None
+    if tool.is_available():
+        reference, failures, elapsed = measure( tool.count_pages, filenames )
+        sys.stdout.write('%-9s %.3fs, %d files not read\n' % (tool.name+':', elapsed, failures))
+    else:
+        sys.stdout.write('%s is not installed: the counts are not checked.\n' % tool.name)
+
+    if verbose is True:
+        for i, filename in enumerate(filenames):
+            sys.stdout.write('%s: %s %s %s\n' % (filename, pdfinfo[i], former[i], reference[i] if reference else "-"))
+
+    if reference is not None:
+        for name, results in [ ("PdfInfo", pdfinfo), ("Former", former) ]:
+            wrong = [ f for f, n, r in zip(filenames, results, reference) if n is not None and r is not None and n != r ]
+            sys.stdout.write('%s: %d wrong counts\n' % (name, len(wrong)))
+            for filename in wrong:
+                sys.stdout.write('    %s\n' % filename)
+
+# ######################################################################### #
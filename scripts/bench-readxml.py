@@ -0,0 +1,192 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# Time the reading of a sciencesconf XML export, in memory and as a stream,
+# and write the documents read in a file to compare the readers.
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+
+import time
+import getopt
+import codecs
+
+import sys
+import os.path
+
+# ---------------------------------------------------------------------------
+
+
+def usage(output):
+    """
+    Print the usage on an output
+
+    @param output is a string representing the output (for example: sys.stdout)
+
+    """
+    output.write('bench-readxml.py [options] where options are:\n')
+    output.write('      -i input                Input XML file of sciencesconf [REQUIRED]\n')
+    output.write('      -s src                  Directory of the sources to use (Default: the src directory of this script)\n')
+    output.write('      -o output               Write the documents read in this file\n')
+    output.write('      -c reference            Compare the documents read with this file (written by -o)\n')
+    output.write('      --no-stream             Do not read the file as a stream\n')
+    output.write('      --help                  Print this help\n\n')
+
+# End usage
+# ----------------------------------------------------------------------
+
+
+def Quit(message=None, status=0, usageoutput=None):
+    """
+    Quit the program with the appropriate exit status.
+
+    @param message is a text to communicate to the user on sys.stderr.
+    @param status is an integer of the status exit value.
+    @param usageoutput is a file descriptor.
+
+    """
+    if message: sys.stderr.write('bench-readxml.py '+message)
+    if usageoutput: usage(usageoutput)
+    sys.exit(status)
+
+# End Quit
+# ----------------------------------------------------------------------
+
+
+def get_values(obj):
+    """
+    Return the attributes of a document (with its authors and laboratories)
+    as lists and tuples, in a stable order.
+
+    """
+    if isinstance(obj, list):
+        return [ get_values(v) for v in obj ]
+    if hasattr(obj, "__dict__"):
+        return tuple( (k, get_values(v)) for k, v in sorted(vars(obj).items()) )
+    return obj
+
+# End get_values
+# ----------------------------------------------------------------------
+
+
+def read(Reader, filename, stream):
+    """
+    Read all documents of a file.
+
+    @return the list of the values of the documents, and the time
+
+    """
+    start = time.time()
+    reader = Reader( { "readername":"sciencesconf", "filename":filename, "stream":stream } )
+    docs = [ repr(get_values(doc)) for doc in reader.docs ]
+    return docs, time.time() - start
+
+# End read
+# ----------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+
+    # ##################################################################### #
+    # Verify and extract args:
+    # ##################################################################### #
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "i:s:o:c:", ["help","no-stream"])
+    except getopt.GetoptError, err:
+        Quit(message="Error: "+str(err)+".\nUse option --help for any help.\n", status=1)
+
+    inputname  = None
+    srcdir     = os.path.join(os.path.dirname(os.path.dirname( os.path.abspath(__file__))), "src")
+    outputname = None
+    refname    = None
+    stream     = True
+
+    for o, a in opts:
+        if o == "-i":
+            inputname = a
+        elif o == "-s":
+            srcdir = a
+        elif o == "-o":
+            outputname = a
+        elif o == "-c":
+            refname = a
+        elif o == "--no-stream":
+            stream = False
+        elif o == "--help":
+            Quit(message='Help', status=0, usageoutput=sys.stdout)
+
+    if inputname is None or not os.path.exists(inputname):
+        Quit(status=1, usageoutput=sys.stderr)
+
+    # The reader of another version can be compared with -s
+    sys.path.append( srcdir )
+    from DataIO.Read.reader import Reader
+
+    # ##################################################################### #
+    # Read the documents, in memory then as a stream (if supported)
+    # ##################################################################### #
+    docs, elapsed = read( Reader, inputname, False )
+    sys.stdout.write('%d documents read in %.3fs\n' % (len(docs), elapsed))
+
+    if stream is True:
+        try:
+            streamdocs, elapsed = read( Reader, inputname, True )
+            sys.stdout.write('%d documents read as a stream in %.3fs\n' % (len(streamdocs), elapsed))
+            if streamdocs != docs:
+                sys.stdout.write('The documents read as a stream are different.\n')
+        except Exception, e:
+            sys.stdout.write('No stream reader: %s\n' % e)
+
+    # ##################################################################### #
+    # Save or compare the documents
+    # ##################################################################### #
+    if outputname is not None:
+        with codecs.open(outputname, "w", "utf-8") as fp:
+            for doc in docs:
+                fp.write( doc + "\n" )
+
+    if refname is not None:
+        with codecs.open(refname, "r", "utf-8") as fp:
+            refdocs = [ line.rstrip("\n") for line in fp ]
+        different = [ i for i in range(max(len(docs), len(refdocs))) if i >= len(docs) or i >= len(refdocs) or docs[i] != refdocs[i] ]
+        sys.stdout.write('%d documents different from %s\n' % (len(different), refname))
+        if len(different) > 0:
+            sys.exit(1)
+
+# ######################################################################### #
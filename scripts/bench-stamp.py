@@ -0,0 +1,221 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# SPPAS is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# SPPAS is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+# Stamp a header/footer on PDF files with each stamp backend (pdftk, qpdf,
+# python), and compare their time, the size and the pages of their output.
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+
+import time
+import shutil
+import getopt
+import tempfile
+
+import sys
+import os.path
+sys.path.append( os.path.join(os.path.dirname(os.path.dirname( os.path.abspath(__file__))), "src") )
+
+from TagPDF.tagPDF  import tagPdfFile
+from TagPDF.pdfinfo import PdfInfo
+import TagPDF.utils as utils
+
+# ---------------------------------------------------------------------------
+
+
+def usage(output):
+    """
+    Print the usage on an output
+
+    @param output is a string representing the output (for example: sys.stdout)
+
+    """
+    output.write('bench-stamp.py [options] where options are:\n')
+    output.write('      -i input                Input PDF file or directory of PDF files [REQUIRED]\n')
+    output.write('      -b "backends"           Stamp backends to compare (Default: "pdftk,qpdf,python")\n')
+    output.write('      -o output               Directory to keep the stamped files (one sub-directory per backend)\n')
+    output.write('      --direct                Write the header/footer without pdflatex if possible\n')
+    output.write('      --help                  Print this help\n\n')
+
+# End usage
+# ----------------------------------------------------------------------
+
+
+def Quit(message=None, status=0, usageoutput=None):
+    """
+    Quit the program with the appropriate exit status.
+
+    @param message is a text to communicate to the user on sys.stderr.
+    @param status is an integer of the status exit value.
+    @param usageoutput is a file descriptor.
+
+    """
+    if message: sys.stderr.write('bench-stamp.py '+message)
+    if usageoutput: usage(usageoutput)
+    sys.exit(status)
+
+# End Quit
+# ----------------------------------------------------------------------
+
+
+def count_pages(filename, tool):
+    """
+    Return the number of pages of a PDF file, read by the tool if it is
+    installed (the reference), or from the page tree.
+
+    """
+    if tool.is_available():
+        return tool.count_pages( filename )
+    pdfinfo = PdfInfo( filename )
+    try:
+        return pdfinfo.get_pages()
+    finally:
+        pdfinfo.close()
+
+# End count_pages
+# ----------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+
+    # ##################################################################### #
+    # Verify and extract args:
+    # ##################################################################### #
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "i:b:o:", ["help","direct"])
+    except getopt.GetoptError, err:
+        Quit(message="Error: "+str(err)+".\nUse option --help for any help.\n", status=1)
+
+    tagpdf = tagPdfFile()
+    tagpdf.set_center_header("Proceed")
+    tagpdf.set_direct_pdf(False)
+
+    inputname = None
+    outputdir = None
+    backends  = ["pdftk", "qpdf", "python"]
+
+    for o, a in opts:
+        if o == "-i":
+            inputname = a
+        elif o == "-b":
+            backends = a.split(",")
+        elif o == "-o":
+            outputdir = a
+        elif o == "--direct":
+            tagpdf.set_direct_pdf(True)
+        elif o == "--help":
+            Quit(message='Help', status=0, usageoutput=sys.stdout)
+
+    if inputname is None or not os.path.exists(inputname):
+        Quit(status=1, usageoutput=sys.stderr)
+    for backend in backends:
+        if backend not in tagpdf.get_list_stamp_backends():
+            Quit(message="Error: unknown stamp backend "+backend+".\n", status=1)
+    for backend in [ b for b in backends if b in ["pdftk", "qpdf"] ]:
+        if not utils.get_pdf_tool(backend).is_available():
+            sys.stderr.write('%s is not installed: it is not compared.\n' % backend)
+            backends.remove( backend )
+    tool = utils.get_pdf_tool("pdftk")
+
+    if os.path.isdir(inputname):
+        filenames = [ os.path.join(inputname, f) for f in sorted(os.listdir(inputname)) if f.lower().endswith(".pdf") ]
+    else:
+        filenames = [ inputname ]
+
+    workdir = tempfile.mkdtemp()
+    if outputdir is None:
+        outputdir = workdir
+    for backend in backends:
+        if not os.path.exists( os.path.join(outputdir, backend) ):
+            os.makedirs( os.path.join(outputdir, backend) )
+
+    # ##################################################################### #
+    # Create the header/footer of each file, then stamp it with each backend
+    # ##################################################################### #
+    results = dict( (backend, { "done":0, "time":0., "size":0, "failed":[], "wrong":[] }) for backend in backends )
+    inputsize = 0
+    try:
+        for i, filename in enumerate(filenames):
+            try:
+                pages = count_pages( filename, tool )
+                tagpdf.set_page_number( i+1 )
+                tagpdf.set_number_of_pages( pages )
+                overlay = os.path.join(workdir, "overlay%d.pdf" % i)
+                tagpdf.exportPDF( overlay )
+            except Exception, e:
+                sys.stderr.write('%s: no header/footer. %s\n' % (filename, e))
+                continue
+            inputsize += os.path.getsize( filename )
+
+            for backend in backends:
+                tagpdf.set_stamp_backend( backend )
+                outputname = os.path.join(outputdir, backend, os.path.basename(filename))
+                start = time.time()
+                try:
+                    tagpdf.stampFile( filename, overlay, outputname )
+                except Exception, e:
+                    results[backend]["failed"].append( filename )
+                    continue
+                results[backend]["done"] += 1
+                results[backend]["time"] += time.time() - start
+                results[backend]["size"] += os.path.getsize( outputname )
+                try:
+                    if count_pages( outputname, tool ) != pages:
+                        results[backend]["wrong"].append( filename )
+                except Exception:
+                    results[backend]["wrong"].append( filename )
+    finally:
+        shutil.rmtree( workdir, True )
+
+    # ##################################################################### #
+    # Print the results
+    # ##################################################################### #
+    sys.stdout.write('%d files, %.1f MB\n' % (len(filenames), inputsize/1048576.))
+    if not tool.is_available():
+        sys.stdout.write('pdftk is not installed: pages are counted with PdfInfo.\n')
+    for backend in backends:
+        r = results[backend]
+        done = r["done"]
+        sys.stdout.write('%-6s %3d files stamped in %.3fs (%.1f files/s), %.1f MB, %d failed, %d wrong page counts\n' % (backend, done, r["time"], done/r["time"] if r["time"] > 0 else 0., r["size"]/1048576., len(r["failed"]), len(r["wrong"])))
+        for filename in r["failed"]:
+            sys.stdout.write('    failed: %s\n' % filename)
+        for filename in r["wrong"]:
+            sys.stdout.write('    wrong page count: %s\n' % filename)
+
+# ######################################################################### #
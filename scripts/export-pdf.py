@@ -47,6 +47,7 @@ export the toc, merge submissions, the program, the list/index of authors.
 
 # ---------------------------------------------------------------------------
 
+import csv
 import getopt
 import logging
 from logging import info as loginfo
@@ -72,6 +73,16 @@ def usage(output):
     output.write('export-PDF.py [options] where options are:\n')
     output.write('      -i folder           Input folder (CSV + PDF)        [required] \n')
     output.write('      -S style name       One of: taln-actes, taln-abstracts, simple [default=simple]\n')
+    output.write('      -j workers          Number of files tagged at the same time, 0=one per processor [default=1]\n')
+    output.write('      --batch             Compile headers/footers of all files in a single LaTeX document\n')
+    output.write('      --book              Compile all documents in a single book (Proceedings.pdf)\n')
+    output.write('      --direct            Write the headers/footers without pdflatex if possible\n')
+    output.write('      --latex-format      Compile the LaTeX packages once, in a format stored in the data directory\n')
+    output.write('      --cache             Re-use the tagged submissions of the previous runs if possible\n')
+    output.write('      --incremental       Generate a file again only if its content has changed\n')
+    output.write('      --shard i/N         Only tag the i-th of N shards of the submissions (i=1..N)\n')
+    output.write('      --merge-shards      Merge the submissions tagged by shards, and create the other files\n')
+    output.write('      --plan              Only plan the page numbers, and write them in Documents.csv\n')
     output.write('      --help              Print this help\n\n')
 
 # End usage
@@ -105,6 +116,32 @@ def findCSV(path,filename):
 
 
 
+def write_pages(filename, documents):
+    """
+    Write the page number of each document in the PAGE_NUMBER column of
+    a CSV file of documents. Other columns are not modified.
+
+    @param filename is the name of the CSV file (Documents.csv).
+    @param documents is a dictionary with key=docid, value=Document.
+
+    """
+    with open(filename, "rb") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+
+    with open(filename, "wb") as f:
+        writer = csv.DictWriter(f, fieldnames)
+        writer.writerow( dict( (name,name) for name in fieldnames ) )
+        for row in rows:
+            if row["DOCID"] in documents:
+                row["PAGE_NUMBER"] = str( documents[row["DOCID"]].get_page() )
+            writer.writerow( row )
+
+# End write_pages
+# ----------------------------------------------------------------------
+
+
 # ---------------------------------------------------------------------------
 # Setup a logger to communicate on the terminal, or a file.
 # ---------------------------------------------------------------------------
@@ -135,6 +172,28 @@ def setup_logging(log_level, filename):
             filename)
 
 
+def progress(text, num):
+    """
+    Print the progress of the PDF generation (notify function of pdf_writer).
+
+    @param text is the text of the current task (None if aborted).
+    @param num is the number of the task, or -1 if the generation stops:
+    text is then an error message, or empty if the generation is finished.
+
+    """
+    if num == -1:
+        if text is None or len(text) > 0:
+            logging.error(text or "Aborted.")
+            progress.failed = True
+    else:
+        loginfo("%d - %s", num, text)
+
+progress.failed = False
+
+# End progress
+# ----------------------------------------------------------------------
+
+
 # --------------------------------------------------------------------------
 # MAIN PROGRAM
 # --------------------------------------------------------------------------
@@ -157,13 +216,24 @@ if __name__:
 
     # Get options (if any...)
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "i:S:", ["help"])
+        opts, args = getopt.getopt(sys.argv[1:], "i:S:j:", ["help","batch","book","direct","latex-format","cache","incremental","plan","shard=","merge-shards"])
     except getopt.GetoptError, err:
         # Print help information and exit:
         Quit(message="Error: "+str(err)+".\nUse option --help for any help.\n", status=1)
 
     dirinput     = None
     stylename    = "simple"
+    workers      = None
+    batch        = False
+    book         = False
+    direct       = False
+    latexformat  = False
+    tagcache     = False
+    incremental  = False
+    plan         = False
+    shard        = None
+    shards       = 1
+    mergeshards  = False
 
     # Extract options
     for o, a in opts:
@@ -171,6 +241,31 @@ if __name__:
             dirinput = a
         elif o == "-S":
             stylename = a
+        elif o == "-j":
+            workers = int(a)
+        elif o == "--batch":
+            batch = True
+        elif o == "--book":
+            book = True
+        elif o == "--direct":
+            direct = True
+        elif o == "--latex-format":
+            latexformat = True
+        elif o == "--cache":
+            tagcache = True
+        elif o == "--incremental":
+            incremental = True
+        elif o == "--plan":
+            plan = True
+        elif o == "--shard":
+            try:
+                shard, shards = [ int(v) for v in a.split("/") ]
+            except ValueError:
+                shard = 0
+            if shard < 1 or shard > shards:
+                Quit(message="Error: BAD shard: "+a+". Expected: i/N with i=1..N.\n", status=1)
+        elif o == "--merge-shards":
+            mergeshards = True
         elif o == "--help": # need help
             Quit(message='Help', status=0, usageoutput=sys.stdout)
 
@@ -182,69 +277,19 @@ if __name__:
     else:
         Quit(message="Error: an input is required.\n.", status=1, usageoutput=sys.stderr)
 
+    if shard is not None and mergeshards is True:
+        Quit(message="Error: --shard and --merge-shards can not be used together.\n", status=1, usageoutput=sys.stderr)
+
 
     # ----------------------------------------------------------------------
     # Load input data
     # ----------------------------------------------------------------------
-    docreader     = readers.documents_csv_reader( os.path.join(dirinput,findCSV(dirinput,"Documents")) )
-    sessionreader = readers.sessions_csv_reader( os.path.join(dirinput,findCSV(dirinput,"Sessions") ))
-    author_reader = readers.authors_csv_reader( os.path.join(dirinput,findCSV(dirinput,"Authors")) )
-
-    DocDict     = dict()
-    SessionDict = dict()
-    AuthorDict  = dict()
-
-    for docid in docreader.get_all_ids():
-
-        authorslist = []
-        session     = ""
-        title       = ""
-        rank        = ""
-        page_number = ""
-
-        for row in docreader.get_ById(docid):
-
-            author = docreader.get_Author(row)
-            if author not in AuthorDict.keys():
-                authorslist.append(author)
-
-            if session == "" and docreader.get_Session(row) != "":
-                session = docreader.get_Session(row)
-                if session not in SessionDict.keys():
-                    SessionDict[session.get_sessionid()] = session
-
-            if title == "" and docreader.get_DocTitle(row) != "":
-                title = docreader.get_DocTitle(row)
-
-            if rank == "" and docreader.get_Rank(row) != "":
-                rank = docreader.get_Rank(row)
-
-            if page_number == "" and docreader.get_NumPage(row) != "":
-                page_number = docreader.get_NumPage(row)
-
-        doc = Document(docid, title, authorslist, session, rank, page_number)
-        DocDict[doc.get_docid()] = doc
+    DocDict, SessionDict, AuthorDict = readers.read_csv_files( os.path.join(dirinput,findCSV(dirinput,"Documents")),
+                                                               os.path.join(dirinput,findCSV(dirinput,"Sessions")),
+                                                               os.path.join(dirinput,findCSV(dirinput,"Authors")) )
 
     logging.info( "Number of documents: %d"%len(DocDict.keys()))
-
-
-    for sessionid in sessionreader.get_AllId():
-        session_row = sessionreader.get_ById(sessionid)[0]
-        session     = Session(sessionid, sessionreader.get_SessionName(session_row), sessionreader.get_Rank(session_row), sessionreader.get_Date(session_row), sessionreader.get_Heure_Deb(session_row), sessionreader.get_Heure_Fin(session_row), sessionreader.get_Chairman(session_row), sessionreader.get_Location(session_row))
-        SessionDict[sessionid] = session
-
     logging.info( "Number of sessions: %d"%len(SessionDict.keys()))
-
-
-    for lastname, firstname in author_reader.get_all_names():
-        rowList = author_reader.get_ByNames(lastname, firstname)
-        a_row = rowList.pop()
-        auth = Author(lastname,firstname, author_reader.get_email(a_row), author_reader.get_Affiliation(a_row))
-        for row in rowList: ### all the authors which have the same name !!
-            Other_auth = Author(lastname,firstname, author_reader.get_email(row), author_reader.get_Affiliation(row))
-            auth.compare_and_update(Other_auth)## we use this function because there could be the same other twice in the AUTHORS.csv file, so we merge the information
-        AuthorDict[auth.get_authorid()] = auth
-
     logging.info( "Number of authors: %d"%len(AuthorDict.keys()))
 
 
@@ -257,15 +302,53 @@ if __name__:
     else:
         prefs.SetTheme(0)
 
+    if workers is not None:
+        prefs.SetValue('NUMBER_OF_WORKERS', 'int', workers)
+    if batch is True:
+        prefs.SetValue('BATCH_TAGGING', 'bool', True)
+    if book is True:
+        prefs.SetValue('BOOK_MODE', 'bool', True)
+    if direct is True:
+        prefs.SetValue('DIRECT_OVERLAY', 'bool', True)
+    if latexformat is True:
+        prefs.SetValue('LATEX_FORMAT', 'bool', True)
+    if tagcache is True:
+        prefs.SetValue('TAG_CACHE', 'bool', True)
+    if incremental is True:
+        prefs.SetValue('INCREMENTAL_BUILD', 'bool', True)
+
 
     logging.info( "Create pdf_writer")
-    pdfwriter = pdf_writer(None, prefs, DocDict, AuthorDict, SessionDict, dirinput)
+    pdfwriter = pdf_writer(progress, prefs, DocDict, AuthorDict, SessionDict, dirinput)
+    if shard is not None:
+        pdfwriter.set_shard(shard-1, shards)
+    pdfwriter.set_merge_shards(mergeshards)
+
+
+    # ----------------------------------------------------------------------
+    # Dry run: write the page numbers only
+    # ----------------------------------------------------------------------
 
+    if plan is True:
+        pagination = pdfwriter.plan()
+        if pagination is None:
+            Quit(message="Error: the page numbers can not be planned.\n", status=1)
+        for name in pagination.get_names():
+            first = pagination.get_first_page(name)
+            last  = pagination.get_last_page(name)
+            if last is not None:
+                logging.info( "%s: pages %d-%d"%(name,first,last) )
+            elif first is not None:
+                logging.info( "%s: from page %d"%(name,first) )
+        write_pages( os.path.join(dirinput,findCSV(dirinput,"Documents")), DocDict )
+        Quit(status=0)
 
     # ----------------------------------------------------------------------
     # Write output data (with default parameters)
     # ----------------------------------------------------------------------
 
     pdfwriter.run()
+    if progress.failed is True:
+        Quit(message="Error: the PDF generation failed.\n", status=1)
 
     # ----------------------------------------------------------------------
@@ -169,6 +169,7 @@ if __name__:
     arguments = {}
     arguments['readername'] = readername
     arguments['filename']   = fileinput
+    arguments['stream']     = True
     arguments['authorsfilename'] = authorsinput
     reader = Reader( arguments )
 
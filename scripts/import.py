@@ -158,6 +158,7 @@ if __name__:
     arguments = {}
     arguments['readername'] = readername
     arguments['filename']   = fileinput
+    arguments['stream']     = True
     reader = Reader( arguments )
 
 
@@ -76,8 +76,10 @@ def usage(output):
     output.write('      -S "style"              Footer style\n')
     output.write('      -g "R,G,B"              Header color; Red,Green,Blue (Default: "200,200,200") \n')
     output.write('      -G "R,G,B"              Footer colot; Red,Green,Blue (Default: "200,200,200") \n')
+    output.write('      -b "backend"            Program to stamp the header/footer: auto, pdftk, qpdf or python (Default: auto)\n')
     output.write('      --hrule                 Add a rule to separate the header\n')
     output.write('      --frule                 Add a rule to separate the footer\n')
+    output.write('      --direct                Write the header/footer without pdflatex if possible\n')
     output.write('      --help                  Print this help\n\n')
 
 # End usage
@@ -112,7 +114,7 @@ if __name__ == "__main__":
 
     # Get options (if any...)
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "l:c:r:L:C:R:p:n:s:S:g:G:o:i:", ["help","hrule","frule"])
+        opts, args = getopt.getopt(sys.argv[1:], "l:c:r:L:C:R:p:n:s:S:g:G:b:o:i:", ["help","hrule","frule","direct"])
     except getopt.GetoptError, err:
         # Print help information and exit:
         Quit(message="Error: "+str(err)+".\nUse option -h for any help.\n", status=1)
@@ -154,10 +156,14 @@ if __name__ == "__main__":
                 tagpdf.set_header_rule(True)
             elif o == "--frule":
                 tagpdf.set_footer_rule(True)
+            elif o == "--direct":
+                tagpdf.set_direct_pdf(True)
             elif o == "-g":
                 tagpdf.set_header_color(a)
             elif o == "-G":
                 tagpdf.set_footer_color(a)
+            elif o == "-b":
+                tagpdf.set_stamp_backend(a)
             elif o == "-i":
                 inputname = a
             elif o == "-o":
@@ -173,6 +179,10 @@ if __name__ == "__main__":
             for i in tagpdf.get_list_textstyles():
                 sys.stderr.write("        \\"+i+"\n")
             sys.stderr.write("\n")
+            sys.stderr.write('List of accepted stamp backends: \n')
+            for i in tagpdf.get_list_stamp_backends():
+                sys.stderr.write("        "+i+"\n")
+            sys.stderr.write("\n")
             Quit(status=1, usageoutput=sys.stderr)
 
     if inputname is None or outputname is None:
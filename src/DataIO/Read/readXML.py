@@ -43,6 +43,7 @@ __docformat__ = "epytext"
 # ---------------------------------------------------------------------------
 
 import xml.dom.minidom
+import xml.etree.ElementTree as ElementTree
 import codecs
 import sys
 import os.path
@@ -66,7 +67,7 @@ class readXML( readGeneric ):
     """
 
     def __init__( self ):
-        pass
+        self.children = dict()
 
 
     # overwrite
@@ -88,109 +89,127 @@ class readXML( readGeneric ):
         return self.dom.getElementsByTagName(tagName)
 
 
+    def get_Children ( self , parentTag , tagName ):
+        """
+        Return the list of child elements of parentTag named tagName.
+
+        Children of a node are indexed by their name the first time this
+        node is explored: the whole tree is then walked only once.
+
+        """
+        if not parentTag in self.children:
+            index = dict()
+            for node in parentTag.childNodes:
+                if node.nodeType == node.ELEMENT_NODE:
+                    index.setdefault(node.tagName, list()).append(node)
+            self.children[parentTag] = index
+
+        return self.children[parentTag].get(tagName, [])
+
+
+    def get_GrandChildren ( self , parentTag , tagName ):
+        """
+        Return the list of elements named tagName, which are children
+        of a child of parentTag.
+
+        """
+        res = list()
+        for node in parentTag.childNodes:
+            if node.nodeType == node.ELEMENT_NODE:
+                res.extend( self.get_Children( node , tagName ) )
+        return res
+
+
     def createDocuments ( self ):
 
+        self.children = dict()
         documentsTab = list()
         docTab = self.get_ByTagName ("document")
 
         for doc in docTab:
+            documentsTab.append( self.create_Document( doc ) )
 
-            newDoc = document( doc.getAttribute("docid") )
-            newDoc.set_status( doc.getAttribute("status") )
-
-            metaDataTab = self.get_ByTagName('metadata')
+        self.children = dict()
+        return documentsTab
 
-            for metadata in metaDataTab:
 
-                if ( metadata.parentNode == doc ):
+    def create_Document ( self , doc ):
 
-                    title = self.get_Info_Str(    metadata , 'title' )
-                    abstract = self.get_Info_Str( metadata , 'abstract' )
-                    subject = self.get_Info_Str(  metadata , 'subject' )
-                    topics = self.get_Info_List(  metadata , 'topic' )
-                    keywords = self.get_Info_List ( metadata , 'keyword' )
+        newDoc = document( self.get_Attribute( doc , "docid" ) )
+        newDoc.set_status( self.get_Attribute( doc , "status" ) )
 
-                    newDoc.set_title ( title )
-                    newDoc.set_abstract ( abstract )
-                    newDoc.set_subject ( subject )
-                    newDoc.set_topics ( topics )
-                    newDoc.set_keywords ( keywords )
+        for metadata in self.get_Children( doc , 'metadata' ):
 
+            title = self.get_Info_Str(    metadata , 'title' )
+            abstract = self.get_Info_Str( metadata , 'abstract' )
+            subject = self.get_Info_Str(  metadata , 'subject' )
+            topics = self.get_Info_List(  metadata , 'topic' )
+            keywords = self.get_Info_List ( metadata , 'keyword' )
 
-            authorsTab = self.get_ByTagName( "authors" )
+            newDoc.set_title ( title )
+            newDoc.set_abstract ( abstract )
+            newDoc.set_subject ( subject )
+            newDoc.set_topics ( topics )
+            newDoc.set_keywords ( keywords )
 
-            for authors in authorsTab:
+        for authors in self.get_Children( doc , "authors" ):
 
-                if ( authors.parentNode == doc ):
-                    authorList = self.get_Authors( authors , doc )
-                    newDoc.set_authors( authorList )
+            authorList = self.get_Authors( authors , doc )
+            newDoc.set_authors( authorList )
 
-            newDoc.set_laboratory(self.get_Labo(doc))
+        newDoc.set_laboratory(self.get_Labo(doc))
 
-            documentsTab.append(newDoc)
-
-        return documentsTab
+        return newDoc
 
 
 
     def get_Authors ( self , authorsTag , parentTag ):
 
         authorsList = list()
-        authorTab =self.get_ByTagName( "author" )
+        authorTab = self.get_Children( authorsTag , "author" )
         maxOrdre = self.get_AuthorsMaxOrder( authorsTag )
 
-        i = 1
-
-        while ( i <= maxOrdre ):
-
-            for authors in authorTab:
+        # Authors sorted by their order (a stable sort keeps the file order
+        # of authors with the same order)
+        orders = [ int(self.get_Attribute( authors , 'order' )) for authors in authorTab ]
+        sortedTab = [ authorTab[k] for k in sorted(range(len(authorTab)), key=lambda k: orders[k]) if 1 <= orders[k] <= maxOrdre ]
 
-                if ( authors.parentNode != authorsTag ):
-                    continue
+        for authors in sortedTab:
 
-                if ( int(authors.getAttribute( 'order' ) ) != i ):
-                    continue
+            newAuthor = author( int(self.get_Attribute( authors , 'order' )) )
 
-                # i == int(author.getAttribute( 'order' ) )
-                newAuthor = author( i )
+            lastname    = self.get_Info_Str ( authors , 'lastname' )
+            middlename  = self.get_Info_Str ( authors , 'middlename' )
+            firstname   = self.get_Info_Str ( authors , 'firstname' )
+            email       = self.get_Info_Str ( authors , 'email' )
+            url         = self.get_Info_Str ( authors , 'url' )
+            speaker     = self.get_Info_Str ( authors , 'speaker' )
+            corresponding = self.get_Info_Str ( authors , 'corresponding' )
+            researchTeam  = self.get_Info_Str ( authors , 'researchteam' )
 
-                lastname    = self.get_Info_Str ( authors , 'lastname' )
-                middlename  = self.get_Info_Str ( authors , 'middlename' )
-                firstname   = self.get_Info_Str ( authors , 'firstname' )
-                email       = self.get_Info_Str ( authors , 'email' )
-                url         = self.get_Info_Str ( authors , 'url' )
-                speaker     = self.get_Info_Str ( authors , 'speaker' )
-                corresponding = self.get_Info_Str ( authors , 'corresponding' )
-                researchTeam  = self.get_Info_Str ( authors , 'researchteam' )
+            laboList = self.get_Author_labidx ( authors  )
 
-                laboList = self.get_Author_labidx ( authors  )
+            newAuthor.set_lastname(lastname)
+            newAuthor.set_middlename(middlename)
+            newAuthor.set_firstname(firstname)
+            newAuthor.set_email(email)
+            newAuthor.set_url(url)
+            newAuthor.set_speaker(speaker)
+            newAuthor.set_corresponding(corresponding)
+            newAuthor.set_labos(laboList)
+            newAuthor.set_researchTeam(researchTeam)
 
-                newAuthor.set_lastname(lastname)
-                newAuthor.set_middlename(middlename)
-                newAuthor.set_firstname(firstname)
-                newAuthor.set_email(email)
-                newAuthor.set_url(url)
-                newAuthor.set_speaker(speaker)
-                newAuthor.set_corresponding(corresponding)
-                newAuthor.set_labos(laboList)
-                newAuthor.set_researchTeam(researchTeam)
+            authorsList.append(newAuthor)
 
-                authorsList.append(newAuthor)
-
-            i += 1
         return authorsList
 
 
     def get_Author_labidx ( self , authorTag ):
 
         numLabo_Author = list()
-        laboAuthorTab = self.get_ByTagName('labidx')
-
-        for laboId in laboAuthorTab:
-
-            if ( laboId.parentNode == authorTag ):
-                numLabo_Author.append( self.getText(laboId.childNodes) )
 
+        for laboId in self.get_Children( authorTag , 'labidx' ):
+            numLabo_Author.append( self.get_Text( laboId ) )
 
         #return laboList
         return numLabo_Author
@@ -200,15 +219,9 @@ class readXML( readGeneric ):
 
         laboList = list()
 
-        laboDoc = self.get_ByTagName("laboratory")
-
-        for labo in laboDoc:
-
-            if ( labo.parentNode.parentNode != docTag ):
-                continue
+        for labo in self.get_GrandChildren( docTag , "laboratory" ):
 
-            #else
-            num = labo.getAttribute('labidx')
+            num = self.get_Attribute( labo , 'labidx' )
             name  = self.get_Info_Str ( labo , 'name')
             sigle  = self.get_Info_Str ( labo , 'sigle')
             country  = self.get_Info_Str ( labo , 'country')
@@ -231,30 +244,27 @@ class readXML( readGeneric ):
 
     def get_AuthorsMaxOrder ( self , authorTag ):
 
-        authorTab =self.get_ByTagName( "author" )
         res = 0
 
-        for author in authorTab:
+        for author in self.get_Children( authorTag , "author" ):
 
-            if ( author.parentNode == authorTag ):
-                if ( int(author.getAttribute( 'order' ) ) > res ):
-                    res = int(author.getAttribute( 'order' ) )
+            if ( int(self.get_Attribute( author , 'order' ) ) > res ):
+                res = int(self.get_Attribute( author , 'order' ) )
 
         return res
 
 
     def get_Info_Str ( self , parentTag , info ):
 
-
         res = ""
-        tagTab = self.get_ByTagName(info)
-
-        for tag in tagTab:
+        tagTab = self.get_Children( parentTag , info )
 
-            if ( tag.parentNode == parentTag ):
-                res = self.getText(tag.childNodes)
-                if ( info == "abstract"):
-                    res = tag.firstChild.wholeText
+        # The last tag is used
+        if len(tagTab) > 0:
+            tag = tagTab[-1]
+            res = self.get_Text( tag )
+            if ( info == "abstract"):
+                res = self.get_FirstText( tag )
 
         return unicode(res)
 
@@ -263,14 +273,25 @@ class readXML( readGeneric ):
 
         res = list()
 
-        tagTab = self.get_ByTagName(info)
+        for tag in self.get_GrandChildren( parentTag , info ):
+            res.append(self.get_Text( tag ))
 
-        for tag in tagTab:
+        return res
 
-            if ( tag.parentNode.parentNode == parentTag ):
-                res.append(self.getText(tag.childNodes))
 
-        return res
+    def get_Attribute ( self , tag , name ):
+
+        return tag.getAttribute( name )
+
+
+    def get_Text ( self , tag ):
+
+        return self.getText( tag.childNodes )
+
+
+    def get_FirstText ( self , tag ):
+
+        return tag.firstChild.wholeText
 
 
     def getText(self ,nodelist):
@@ -286,6 +307,140 @@ class readXML( readGeneric ):
 
 
 
+# ---------------------------------------------------------------------------
+
+
+class TextTreeBuilder( ElementTree.TreeBuilder ):
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Element tree builder which keeps the character data outside CDATA.
+
+    ElementTree merges the CDATA sections into the text of the elements,
+    but minidom does not return them with the text nodes. The character
+    data of each element (its text and the tail of its children) outside
+    CDATA sections is added to the chardata list of the element.
+
+    """
+
+    def __init__(self):
+        """
+        Creates a new TextTreeBuilder instance.
+
+        """
+        ElementTree.TreeBuilder.__init__(self)
+        self._path  = []
+        self._cdata = False
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def start(self, tag, attrs):
+        elem = ElementTree.TreeBuilder.start(self, tag, attrs)
+        elem.chardata = []
+        self._path.append( elem )
+        return elem
+
+
+    def end(self, tag):
+        self._path.pop()
+        return ElementTree.TreeBuilder.end(self, tag)
+
+
+    def data(self, data):
+        ElementTree.TreeBuilder.data(self, data)
+        if self._cdata is False and len(self._path) > 0:
+            self._path[-1].chardata.append( data )
+
+
+    def start_cdata(self):
+        self._cdata = True
+
+
+    def end_cdata(self):
+        self._cdata = False
+
+# ---------------------------------------------------------------------------
+
+
+class readXMLStream( readXML ):
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Read XML files from sciencesconf.org, one document at a time.
+
+    The file is parsed incrementally: each document is created when its
+    end tag is read, then its elements are freed. Memory does not depend
+    on the number of documents in the file.
+
+    """
+
+    # overwrite
+    def GetDocs ( self, filename, authorsfilename=None ):
+        """
+        Return a generator of document instances from filename.
+
+        @param filename is the XML submissions file name. This file contains all
+        information required to import data.
+
+        """
+        builder = TextTreeBuilder()
+        parser  = ElementTree.XMLParser( target=builder )
+        parser.parser.StartCdataSectionHandler = builder.start_cdata
+        parser.parser.EndCdataSectionHandler   = builder.end_cdata
+
+        path = list()
+        for event, elem in ElementTree.iterparse( filename, events=("start", "end"), parser=parser ):
+            if event == "start":
+                path.append( elem )
+                continue
+
+            path.pop()
+            if elem.tag == "document":
+                newDoc = self.create_Document( elem )
+                # free the document elements
+                elem.clear()
+                if len(path) > 0:
+                    path[-1].remove( elem )
+                yield newDoc
+
+
+    def get_Children ( self , parentTag , tagName ):
+
+        return [ node for node in parentTag if node.tag == tagName ]
+
+
+    def get_GrandChildren ( self , parentTag , tagName ):
+
+        res = list()
+        for node in parentTag:
+            res.extend( self.get_Children( node , tagName ) )
+        return res
+
+
+    def get_Attribute ( self , tag , name ):
+
+        return unicode( tag.get( name , "" ) )
+
+
+    def get_Text ( self , tag ):
+
+        # as getText: the text nodes, not the CDATA sections
+        return unicode( ''.join(tag.chardata) )
+
+
+    def get_FirstText ( self , tag ):
+
+        if tag.text is None:
+            raise AttributeError( "No text in tag "+tag.tag )
+        return unicode( tag.text )
+
+# ---------------------------------------------------------------------------
+
+
 # DEBUG:
 if ( __name__ == '__main__'):
 
@@ -55,6 +55,9 @@ class Reader():
     @license: GPL
     @summary: Fix the appropriate reader then load documents.
 
+    With the "stream" argument, documents are not loaded in memory: docs
+    can be iterated several times, and the file is read again each time.
+
     """
 
     def __init__(self, arguments={}):
@@ -65,7 +68,10 @@ class Reader():
             file2 = None
             if 'authorsfilename' in arguments.keys():
                 file2 = arguments['authorsfilename']
-            self._docs = self._reader.GetDocs( file1,file2 )
+            if arguments.get('stream', False) is True:
+                self._docs = StreamDocs( self._reader, file1, file2 )
+            else:
+                self._docs = self._reader.GetDocs( file1,file2 )
 
     # End __init__
     #-------------------------------------------------------------------------
@@ -76,6 +82,9 @@ class Reader():
         Return the reader depending on the reader name in arguments.
         """
         if arguments['readername'] == "sciencesconf":
+            if arguments.get('stream', False) is True:
+                from readXML import readXMLStream
+                return readXMLStream()
             from readXML import readXML
             return readXML()
 
@@ -103,3 +112,25 @@ class Reader():
     docs = property(__docs__)
 
     #-------------------------------------------------------------------------
+
+
+class StreamDocs():
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Documents of a file, read each time they are iterated.
+
+    """
+
+    def __init__(self, reader, filename, authorsfilename=None):
+        self._reader = reader
+        self._filename = filename
+        self._authorsfilename = authorsfilename
+
+    #-------------------------------------------------------------------------
+
+    def __iter__(self):
+        return iter( self._reader.GetDocs( self._filename, self._authorsfilename ) )
+
+    #-------------------------------------------------------------------------
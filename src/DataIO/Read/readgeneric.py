@@ -51,7 +51,8 @@ class readGeneric(object):
 
     def GetDocs(self, filename, authorsfilename=None):
         """
-        Return a list of document instances.
+        Return a list of document instances (or any iterable of document
+        instances, like a generator).
         """
         pass
 
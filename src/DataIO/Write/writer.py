@@ -59,6 +59,9 @@ class Writer:
     @license: GPL
     @summary: Fix the appropriate writer then write documents.
 
+    Documents are iterated once by each write method: they can be given
+    as a generator if only one file is written.
+
     """
 
     def __init__(self, docs):
@@ -42,7 +42,6 @@ __docformat__ = "epytext"
 # Imports
 # ---------------------------------------------------------------------------
 
-import wx
 import sys
 import os.path
 
@@ -84,15 +83,16 @@ BACKGROUND_COLOR = "#E3E3E3"
 ASK_BEFORE_EXIT  = False
     # Choose one of: True/False
 
-FONTFAMILY = wx.FONTFAMILY_DECORATIVE
-    # Choose one of:
-        #wx.FONTFAMILY_DEFAULT     Chooses a default font.
-        #wx.FONTFAMILY_DECORATIVE  A decorative font.
-        #wx.FONTFAMILY_ROMAN       A formal, serif font.
-        #wx.FONTFAMILY_SCRIPT      A handwriting font.
-        #wx.FONTFAMILY_SWISS       A sans-serif font.
-        #wx.FONTFAMILY_MODERN      Usually a fixed pitch font.
-        #wx.FONTFAMILY_TELETYPE    A teletype font.
+FONTFAMILY = 71 # wx.FONTFAMILY_DECORATIVE
+    # Value of a wx.FONTFAMILY_* (wx is not imported here: the models and
+    # the command-line scripts don't need it), choose one of:
+        #70 wx.FONTFAMILY_DEFAULT     Chooses a default font.
+        #71 wx.FONTFAMILY_DECORATIVE  A decorative font.
+        #72 wx.FONTFAMILY_ROMAN       A formal, serif font.
+        #73 wx.FONTFAMILY_SCRIPT      A handwriting font.
+        #74 wx.FONTFAMILY_SWISS       A sans-serif font.
+        #75 wx.FONTFAMILY_MODERN      Usually a fixed pitch font.
+        #76 wx.FONTFAMILY_TELETYPE    A teletype font.
 
 FONTSIZE = 10 # PointSize
 
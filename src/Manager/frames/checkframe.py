@@ -67,9 +67,11 @@ class CheckFrame( wx.Dialog ):
 
     """
 
-    def __init__(self, parent, id, title, documents, authors, sessions, path=None):
+    def __init__(self, parent, id, title, documents, authors, sessions, path=None, validator=None):
         """
         Create a new CheckFrame instance.
+
+        The validator of the data can be given, to not check all of them.
         """
         wx.Dialog.__init__(self, parent, id, title, size=(600, 500),style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
 
@@ -85,7 +87,9 @@ class CheckFrame( wx.Dialog ):
         myfont = wx.Font(pointSize=consts.FONTSIZE, family=consts.FONTFAMILY, style=wx.FONTSTYLE_NORMAL, weight=wx.FONTWEIGHT_NORMAL, encoding=wx.FONTENCODING_UTF8)
         self.txtCtrl.SetFont(myfont)
 
-        self.check( Validate( documents, authors, sessions ), path )
+        if validator is None:
+            validator = Validate( documents, authors, sessions )
+        self.check( validator, path )
 
         self.MainSizer.Add(self.txtCtrl,proportion=1,flag=wx.EXPAND|wx.BOTTOM, border=5)
 
@@ -51,7 +51,29 @@ import Manager.consts as consts
 from Manager.frames.export_settings import ExportSettings
 from Manager.models.prefs   import Preferences_IO
 from Manager.models.writers import pdf_writer
-from Manager.models.writers import EVT_RESULT
+
+# ---------------------------------------------------------------------------
+# Define notification event for thread completion
+# ---------------------------------------------------------------------------
+
+EVT_RESULT_ID = wx.NewId()
+
+
+def EVT_RESULT(win, func):
+    """ Define Result Event. """
+    win.Connect(-1, -1, EVT_RESULT_ID, func)
+  
+
+class ResultEvent(wx.PyEvent):
+    """ Simple event to carry result data. """
+
+    def __init__(self, text, num):
+        """Init Result Event."""
+
+        wx.PyEvent.__init__(self)
+        self.SetEventType(EVT_RESULT_ID)
+        self.tasktext = text
+        self.tasknum  = num
 
 # ---------------------------------------------------------------------------
 # Class
@@ -173,7 +195,7 @@ class GenerateFrame( wx.Dialog ):
             self.gauge.SetRange( 6 ) # number of files to generate!
             self.gauge.SetValue( 0 )
             
-            self.pdfwriter = pdf_writer(self, self._prefsIO, self.documents, self.authors, self.sessions, self.path)
+            self.pdfwriter = pdf_writer(self.PostResult, self._prefsIO, self.documents, self.authors, self.sessions, self.path)
             self.pdfwriter.start()
 
     # End OnOk
@@ -192,6 +214,15 @@ class GenerateFrame( wx.Dialog ):
     # -----------------------------------------------------------------------
   
   
+    def PostResult(self, text, num):
+        """ Send the progress of the worker thread to the GUI thread. """
+
+        wx.PostEvent(self, ResultEvent(text=text, num=num))
+
+    # End PostResult
+    # -----------------------------------------------------------------------
+
+
     def OnResult(self, event):
         """ Show current status. """
 
@@ -401,6 +401,7 @@ class ModifFrame( wx.Dialog ):
             ymd = map(int, setdate.FormatISODate().split('-'))
             setdate = datetime.date(*ymd)
             self.SessionObj.set_date( setdate )
+            self.parent.GetValidator().update_session( self.SessionObj.get_sessionid() )
 
 
     def OnEditorShown(self, e):
@@ -440,10 +441,12 @@ class ModifFrame( wx.Dialog ):
         elif ValueToChange == "rank":
             rank = CtrlObj.GetValue()
             self.DocObj.set_rank( int(rank) )
+        self.parent.GetValidator().update_document( self.DocObj.get_docid() )
 
 
     def OnChangeAuth(self, e, CtrlObj, ValueToChange):
 
+        authorid = self.AuthObj.get_authorid()
         if ValueToChange == 'lastname':
             self.AuthObj.set_lastname(CtrlObj.GetValue())
         elif ValueToChange == 'firstname':
@@ -453,6 +456,13 @@ class ModifFrame( wx.Dialog ):
         elif ValueToChange == 'affiliation':
             self.AuthObj.set_affiliation(CtrlObj.GetValue())
 
+        if ValueToChange in ['lastname', 'firstname']:
+            # the documents are indexed by the identifier of their authors
+            authorIndex = self.parent.GetAuthorIndex()
+            for docid in list(authorIndex.get_documents(authorid)):
+                authorIndex.remove_document( docid )
+                authorIndex.add_document( self.parent._dataPages['Documents'][docid] )
+
 
     def OnAddAuthor(self, e):
 
@@ -470,6 +480,7 @@ class ModifFrame( wx.Dialog ):
             authorList = self.DocObj.get_authors()
             authorList.append( author )
             self.DocObj.set_authors(authorList)
+            self.parent.GetAuthorIndex().add_document( self.DocObj )
             self.Refresh()
 
         AddAuthorWindow.Destroy()
@@ -495,6 +506,7 @@ class ModifFrame( wx.Dialog ):
 
         elif ValueToChange == "rank":
             self.SessionObj.set_rank( CtrlObj.GetValue() )
+        self.parent.GetValidator().update_session( self.SessionObj.get_sessionid() )
 
 
     def OnRemove(self, e):
@@ -516,6 +528,7 @@ class ModifFrame( wx.Dialog ):
 
                 authorToRemove = self.parent._dataPages['Authors'][authorid]
                 self.parent._dataPages['Documents'][self.eltid].get_authors().remove(authorToRemove)
+                self.parent.GetAuthorIndex().add_document( self.parent._dataPages['Documents'][self.eltid] )
 
                 self.Refresh()
 
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+
+# ---------------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+class AuthorIndex:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Index of the documents of each author.
+
+    Documents are indexed by the identifier of their authors, in the order
+    of the dictionary of documents. The index must be updated each time
+    the authors of a document are changed, or a document is removed.
+
+    """
+
+    def __init__(self, documents=None):
+        """
+        Creates a new AuthorIndex instance.
+
+        @param documents (dict) Documents, indexed by their identifiers.
+
+        """
+        self._docs    = {}   # authorid -> list of docids
+        self._authors = {}   # docid -> list of authorids
+        if documents is not None:
+            for doc in documents.values():
+                self.add_document( doc )
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def get_documents(self, authorid):
+        """
+        Return the list of document identifiers of an author.
+
+        @param authorid (string) Identifier of an author.
+
+        """
+        return self._docs.get(authorid, [])
+
+    # End get_documents
+    # -------------------------------------------------------------------------
+
+
+    def has_documents(self, authorid):
+        """
+        Return True if the author has at least one document.
+
+        @param authorid (string) Identifier of an author.
+
+        """
+        return len(self.get_documents(authorid)) > 0
+
+    # End has_documents
+    # -------------------------------------------------------------------------
+
+
+    def add_document(self, doc):
+        """
+        Add a document (or update it, if already in the index).
+
+        @param doc (Document)
+
+        """
+        docid = doc.get_docid()
+        if docid in self._authors:
+            self.remove_document( docid )
+
+        self._authors[docid] = list()
+        for author in doc.get_authors():
+            authorid = author.get_authorid()
+            if authorid in self._authors[docid]:
+                continue
+            self._authors[docid].append( authorid )
+            self._docs.setdefault(authorid, list()).append( docid )
+
+    # End add_document
+    # -------------------------------------------------------------------------
+
+
+    def remove_document(self, docid):
+        """
+        Remove a document from the index.
+
+        @param docid (string) Identifier of a document.
+
+        """
+        for authorid in self._authors.pop(docid, []):
+            self._docs[authorid].remove( docid )
+            if len(self._docs[authorid]) == 0:
+                del self._docs[authorid]
+
+    # End remove_document
+    # -------------------------------------------------------------------------
+
+# ---------------------------------------------------------------------------
@@ -0,0 +1,199 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+
+# ---------------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+import os
+import pickle
+import hashlib
+import logging
+import threading
+
+import TagPDF.utils as utils
+
+# ---------------------------------------------------------------------------
+
+class BuildState:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Dependencies of the generated PDF files.
+
+    Each generated file (ALL-submissions.pdf, TableOfContent.pdf...) is
+    recorded with a key: a hash of everything it depends on. For a file
+    generated with LaTeX, it is the LaTeX content (made of the relevant
+    Document/Session/Author fields), the header/footer options and the
+    first page number; for a tagged submission, it is the content of its
+    PDF file and its header/footer options; for a merged file, it is made
+    of the keys of the merged files (or of their content). A file is
+    generated again only if its key changed.
+
+    Keys can be recorded by several threads at the same time.
+
+    """
+
+    def __init__(self, filename, catalog=None):
+        """
+        Creates a new BuildState instance, from a file (if existing).
+
+        @param filename (string) File of the recorded keys.
+        @param catalog (PdfCatalog) Catalog of the hash of the files.
+
+        """
+        self._filename = filename
+        self._catalog = catalog
+        self._keys = {}
+        self._lock = threading.Lock()
+        try:
+            with open(filename, "rb") as f:
+                self._keys = pickle.load(f)
+        except Exception:
+            self._keys = {}
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def get_key(self, *dependencies):
+        """
+        Return the key of a list of dependencies.
+
+        @param dependencies are strings, unicode strings, numbers, lists
+        or dictionaries (sorted by keys).
+
+        """
+        h = hashlib.sha1()
+        for d in dependencies:
+            self.__update( h, d )
+        return h.hexdigest()
+
+    # End get_key
+    # -------------------------------------------------------------------------
+
+
+    def get_file_key(self, filenames):
+        """
+        Return the key of the content of a list of files.
+
+        @param filenames (list) Names of the files.
+
+        """
+        if self._catalog is not None:
+            return self.get_key( [self._catalog.get_hash(f) for f in filenames] )
+        return self.get_key( [utils.hash_file(f) for f in filenames] )
+
+    # End get_file_key
+    # -------------------------------------------------------------------------
+
+
+    def is_uptodate(self, filename, key):
+        """
+        Return True if the file exists and was generated with this key.
+
+        @param filename (string) Generated file name.
+        @param key (string) Key of its dependencies.
+
+        """
+        name = os.path.basename(filename)
+        return os.path.exists(filename) and self._keys.get(name) == key
+
+    # End is_uptodate
+    # -------------------------------------------------------------------------
+
+
+    def set_key(self, filename, key):
+        """
+        Record the key of a generated file (None if the file is not valid
+        anymore), and save all keys.
+
+        @param filename (string) Generated file name.
+        @param key (string) Key of its dependencies.
+
+        """
+        name = os.path.basename(filename)
+        with self._lock:
+            if key is None:
+                self._keys.pop(name, None)
+            else:
+                self._keys[name] = key
+            self.__save()
+
+    # End set_key
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __update(self, h, value):
+        # Add a value to the hash.
+        if isinstance(value, dict):
+            for k in sorted(value.keys()):
+                self.__update( h, k )
+                self.__update( h, value[k] )
+        elif isinstance(value, (list, tuple)):
+            h.update( "[%d" % len(value) )
+            for v in value:
+                self.__update( h, v )
+            h.update( "]" )
+        else:
+            if isinstance(value, str):
+                value = value.decode('utf-8')
+            value = unicode(value).encode('utf-8')
+            h.update( "%d:" % len(value) )
+            h.update( value )
+
+
+    def __save(self):
+        # Save all keys (the state is only an optimization: errors are ignored).
+        try:
+            dirname = os.path.dirname(self._filename)
+            if len(dirname) > 0 and not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            with open(self._filename, "wb") as f:
+                pickle.dump(self._keys, f, pickle.HIGHEST_PROTOCOL)
+        except Exception, e:
+            logging.info('Build state not saved: %s'%str(e))
+
+# ---------------------------------------------------------------------------
@@ -0,0 +1,238 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+
+# ---------------------------------------------------------------------------
+
+import threading
+
+# ---------------------------------------------------------------------------
+
+class Pagination:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Page numbers of the proceedings, planned from page counts.
+
+    The parts of the proceedings (the submissions, then the index of
+    authors...) are numbered one after the other, from the first page:
+    a part starts on the next page or, if required, on the next recto
+    (odd) page. Page numbers are fixed from the number of pages of each
+    part alone, so that all parts can then be generated independently.
+
+    The number of pages of a part may be unknown until it is generated:
+    the first pages of the next parts are then unknown (None), until its
+    number of pages is set.
+
+    Consecutive parts can be split into shards (see split): each shard
+    can then be generated on its own, from its known first page.
+
+    A pagination can be used and modified by several threads at the same
+    time (concurrent stages of pdf_writer).
+
+    """
+
+    def __init__(self, first=1):
+        """
+        Creates a new Pagination instance.
+
+        @param first (int) Number of the first page.
+
+        """
+        self._first = first
+        self._parts = []    # list of names
+        self._pages = {}    # key=name, value=number of pages (or None)
+        self._recto = {}    # key=name, value=True to start on a recto
+        self._start = None  # key=name, value=first page (or None)
+        self._lock  = threading.Lock()
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def add(self, name, pages=None, recto=False):
+        """
+        Add a part after the other ones.
+
+        @param name (string) Name of the part (docid, file name...).
+        @param pages (int) Number of pages, or None if unknown.
+        @param recto (bool) Start the part on a recto page.
+
+        """
+        with self._lock:
+            if name in self._pages:
+                raise ValueError("Part %s already added." % name)
+            self._parts.append( name )
+            self._pages[name] = pages
+            self._recto[name] = recto
+            self._start = None
+
+    # End add
+    # -------------------------------------------------------------------------
+
+
+    def set_pages(self, name, pages):
+        """
+        Fix the number of pages of a part.
+
+        @param name (string) Name of the part.
+        @param pages (int) Number of pages.
+
+        """
+        with self._lock:
+            if not name in self._pages:
+                raise KeyError("Unknown part %s." % name)
+            self._pages[name] = pages
+            self._start = None
+
+    # End set_pages
+    # -------------------------------------------------------------------------
+
+
+    def get_names(self):
+        """ Return the names of the parts, in the order of the pages. """
+        with self._lock:
+            return list(self._parts)
+
+    # End get_names
+    # -------------------------------------------------------------------------
+
+
+    def get_pages(self, name):
+        """
+        Return the number of pages of a part, or None if unknown.
+
+        @param name (string) Name of the part.
+
+        """
+        with self._lock:
+            return self._pages[name]
+
+    # End get_pages
+    # -------------------------------------------------------------------------
+
+
+    def get_first_page(self, name):
+        """
+        Return the number of the first page of a part, or None if unknown.
+
+        @param name (string) Name of the part.
+
+        """
+        with self._lock:
+            if not name in self._pages:
+                raise KeyError("Unknown part %s." % name)
+            if self._start is None:
+                self._start = self.__paginate()
+            return self._start[name]
+
+    # End get_first_page
+    # -------------------------------------------------------------------------
+
+
+    def get_last_page(self, name):
+        """
+        Return the number of the last page of a part, or None if unknown.
+
+        @param name (string) Name of the part.
+
+        """
+        first = self.get_first_page( name )
+        pages = self.get_pages( name )
+        if first is None or pages is None:
+            return None
+        return first + pages - 1
+
+    # End get_last_page
+    # -------------------------------------------------------------------------
+
+
+    def split(self, names, count):
+        """
+        Split parts into shards of consecutive parts, with about the same
+        number of pages: a part is in the shard of its first page.
+
+        @param names (list) Names of consecutive parts, with known numbers
+        of pages.
+        @param count (int) Number of shards.
+        @return a list of count lists of names (a shard is empty if there
+        are less parts than shards).
+
+        """
+        if count < 1:
+            raise ValueError("Bad number of shards: %s." % count)
+        pages  = [ self.get_pages(name) for name in names ]
+        shards = [ [] for i in range(count) ]
+        total  = sum( pages )
+        done   = 0
+        for name, n in zip(names, pages):
+            index = 0
+            if total > 0:
+                index = min( count-1, done*count // total )
+            shards[index].append( name )
+            done += n
+        return shards
+
+    # End split
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __paginate(self):
+        # Return the first page of all parts (called with the lock).
+        start = {}
+        page = self._first
+        for name in self._parts:
+            if page is not None and self._recto[name] is True and not page%2:
+                page += 1
+            start[name] = page
+            if page is not None:
+                if self._pages[name] is None:
+                    page = None
+                else:
+                    page += self._pages[name]
+        return start
+
+# ---------------------------------------------------------------------------
@@ -182,6 +182,15 @@ class Preferences_IO( Preferences ):
         except Exception, e:
             return False
 
+        # Options added after the file was saved get their theme value.
+        try:
+            theme = THEMES[self._prefs['THEME']][1]
+        except Exception:
+            theme = THEMES[0][1]
+        for key in theme.get_choices():
+            if not key in self._prefs:
+                self.SetOption(key, theme.get_choice(key))
+
         return True
 
     # End Read
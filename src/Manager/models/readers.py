@@ -46,8 +46,9 @@ __docformat__ = "epytext"
 import csv
 import datetime
 
-from dataauthor  import Author
-from datasession import Session
+from dataauthor   import Author
+from datasession  import Session
+from datadocument import Document
 
 # ---------------------------------------------------------------------------
 
@@ -156,6 +157,57 @@ class documents_csv_reader:
     # -----------------------------------------------------------------------
 
 
+    def get_documents(self, sessions):
+        """
+        Return a dictionary of all documents, in a single read of the file.
+
+        A document can be described by several rows (one per author): the
+        first non-empty title, session and page number are used, with the
+        rank of the first row. Each document gets a new Session instance
+        (with only its identifier) which is also added into sessions.
+
+        @param sessions (dict) Sessions, indexed by their identifiers.
+
+        """
+        rows = dict()
+        docidList = list()
+        for row in self.get_Rows():
+            docid = self.get_DocId(row)
+            if not docid in rows:
+                rows[docid] = list()
+                docidList.append(docid)
+            rows[docid].append(row)
+
+        documents = dict()
+        for docid in docidList:
+            authorslist = []
+            session     = ""
+            title       = ""
+            page_number = ""
+            rank        = self.get_Rank(rows[docid][0])
+
+            for row in rows[docid]:
+                authorslist.append( self.get_Author(row) )
+
+                if session == "" and row["SESSION_ID"] != "":
+                    session = self.get_Session(row)
+                    sessions[session.get_sessionid()] = session
+
+                if title == "" and self.get_DocTitle(row) != "":
+                    title = self.get_DocTitle(row)
+
+                if page_number == "" and self.get_NumPage(row) != "":
+                    page_number = self.get_NumPage(row)
+
+            doc = Document(docid, title, authorslist, session, rank, page_number)
+            documents[doc.get_docid()] = doc
+
+        return documents
+
+    # End get_documents
+    # -----------------------------------------------------------------------
+
+
 # ---------------------------------------------------------------------------
 
 
@@ -225,6 +277,36 @@ class authors_csv_reader:
 
         return good_rows
 
+
+    def get_authors(self):
+        """
+        Return a dictionary of all authors, in a single read of the file.
+
+        An author can be described by several rows: the information of
+        all of them is merged (see Author.compare_and_update).
+
+        """
+        rows = dict()
+        authList = list()
+        for row in self.get_Rows():
+            Names = (self.get_LastName(row), self.get_FirstName(row))
+            if not Names in rows:
+                rows[Names] = list()
+                authList.append(Names)
+            rows[Names].append(row)
+
+        authors = dict()
+        for lastname, firstname in authList:
+            rowList = rows[lastname, firstname]
+            a_row = rowList.pop()
+            auth = Author(lastname,firstname, self.get_email(a_row), self.get_Affiliation(a_row))
+            for row in rowList: ### all the authors which have the same name !!
+                Other_auth = Author(lastname,firstname, self.get_email(row), self.get_Affiliation(row))
+                auth.compare_and_update(Other_auth)
+            authors[auth.get_authorid()] = auth
+
+        return authors
+
     # -----------------------------------------------------------------------
 
 
@@ -332,4 +414,41 @@ class sessions_csv_reader:
 
         return good_rows
 
+
+    def get_sessions(self):
+        """
+        Return a dictionary of all sessions, in a single read of the file.
+
+        If a session is described by several rows, the first one is used.
+
+        """
+        sessions = dict()
+        for row in self.get_Rows():
+            sessionid = self.get_SessionId(row)
+            if sessionid in sessions:
+                continue
+            sessions[sessionid] = Session(sessionid, self.get_SessionName(row), self.get_Rank(row), self.get_Date(row), self.get_Heure_Deb(row), self.get_Heure_Fin(row), self.get_Chairman(row), self.get_Location(row))
+
+        return sessions
+
     # -----------------------------------------------------------------------
+
+
+def read_csv_files(documentsname, sessionsname, authorsname):
+    """
+    Read the CSV files of a conference: each file is read only once.
+
+    @param documentsname (string) Documents CSV file name.
+    @param sessionsname (string) Sessions CSV file name.
+    @param authorsname (string) Authors CSV file name.
+    @return Dictionaries of documents, sessions and authors.
+
+    """
+    sessions  = dict()
+    documents = documents_csv_reader( documentsname ).get_documents( sessions )
+    sessions.update( sessions_csv_reader( sessionsname ).get_sessions() )
+    authors   = authors_csv_reader( authorsname ).get_authors()
+
+    return documents, sessions, authors
+
+# ---------------------------------------------------------------------------
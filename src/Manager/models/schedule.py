@@ -0,0 +1,243 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+
+# ---------------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+from datasession import Session
+from validate    import Validate
+
+# ---------------------------------------------------------------------------
+
+class Schedule:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Sorted sessions and documents of a conference.
+
+    Sessions are sorted by date (or by type, then date), then by rank.
+    Documents are sorted by the order of their session, then by rank.
+    Documents and sessions are grouped in a single pass, so that the
+    documents of a session or the sessions of a date are directly known.
+
+    """
+
+    def __init__(self, documents, sessions, sortbytype=False, validator=None):
+        """
+        Creates a new Schedule instance.
+
+        @param documents (dict) Documents, indexed by their identifiers.
+        @param sessions (dict) Sessions, indexed by their identifiers.
+        @param sortbytype (bool) Sort sessions by type before dates.
+        @param validator (Validate) Diagnostics of documents and sessions.
+
+        """
+        self._documents = documents
+        self._sessions  = sessions
+        self._validator = validator
+        if validator is None:
+            self._validator = Validate( documents, {}, sessions )
+
+        self.sortedsessions = list()  # Sessions, or their ids if some dates are missing
+        self.sorteddates    = list()  # Dates of the sessions
+        self.sorteddocs     = list()  # Identifiers of the documents
+        self._datesessions  = dict()  # date -> sorted sessions
+        self._sessiondocs   = dict()  # sessionid -> sorted docids
+
+        self._sorted = self.__sort_documents( sortbytype )
+
+        for session in self.sortedsessions:
+            if isinstance(session, Session):
+                self._datesessions.setdefault(session.get_date(), list()).append( session )
+        for docid in self.sorteddocs:
+            docsession = self._documents[docid].get_session()
+            if isinstance(docsession, Session):
+                self._sessiondocs.setdefault(docsession.get_sessionid(), list()).append( docid )
+
+    # End __init__
+    # -----------------------------------------------------------------------
+
+
+    def is_sorted(self):
+        """
+        Return False if documents are sorted by docid because some of them
+        are not assigned to a session.
+        """
+        return self._sorted
+
+    # End is_sorted
+    # -----------------------------------------------------------------------
+
+
+    def get_documents(self, session):
+        """
+        Return the sorted list of the identifiers of the documents of a session.
+
+        @param session (Session)
+
+        """
+        if not isinstance(session, Session):
+            return []
+        return self._sessiondocs.get(session.get_sessionid(), [])
+
+    # End get_documents
+    # -----------------------------------------------------------------------
+
+
+    def get_sessions(self, date):
+        """
+        Return the sorted list of the sessions of a date.
+
+        @param date (datetime.date)
+
+        """
+        return self._datesessions.get(date, [])
+
+    # End get_sessions
+    # -----------------------------------------------------------------------
+
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+
+    def __sort_sessions_by_type(self):
+        # Sort sessions by type (the first 2 chars of their id), then date,
+        # then rank.
+
+        # Keep all sessions types
+        alltypes = set()
+        for session in self._sessions.values():
+            sessionidkey = session.get_sessionid()
+            sessionidkey = sessionidkey.replace('[', '')
+            sessionidkey = sessionidkey.replace(']', '')
+            alltypes.add( sessionidkey[0:2] )
+
+        # sort sessions inside each type
+        for idtype in sorted(alltypes):
+            sessionstype = [ session for session in self._sessions.values() if idtype in session.get_sessionid() ]
+            self.sorteddates = self.__sort_sessions_by_date( sessionstype )
+
+    # End __sort_sessions_by_type
+    # -----------------------------------------------------------------------
+
+
+    def __sort_sessions_by_date(self, sessions):
+        # Append sessions sorted by date then rank, and return sorted dates.
+
+        sessionsdate = dict()
+        for session in sessions:
+            sessionsdate.setdefault(session.get_date(), list()).append( session )
+
+        # sort sessions of each date, with their rank
+        alldates = sorted( sessionsdate.keys() )
+        for date in alldates:
+            ranks = {}
+            r = 1000
+            for session in sessionsdate[date]:
+                if session.get_rank() != 0:
+                    ranks[session.get_rank()] = session
+                else:
+                    # unsorted sessions at the end
+                    ranks[r] = session
+                    r = r+1
+
+            for r in sorted(ranks.keys()):
+                self.sortedsessions.append( ranks[r] )
+
+        return alldates
+
+    # End __sort_sessions_by_date
+    # -----------------------------------------------------------------------
+
+
+    def __sort_documents(self, sortbytype):
+        # Sort sessions then documents. If at least one document is not
+        # assigned to a session, sort by docid.
+
+        if len(self._validator.session_in_documents()) > 0:
+            # No sessions, sort by docid...
+            self.sorteddocs = sorted(self._documents.keys())
+            return False
+
+        # Sort by sessions
+        if sortbytype is False:
+            if len(self._validator.date_in_sessions()) > 0:
+                # Some missing dates in sessions: sort on keys
+                self.sortedsessions = sorted(self._sessions.keys())
+            else:
+                self.sorteddates = self.__sort_sessions_by_date( self._sessions.values() )
+        else:
+            self.__sort_sessions_by_type()
+
+        # List all docs of each session (the docid)
+        sessiondocs = dict()
+        for d in self._documents.values():
+            sessiondocs.setdefault(d.get_session().get_sessionid(), list()).append( d.get_docid() )
+
+        for s in self.sortedsessions:
+            if not isinstance(s, Session):
+                continue
+
+            # then, sort these docs with their rank...
+            # (a missing or duplicated rank gets the next free rank)
+            ranks = {}
+            ranks[0] = None
+            free = 1
+            for docid in sessiondocs.get(s.get_sessionid(), []):
+                r = self._documents[docid].get_rank()
+                if r is None or r == 0 or r in ranks:
+                    while free in ranks:
+                        free = free+1
+                    r = free
+                ranks[r] = docid
+            for r in sorted(ranks.keys()):
+                if r > 0:
+                    self.sorteddocs.append( ranks[r] )
+
+        return True
+
+    # End __sort_documents
+    # -----------------------------------------------------------------------
+
+# ---------------------------------------------------------------------------
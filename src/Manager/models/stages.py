@@ -0,0 +1,178 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+
+# ---------------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+import threading
+from multiprocessing.pool import ThreadPool
+
+# ---------------------------------------------------------------------------
+
+class StageGraph:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Run stages concurrently, in the order of their dependencies.
+
+    A stage is a function without arguments, with the names of the stages
+    it depends on: it is started as soon as all of them are finished. The
+    dependencies of a stage are added before it, so that the stages make
+    an acyclic graph. Dependencies which were not added (disabled stages)
+    are ignored.
+
+    An exclusive stage runs alone: it is started once the running stages
+    are finished, and the next stages wait for it. It is a stage which
+    uses all the workers by itself (a pool of workers).
+
+    Stages are started in the order they were added. No stage is started
+    anymore once the stop function returns True (error or abort), or once a
+    stage raised an exception: the running ones are finished, then the
+    exception is raised again.
+
+    """
+
+    def __init__(self):
+        """
+        Creates a new StageGraph instance.
+
+        """
+        self._stages = []   # list of (name, function, dependencies, exclusive)
+        self._names  = set()
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def add_stage(self, name, function, dependencies=[], exclusive=False):
+        """
+        Add a stage.
+
+        @param name (string) Name of the stage.
+        @param function (function) Function to call, without arguments.
+        @param dependencies (list) Names of the stages to finish first.
+        @param exclusive (bool) Run the stage alone.
+
+        """
+        if name in self._names:
+            raise ValueError("Stage %s already added." % name)
+        dependencies = [ d for d in dependencies if d in self._names ]
+        self._stages.append( (name, function, dependencies, exclusive) )
+        self._names.add( name )
+
+    # End add_stage
+    # -------------------------------------------------------------------------
+
+
+    def run(self, workers=None, stop=None):
+        """
+        Run all stages and wait for them.
+
+        @param workers (int) Number of stages run at the same time, or
+        None for all the stages which can be.
+        @param stop (function) Return True to not start other stages.
+
+        """
+        if len(self._stages) == 0:
+            return
+        if workers is None or workers > len(self._stages):
+            workers = len(self._stages)
+
+        self._pending  = list(self._stages)
+        self._running  = set()
+        self._finished = set()
+        self._errors   = []
+        self._alone    = None   # name of the running exclusive stage
+        self._cond     = threading.Condition()
+
+        pool = ThreadPool( max(1, workers) )
+        try:
+            with self._cond:
+                while True:
+                    if len(self._errors) == 0 and (stop is None or not stop()):
+                        for stage in list(self._pending):
+                            name, function, dependencies, exclusive = stage
+                            if len(self._running) >= workers or self._alone is not None:
+                                break
+                            if all( d in self._finished for d in dependencies ):
+                                if exclusive is True and len(self._running) > 0:
+                                    # the next stages are not started before it
+                                    break
+                                self._pending.remove( stage )
+                                self._running.add( name )
+                                if exclusive is True:
+                                    self._alone = name
+                                pool.apply_async( self.__run_stage, (name, function) )
+                    if len(self._running) == 0:
+                        break
+                    self._cond.wait()
+        finally:
+            pool.close()
+            pool.join()
+
+        if len(self._errors) > 0:
+            raise self._errors[0]
+
+    # End run
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __run_stage(self, name, function):
+        # Run a stage in a worker, then wake up the main loop.
+        try:
+            function()
+        except Exception, e:
+            with self._cond:
+                self._errors.append( e )
+        finally:
+            with self._cond:
+                self._running.discard( name )
+                self._finished.add( name )
+                if self._alone == name:
+                    self._alone = None
+                self._cond.notify()
+
+# ---------------------------------------------------------------------------
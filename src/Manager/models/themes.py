@@ -63,6 +63,27 @@ class Theme:
         """
         self._choice = {}
 
+        # Options of the PDF generator, shared by all themes.
+        # Number of documents tagged at the same time (0 = one per processor)
+        self._choice['NUMBER_OF_WORKERS'] = Option('int', 1)
+        # Compile the header/footer of all documents in a single LaTeX file
+        self._choice['BATCH_TAGGING'] = Option('bool', False)
+        # Keep tagged files in the data directory, to re-use them if possible
+        self._choice['TAG_CACHE'] = Option('bool', False)
+        # Generate a file again only if its content has changed
+        self._choice['INCREMENTAL_BUILD'] = Option('bool', False)
+        # Program to merge/extract PDF files: pdftk, qpdf, or auto (the fastest)
+        self._choice['PDF_TOOL'] = Option('str', 'auto')
+        # Program to stamp the header/footer: auto, pdftk, qpdf, or python (in-process)
+        self._choice['STAMP_BACKEND'] = Option('str', 'auto')
+        # Write the header/footer pages without pdflatex when their texts allow it
+        # (the font and the positions of the texts differ from LaTeX)
+        self._choice['DIRECT_OVERLAY'] = Option('bool', False)
+        # Compile the LaTeX packages once, in a format stored in the data directory
+        self._choice['LATEX_FORMAT'] = Option('bool', False)
+        # Compile the submissions and all documents in a single book (Proceedings.pdf)
+        self._choice['BOOK_MODE'] = Option('bool', False)
+
     # End __init__
     # -----------------------------------------------------------------------
 
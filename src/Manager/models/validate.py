@@ -55,6 +55,11 @@ class Validate:
     @license: GPL
     @summary: Check if all data are OK.
 
+    All diagnostics are computed in a single pass over documents when the
+    instance is created, then kept. Each time a document or a session is
+    created, modified or removed, update_document or update_session must
+    be called to update its diagnostics.
+
     """
 
     def __init__(self, documents, authors, sessions):
@@ -70,6 +75,40 @@ class Validate:
         self.authors   = authors
         self.sessions  = sessions
 
+        self._docsession    = {}     # docid -> sessionid (None if no session)
+        self._norank        = set()  # docids without rank
+        self._sessiondocs   = {}     # sessionid -> number of documents
+        self._sessionerrors = {}     # sessionid -> set of missing fields
+        for doc in self.documents.values():
+            self.__add_document( doc )
+
+    # -----------------------------------------------------------------------
+
+
+    def update_document(self, docid):
+        """
+        Update the diagnostics of a document (created, modified or removed).
+
+        @param docid (string) Identifier of the document.
+
+        """
+        self.__remove_document( docid )
+        if docid in self.documents:
+            self.__add_document( self.documents[docid] )
+
+    # -----------------------------------------------------------------------
+
+
+    def update_session(self, sessionid):
+        """
+        Update the diagnostics of a session (created, modified or removed).
+
+        @param sessionid (string) Identifier of the session.
+
+        """
+        if sessionid in self._sessiondocs:
+            self.__check_session( sessionid )
+
     # -----------------------------------------------------------------------
 
 
@@ -77,6 +116,9 @@ class Validate:
         """
         Check if all pdf files are in the directory.
         Return the list of missing files.
+
+        Files can be changed outside of the application: this check is not
+        kept.
         """
         no_pdf = []
         for doc in self.documents.values():
@@ -93,12 +135,7 @@ class Validate:
         Check if all documents are related to a session.
         Return the list of docid without session.
         """
-        no_session = []
-        for doc in self.documents.values():
-            docsession = doc.get_session()
-            if isinstance(docsession,Session) is False:
-                no_session.append(doc.get_docid())
-        return no_session
+        return [ docid for docid, sessionid in self._docsession.items() if sessionid is None ]
 
     # -----------------------------------------------------------------------
 
@@ -108,12 +145,7 @@ class Validate:
         Check if all documents have a rank.
         Return the list of docid without rank.
         """
-        no_rank = []
-        for doc in self.documents.values():
-            rank = doc.get_rank()
-            if rank == 0:
-                no_rank.append(doc.get_docid())
-        return no_rank
+        return list( self._norank )
 
     # -----------------------------------------------------------------------
 
@@ -122,19 +154,7 @@ class Validate:
         """
         Check if all sessions (with at least one document) have a name.
         """
-        no_name = []
-        for doc in self.documents.values():
-            docsession = doc.get_session()
-            if isinstance(docsession,Session) is True:
-                sessionid = docsession.get_sessionid()
-                try:
-                    session = self.sessions[sessionid]
-                    if session.get_session_name() == "" and sessionid not in no_name:
-                        no_name.append(sessionid)
-                except KeyError:
-                    if sessionid not in no_name:
-                        no_name.append(sessionid)
-        return no_name
+        return self.__missing_in_sessions( "name" )
 
     # -----------------------------------------------------------------------
 
@@ -143,19 +163,7 @@ class Validate:
         """
         Check if all sessions (with at least one document) have a date.
         """
-        no_date = []
-        for doc in self.documents.values():
-            docsession = doc.get_session()
-            if isinstance(docsession,Session) is True:
-                sessionid = docsession.get_sessionid()
-                try:
-                    session = self.sessions[sessionid]
-                    if session.get_date() == "" and sessionid not in no_date:
-                        no_date.append(sessionid)
-                except KeyError:
-                    if sessionid not in no_date:
-                        no_date.append(sessionid)
-        return no_date
+        return self.__missing_in_sessions( "date" )
 
     # -----------------------------------------------------------------------
 
@@ -164,21 +172,75 @@ class Validate:
         """
         Check if all sessions (with at least one document) have a rank.
         """
-        no_rank = []
-        for doc in self.documents.values():
-            docsession = doc.get_session()
-            if isinstance(docsession,Session) is True:
-                sessionid = docsession.get_sessionid()
-                try:
-                    session = self.sessions[sessionid]
-                    if session.get_rank() == "" and sessionid not in no_rank:
-                        no_rank.append(sessionid)
-                except KeyError:
-                    if sessionid not in no_rank:
-                        no_rank.append(sessionid)
-        return no_rank
+        return self.__missing_in_sessions( "rank" )
 
     # -----------------------------------------------------------------------
 
-# ---------------------------------------------------------------------------
 
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+
+    def __add_document(self, doc):
+        # Add the diagnostics of a document.
+        docid = doc.get_docid()
+        docsession = doc.get_session()
+        sessionid = None
+        if isinstance(docsession,Session) is True:
+            sessionid = docsession.get_sessionid()
+
+        self._docsession[docid] = sessionid
+        if doc.get_rank() == 0:
+            self._norank.add( docid )
+
+        if sessionid is not None:
+            if not sessionid in self._sessiondocs:
+                self._sessiondocs[sessionid] = 0
+                self.__check_session( sessionid )
+            self._sessiondocs[sessionid] += 1
+
+    # -----------------------------------------------------------------------
+
+
+    def __remove_document(self, docid):
+        # Remove the diagnostics of a document.
+        if not docid in self._docsession:
+            return
+        sessionid = self._docsession.pop( docid )
+        self._norank.discard( docid )
+
+        if sessionid is not None:
+            self._sessiondocs[sessionid] -= 1
+            if self._sessiondocs[sessionid] == 0:
+                del self._sessiondocs[sessionid]
+                del self._sessionerrors[sessionid]
+
+    # -----------------------------------------------------------------------
+
+
+    def __check_session(self, sessionid):
+        # Fix the missing fields of a session (all if the session is missing).
+        errors = set()
+        try:
+            session = self.sessions[sessionid]
+            if session.get_session_name() == "":
+                errors.add( "name" )
+            if session.get_date() == "":
+                errors.add( "date" )
+            if session.get_rank() == "":
+                errors.add( "rank" )
+        except KeyError:
+            errors = set( ["name", "date", "rank"] )
+        self._sessionerrors[sessionid] = errors
+
+    # -----------------------------------------------------------------------
+
+
+    def __missing_in_sessions(self, field):
+        # Return the list of sessions (with at least one document) without field.
+        return [ sessionid for sessionid, errors in self._sessionerrors.items() if field in errors ]
+
+    # -----------------------------------------------------------------------
+
+# ---------------------------------------------------------------------------
@@ -45,48 +45,45 @@ __docformat__ = "epytext"
 
 import re
 import os.path
-import wx
 import logging
 from threading import *
+from itertools import imap
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 
 from TagPDF.tagPDF       import tagPdfFile
 from TagPDF.genPDF       import GenPdfFile
 from TagPDF.genLaTeX     import GenLaTeXFile
 from TagPDF.name         import GenName
+from TagPDF.tagcache     import TagCache
+from TagPDF.preflight    import Preflight
+from TagPDF.catalog      import PdfCatalog
+from TagPDF.latexformat  import FormatCache
 import TagPDF.utils as utils
 
 from Manager.models.datadocument import Document
 from Manager.models.dataauthor   import Author
 from Manager.models.datasession  import Session
 from Manager.models.validate     import Validate
-import Manager.consts as consts
+from Manager.models.buildstate   import BuildState
+from Manager.models.authorindex  import AuthorIndex
+from Manager.models.schedule     import Schedule
+from Manager.models.stages       import StageGraph
+from Manager.models.pagination   import Pagination
 
 
 # ---------------------------------------------------------------------------
-# Define notification event for thread completion
+# Name of the directory (in the data directory) to store cached files
 # ---------------------------------------------------------------------------
 
-EVT_RESULT_ID = wx.NewId()
-
-
-def EVT_RESULT(win, func):
-    """ Define Result Event. """
-    win.Connect(-1, -1, EVT_RESULT_ID, func)
-  
-
-class ResultEvent(wx.PyEvent):
-    """ Simple event to carry result data. """
-
-    def __init__(self, text, num):
-        """Init Result Event."""
-
-        wx.PyEvent.__init__(self)
-        self.SetEventType(EVT_RESULT_ID)
-        self.tasktext = text
-        self.tasknum  = num
+CACHE_DIRNAME = ".proceed"
 
+# ---------------------------------------------------------------------------
+# Names of the header/footer options
 # ---------------------------------------------------------------------------
 
+TAG_OPTIONS = ["leftheader", "centerheader", "rightheader", "leftfooter", "centerfooter", "rightfooter"]
+
 # ---------------------------------------------------------------------------
 # Class
 # ---------------------------------------------------------------------------
@@ -98,14 +95,34 @@ class pdf_writer( Thread ):
     @license: GPL
     @summary: Used to export data in a PDF document.
 
+    The writer does not depend on any GUI: the progress is reported to a
+    function notify(text, num), with the text of the current task and its
+    number. num is -1 when the generation stops (text is None if it was
+    aborted, an error message if it failed).
+
+    Page numbers are planned before generating anything, from the number
+    of pages of the PDF files (see plan_pages). The documents are then
+    generated by stages (tagged submissions, table of contents, index of
+    authors...) which are run concurrently when they don't depend on each
+    other (see StageGraph), by at most NUMBER_OF_WORKERS at the same time
+    (the submissions are tagged alone, by a pool of as many workers).
+
+    The tagging can also be spread across machines which share the data
+    directory: each one tags a shard of the submissions (see set_shard),
+    then a final run merges them and creates the other documents (see
+    set_merge_shards).
+
     """
 
-    def __init__(self, notify_window, prefs, documents, authors, sessions, path):
+    def __init__(self, notify, prefs, documents, authors, sessions, path):
         """
         Init Worker Thread Class.
+
+        @param notify (function) Called with the progress, or None.
+
         """
         Thread.__init__(self)
-        self._notify_window = notify_window
+        self._notify_function = notify
 
         # Members
         self._prefsIO  = prefs
@@ -114,6 +131,9 @@ class pdf_writer( Thread ):
         self.authors   = authors
         self.sessions  = sessions
         self.path      = path
+        self._lock     = Lock()    # Protects the progress and the schedules
+        self._shard    = None      # (index, count) of the shard to tag
+        self._merge_shards = False # Submissions are tagged by shards
         self._initialize()
 
         # This starts the thread running on creation, but you could
@@ -129,16 +149,77 @@ class pdf_writer( Thread ):
         self.tasktext    = ''
         self.tasknum     = -1
         self._want_abort = 0
+        self._failed     = False
+        self._book       = False   # Generate a single book (see run_book)
 
         # Members for processing data
-        self.nbpages = 1           # First page number
+        self._pagination = None    # Page numbers of the proceedings
+        self._tagcache = None      # Cache of tagged files
+        self._preflight = None     # Checked PDF files
+        self._catalog = None       # Metadata of PDF files
+        self._buildstate = None    # Dependencies of generated files
+        self._formats = None       # Precompiled LaTeX formats
+        self._authorindex = None   # Documents of each author
         self.sortedsessions = list()
+        self.sorteddates    = list()
         self.sorteddocs     = list()
+        self.schedule   = None     # Sorted sessions and documents
+        self._schedules = {}       # Schedules, created once by kind of sort
         
     # End _initialize
     # ------------------------------------------------------------------------
 
 
+    # ------------------------------------------------------------------------
+    # Shards
+    # ------------------------------------------------------------------------
+
+
+    def set_shard(self, index, count):
+        """
+        Only tag a shard of the submissions: run() checks and tags the
+        documents of the shard, and nothing else.
+
+        The sorted documents are split into count shards of consecutive
+        documents, with about the same number of pages (see Pagination).
+        The pages are planned from all documents, so that each shard
+        knows its first page: shards can be tagged at the same time, on
+        machines which share the data directory. Each shard has its own
+        catalog of PDF files.
+
+        @param index (int) Index of the shard, from 0 to count-1, or None
+        to tag all documents.
+        @param count (int) Number of shards.
+
+        """
+        if index is None:
+            self._shard = None
+            return
+        if count < 1 or index < 0 or index >= count:
+            raise ValueError('Bad shard %s of %s.' % (index, count))
+        self._shard = (index, count)
+
+    # End set_shard
+    # -----------------------------------------------------------------------
+
+
+    def set_merge_shards(self, boolean):
+        """
+        Fix if the submissions were tagged by shards (see set_shard): run()
+        then doesn't tag them, but merges the tagged files and creates the
+        other documents. A submission which is not tagged by a shard, or
+        which was tagged with other page numbers than the current plan, is
+        an error.
+
+        @param boolean (bool)
+
+        """
+        self._merge_shards = bool(boolean)
+
+    # End set_merge_shards
+    # -----------------------------------------------------------------------
+
+
     # ------------------------------------------------------------------------
     # Threading
     # ------------------------------------------------------------------------
@@ -154,6 +235,30 @@ class pdf_writer( Thread ):
     # -----------------------------------------------------------------------
 
 
+    def _notify(self, text, num):
+        # Report the progress to the notify function.
+        # Stages are not started anymore after an error or an abort.
+        if num == -1:
+            self._failed = True
+        if self._notify_function is not None:
+            self._notify_function(text, num)
+
+    # End _notify
+    # -----------------------------------------------------------------------
+
+
+    def _start_task(self, text):
+        # Report the beginning of a new task (stages can run concurrently).
+        with self._lock:
+            self.tasktext = text
+            self.tasknum += 1
+            num = self.tasknum
+        self._notify(text=text, num=num)
+
+    # End _start_task
+    # -----------------------------------------------------------------------
+
+
     def run(self):
         """ Run Worker Thread. """
         # Method for use by main thread to make the job.
@@ -162,43 +267,88 @@ class pdf_writer( Thread ):
         
         self._initialize()
         if self.check() is False:
-            wx.PostEvent(self._notify_window, ResultEvent(text='Data are not completed. Please check them before exporting.', num=-1))
+            self._notify(text='Data are not completed. Please check them before exporting.', num=-1)
             logging.info('Data are not completed. Please check them before exporting.')
             return
 
         self.sort_documents( sortbytype=self._prefsIO.GetValue('SORT_BY_SESSION_TYPE_FIRST') )
 
-        if self._prefsIO.GetValue('GENERATE_MERGED_SUBMISSIONS') is True:
-            logging.info('     Add header/footer to each submission')
-            self.run_tag_pdf()
+        self._catalog = self.__get_catalog()
 
-        if self._prefsIO.GetValue('GENERATE_MERGED_SUBMISSIONS') is True:
-            logging.info('     Merge all submissions')
-            self.run_merge_pdf()
+        if self._prefsIO.GetValue('LATEX_FORMAT') is True:
+            self._formats = FormatCache( os.path.join(self.path, CACHE_DIRNAME, "formats") )
+
+        # Documents of the shard to tag (all of them by default)
+        docids = None
+        if self._shard is not None:
+            try:
+                docids = self.__get_shard_documents()
+            except Exception,e:
+                logging.info('     ... ... ERROR. %s'%str(e))
+                self._notify(text='PDF export failed. Error: '+str(e), num=-1)
+                return
+            logging.info('     Shard %d/%d: %d documents'%(self._shard[0]+1,self._shard[1],len(docids)))
 
-        if self._prefsIO.GetValue('GENERATE_TABLEOFCONTENTS') is True:
-            logging.info('     Generate Table of content')
-            self.run_toc( self._prefsIO.GetValue('TITLE_TABLEOFCONTENTS') )
+        if self._prefsIO.GetValue('GENERATE_MERGED_SUBMISSIONS') is True and self._merge_shards is False:
+            logging.info('     Check PDF files')
+            if self.run_preflight( docids ) is False:
+                return
 
-        if self._prefsIO.GetValue('GENERATE_AUTHORS_INDEX') is True:
-            logging.info('     Generate Index of authors')
-            self.run_index_authors( self._prefsIO.GetValue('TITLE_AUTHORS_INDEX') )
+        try:
+            self.plan_pages( self._prefsIO.GetValue('GENERATE_MERGED_SUBMISSIONS') )
+        except Exception,e:
+            logging.info('     ... ... ERROR. %s'%str(e))
+            self._notify(text='PDF export failed. Error: '+str(e), num=-1)
+            return
 
-        if self._prefsIO.GetValue('GENERATE_AUTHORS_LIST') is True:
-            logging.info('     Generate List of authors')
-            self.run_list_authors( self._prefsIO.GetValue('TITLE_AUTHORS_LIST') )
+        if self._prefsIO.GetValue('INCREMENTAL_BUILD') is True:
+            self._buildstate = BuildState( os.path.join(self.path, CACHE_DIRNAME, "build.state"), self._catalog )
+
+        # Page numbers are planned: only the merge waits for the tagged
+        # submissions, and the list of authors for the number of pages of
+        # the index. The other stages are started at once, within the
+        # number of workers, except during the tagging: it has its own
+        # pool of workers. A book, or a shard, is generated by a single
+        # stage.
+        stages = StageGraph()
+
+        if self._shard is not None:
+            if self._prefsIO.GetValue('GENERATE_MERGED_SUBMISSIONS') is True:
+                stages.add_stage( "tag", self.__get_stage('     Add header/footer to the submissions of the shard', self.run_tag_pdf, docids) )
+        elif self._prefsIO.GetValue('BOOK_MODE') is True:
+            stages.add_stage( "book", self.__get_stage('     Generate the book', self.run_book) )
+        else:
+            if self._prefsIO.GetValue('GENERATE_MERGED_SUBMISSIONS') is True:
+                if self._merge_shards is False:
+                    stages.add_stage( "tag", self.__get_stage('     Add header/footer to each submission', self.run_tag_pdf), exclusive=True )
+                stages.add_stage( "merge", self.__get_stage('     Merge all submissions', self.run_merge_pdf), ["tag"] )
 
-        if self._prefsIO.GetValue('GENERATE_PROGRAM') is True:
-            logging.info('     Generate the Program')
-            self.run_program( self._prefsIO.GetValue('TITLE_PROGRAM') )
+            if self._prefsIO.GetValue('GENERATE_TABLEOFCONTENTS') is True:
+                stages.add_stage( "toc", self.__get_stage('     Generate Table of content', self.run_toc, self._prefsIO.GetValue('TITLE_TABLEOFCONTENTS')) )
 
-        if self._prefsIO.GetValue('GENERATE_PROGRAM_OVERVIEW') is True:
-            logging.info('     Generate the Program Overview')
-            self.run_short_program( self._prefsIO.GetValue('TITLE_PROGRAM_OVERVIEW') )
+            if self._prefsIO.GetValue('GENERATE_AUTHORS_INDEX') is True:
+                stages.add_stage( "index", self.__get_stage('     Generate Index of authors', self.run_index_authors, self._prefsIO.GetValue('TITLE_AUTHORS_INDEX')) )
+
+            if self._prefsIO.GetValue('GENERATE_AUTHORS_LIST') is True:
+                stages.add_stage( "list", self.__get_stage('     Generate List of authors', self.run_list_authors, self._prefsIO.GetValue('TITLE_AUTHORS_LIST')), ["index"] )
+
+            if self._prefsIO.GetValue('GENERATE_PROGRAM') is True:
+                stages.add_stage( "program", self.__get_stage('     Generate the Program', self.run_program, self._prefsIO.GetValue('TITLE_PROGRAM')) )
+
+            if self._prefsIO.GetValue('GENERATE_PROGRAM_OVERVIEW') is True:
+                stages.add_stage( "overview", self.__get_stage('     Generate the Program Overview', self.run_short_program, self._prefsIO.GetValue('TITLE_PROGRAM_OVERVIEW')) )
+
+        try:
+            stages.run( workers=self._get_workers(), stop=lambda: self._want_abort or self._failed )
+        except Exception,e:
+            logging.info('     ... ... ERROR. %s'%str(e))
+            self._notify(text='PDF export failed. Error: '+str(e), num=-1)
 
         logging.info('Generate: Finished.')
+        if self._catalog is not None:
+            self._catalog.save()
         self._initialize()
-        wx.PostEvent(self._notify_window, ResultEvent(text=self.tasktext, num=self.tasknum))
+        self._notify(text=self.tasktext, num=self.tasknum)
 
     # End run
     # -----------------------------------------------------------------------
@@ -209,72 +359,294 @@ class pdf_writer( Thread ):
     # -----------------------------------------------------------------------
 
 
+    def plan(self):
+        """
+        Plan the page numbers, without generating any file (dry run).
+
+        Only the number of pages of the PDF files are read: neither LaTeX
+        nor the PDF tool are used. The page of each document is set.
+
+        @return a Pagination, or None if data are not completed or if a
+        PDF file can't be read (the error is notified).
+
+        """
+        logging.info('Plan: Start.')
+
+        self._initialize()
+        if self.check_files() is False:
+            self._notify(text='Data are not completed. Please check them before exporting.', num=-1)
+            logging.info('Data are not completed. Please check them before exporting.')
+            return None
+
+        self.sort_documents( sortbytype=self._prefsIO.GetValue('SORT_BY_SESSION_TYPE_FIRST') )
+        self._catalog = self.__get_catalog()
+        try:
+            pagination = self.plan_pages()
+        except Exception,e:
+            logging.info('     ... ... ERROR. %s'%str(e))
+            self._notify(text='Page numbers can not be planned. Error: '+str(e), num=-1)
+            return None
+        finally:
+            self._catalog.save()
+
+        logging.info('Plan: Finished.')
+        return pagination
+
+    # End plan
+    # -----------------------------------------------------------------------
+
+
     def check(self):
         """
         Check if data are ready to be exported in PDF.
         """
 
         if self._prefsIO.GetValue('GENERATE_MERGED_SUBMISSIONS') is True:
-            if len(self.validator.pdffiles(self.path)) > 0:
-                return False
-            if len(self.validator.name_in_sessions()) > 0:
-                return False
-            return True
+            return self.check_files()
         return True
 
     # End check
     # -----------------------------------------------------------------------
 
 
-    def run_tag_pdf(self):
+    def check_files(self):
         """
-        Tag all PDF files with an header and a footer.
+        Check if the PDF file of each document exists, and if each document
+        is in a session.
         """
 
-        if not len(self.sorteddocs):
-            return
+        if len(self.validator.pdffiles(self.path)) > 0:
+            return False
+        if len(self.validator.name_in_sessions()) > 0:
+            return False
+        return True
 
-        self.tasktext = 'Add header/footer to PDF files.'
+    # End check_files
+    # -----------------------------------------------------------------------
+
+
+    def plan_pages(self, submissions=True):
+        """
+        Plan the page numbers of the proceedings (see Pagination).
+
+        The submissions are numbered one after the other, in the order of
+        the sorted documents, and the page of each document is set. The
+        index of authors then starts on a recto, and is followed by the
+        list of authors (its first page is known once the index is
+        generated). The table of contents and the programs have no page
+        numbers: they are generated from the first page.
+
+        @param submissions (bool) Number the PDF files of the documents.
+        Otherwise, documents keep their page.
+        @return a Pagination
+
+        """
+        pagination = Pagination()
+
+        if submissions is True:
+            for docid in self.sorteddocs:
+                N = int( self.__count_pages( os.path.join(self.path, docid + ".pdf") ) )
+                if N < 1:
+                    raise IOError('Bad number of pages of file: '+docid)
+                pagination.add( docid, N )
+            for docid in self.sorteddocs:
+                self.documents[docid].set_page( pagination.get_first_page(docid) )
+
+        if self._prefsIO.GetValue('GENERATE_AUTHORS_INDEX') is True:
+            pagination.add( "AuthorsIndex.pdf", recto=True )
+        pagination.add( "AuthorsList.pdf" )
+
+        self._pagination = pagination
+        return pagination
+
+    # End plan_pages
+    # -----------------------------------------------------------------------
+
+
+    def run_preflight(self, docids=None):
+        """
+        Check all PDF files before tagging them (see Preflight).
+
+        Files are checked by a pool of workers (see the NUMBER_OF_WORKERS
+        preference). Results are stored in the catalog of PDF files, and
+        re-used while a file is not modified.
+
+        @param docids (list) Documents to check, or None for all the sorted
+        documents.
+        @return False if a file can't be tagged.
+
+        """
+        self.tasktext = 'Check PDF files.'
         self.tasknum  = 0
-        
-        count = 0  
-        while count < len(self.sorteddocs):
-            
-            docid = self.sorteddocs[count]
-            self.tasktext = 'Add header/footer to docid '+docid
-            wx.PostEvent(self._notify_window, ResultEvent(text=self.tasktext, num=self.tasknum))
+        self._notify(text=self.tasktext, num=self.tasknum)
+
+        self._preflight = Preflight( self._catalog, utils.get_pdf_tool(self._prefsIO.GetValue('PDF_TOOL')) )
+
+        if docids is None:
+            docids = self.sorteddocs
+        inputnames = [ os.path.join(self.path, docid + ".pdf") for docid in docids ]
+        results = self._preflight.check( inputnames, self._get_workers() )
+
+        errors = list()
+        paper = self._prefsIO.GetValue('PAGE_FORMAT')
+        for docid,inputname in zip(docids, inputnames):
+            result = results[inputname]
+            if result["error"] is not None:
+                logging.info('     ... ... ERROR. %s: %s'%(docid,result["error"]))
+                errors.append( docid+': '+result["error"] )
+            elif result["paper"] is not None and result["paper"] != paper:
+                logging.info('     ... ... Warning. %s: paper format is %s'%(docid,result["paper"]))
+
+        if len(errors) > 0:
+            self._initialize()
+            self._notify(text='PDF export failed. Bad PDF files: '+'; '.join(errors), num=-1)
+            return False
 
-            tagpdf = self._create_tagpdf()
-            self.__set_session_in_tag( tagpdf, docid)
+        return True
 
-            inputname  = os.path.join(self.path, docid + ".pdf")
-            outputname  = os.path.join(self.path, docid + "-tag.pdf")
-            s = self.__get_sessionid_and_rank(docid)
-            s = "Paper_" + s[1:-1] + ".pdf"
-            outputname2 = os.path.join(self.path,s)
+    # End run_preflight
+    # -----------------------------------------------------------------------
+
+
+    def run_tag_pdf(self, docids=None):
+        """
+        Tag all PDF files with an header and a footer.
+
+        The first page of each document is planned (see plan_pages), then
+        documents are tagged by a pool of workers (see the NUMBER_OF_WORKERS
+        preference).
+
+        With the BATCH_TAGGING preference, the header/footer pages of all
+        documents are compiled in a single LaTeX document: each worker then
+        only extracts its pages and stamps its document.
+
+        With the TAG_CACHE preference, tagged files and headers/footers are
+        stored in the data directory: a document is tagged again only if
+        its PDF file or its header/footer (page number...) has changed.
+        With the INCREMENTAL_BUILD preference, a tagged file is recorded
+        with the same key (see BuildState), and it is not tagged again
+        while the key is unchanged.
 
+        @param docids (list) Documents to tag (a shard), or None for all the
+        sorted documents.
+
+        """
+        shard = docids is not None
+        if docids is None:
+            docids = self.sorteddocs
+
+        if not len(docids):
+            return
+
+        self.tasktext = 'Add header/footer to PDF files.'
+
+        self._tagcache = None
+        if self._prefsIO.GetValue('TAG_CACHE') is True:
             try:
-                logging.info('     ... tag: %s --> %s'%(docid,s))
-                N = int( tagpdf.tagFile( inputname,outputname ) )
-                N = int( tagpdf.tagFile( inputname,outputname2 ) )
+                self._tagcache = TagCache( os.path.join(self.path, CACHE_DIRNAME, "tag"), self._catalog )
+            except Exception,e:
+                logging.info('     ... tag cache disabled: %s'%str(e))
+
+        # Header/footer of each document, from its planned pages
+        # (the build state is shared by the shards: it is not used by them)
+        buildstate = self._buildstate if shard is False else None
+        jobs = list()
+        keys = dict()
+        tagpdf = self._create_tagpdf()
+        for docid in docids:
+            inputname = os.path.join(self.path, docid + ".pdf")
+            outputname, copies = self.__get_tag_names(docid)
+            page = self._pagination.get_first_page( docid )
+            try:
+                overlay = self.__get_overlay(tagpdf, docid, page, self._pagination.get_pages( docid ))
+                if buildstate is not None:
+                    keys[docid] = self.__get_tag_key( tagpdf, docid )
+                    if buildstate.is_uptodate( outputname, keys[docid] ):
+                        logging.info('     ... tag: %s is up-to-date.'%docid)
+                        for copyname in copies:
+                            if not os.path.exists(copyname):
+                                utils.link_or_copy( outputname, copyname )
+                        overlay = None
+                    else:
+                        buildstate.set_key( outputname, None )
+                if overlay is not None and self._tagcache is not None:
+                    if self._tagcache.get_tagged( inputname, self.__get_tag_options(tagpdf, overlay), outputname, copies ):
+                        logging.info('     ... tag: %s (from cache)'%docid)
+                        overlay = None
+                        if buildstate is not None:
+                            buildstate.set_key( outputname, keys[docid] )
             except Exception,e:
-                self._initialize()
                 logging.info('     ... ... ERROR. %s'%str(e))
-                wx.PostEvent(self._notify_window, ResultEvent(text='PDF export failed for file: '+docid+'. Error: '+str(e), num=-1))
+                self._notify(text='PDF export failed for file: '+docid+'. Error: '+str(e), num=-1)
                 return
+            if overlay is None:
+                self.__set_tagged( docid, page )
+            else:
+                jobs.append( (docid, overlay, None, 0, 0) )
+
+        # Create the header/footer pages of all documents at once
+        # (except the headers/footers which are already in the cache)
+        background = None
+        if self._prefsIO.GetValue('BATCH_TAGGING') is True:
+            batchjobs = jobs
+            if self._tagcache is not None:
+                batchjobs = [ job for job in jobs if self._tagcache.get_overlay( self.__get_tag_options(tagpdf, job[1]) ) is None ]
+
+            if len(batchjobs) > 0:
+                self.tasktext = 'Create header/footer of all PDF files.'
+                self._notify(text=self.tasktext, num=self.tasknum)
+                background = os.path.join(os.getcwd(), GenName().get_name())
+                try:
+                    ranges = tagpdf.exportOverlays( background+".pdf", [job[1] for job in batchjobs] )
+                except Exception,e:
+                    self.__remove_files( background, [".pdf",".tex"] )
+                    logging.info('     ... ... ERROR. %s'%str(e))
+                    self._notify(text='PDF export failed to create headers/footers. Error: '+str(e), num=-1)
+                    return
+                ranges = dict( zip([job[0] for job in batchjobs], ranges) )
+                jobs = [ (job[0], job[1], background+".pdf") + ranges[job[0]] if job[0] in ranges else job for job in jobs ]
+
+        # Tag all documents (results are returned in the order of jobs)
+        workers = self._get_workers()
+        if workers > 1 and len(jobs) > 1:
+            pool = ThreadPool( min(workers, len(jobs)) )
+            results = pool.imap( self._tag_document, jobs )
+        else:
+            pool = None
+            results = imap( self._tag_document, jobs )
 
-            oldN = int( tagpdf.get_page_number() )
-            self.nbpages = N+oldN
-            tagpdf.set_page_number( str(self.nbpages) )
-            self.documents[docid].set_page( oldN )
-            count = count + 1
+        try:
+            for docid, page, error in results:
+                self.tasktext = 'Add header/footer to docid '+docid
+                self._notify(text=self.tasktext, num=self.tasknum)
 
-            if self._want_abort:
-            # Use a result of None to acknowledge the abort (of
-            # course you can use whatever you'd like or even
-            # a separate event type)
-                wx.PostEvent(self._notify_window, ResultEvent(text=None, num=-1))
-                return
+                if error is not None:
+                    logging.info('     ... ... ERROR. %s'%error)
+                    self._notify(text='PDF export failed for file: '+docid+'. Error: '+error, num=-1)
+                    return
+
+                self.__set_tagged( docid, page )
+                if buildstate is not None:
+                    buildstate.set_key( self.__get_tag_names(docid)[0], keys[docid] )
+
+                if self._want_abort:
+                # Use a result of None to acknowledge the abort (of
+                # course you can use whatever you'd like or even
+                # a separate event type)
+                    self._notify(text=None, num=-1)
+                    return
+
+            # Files of previous runs which are not used anymore (the files
+            # of the other shards are not known by a shard)
+            if self._tagcache is not None and shard is False:
+                self._tagcache.clean()
+        finally:
+            if self._catalog is not None:
+                self._catalog.save()
+            if pool is not None:
+                pool.terminate()
+            if background is not None:
+                self.__remove_files( background, [".pdf",".tex"] )
 
     # End run_tag_pdf
     # -----------------------------------------------------------------------
@@ -282,41 +654,60 @@ class pdf_writer( Thread ):
 
     def run_merge_pdf(self):
         """
-        Merge submission files with: pdftk src1.pdf src2.pdf output res.pdf.
+        Merge submission files with pdftk or qpdf (see PDF_TOOL).
         
         Try to get tagged PDF files. If no tag file is existing, use the
         original PDF file.
 
+        With the INCREMENTAL_BUILD preference, the key of the merged file
+        is made of the keys of the tagged files (see run_tag_pdf), and of
+        the content of the other files: the tool writes a new file each
+        time it tags a file, even if nothing has changed.
+
         """
 
         if not len(self.sortedsessions):
             return
 
-        self.tasktext = 'Merge all tagged submissions.'
-        self.tasknum += 1
-        wx.PostEvent(self._notify_window, ResultEvent(text=self.tasktext, num=self.tasknum))
+        self._start_task( 'Merge all tagged submissions.' )
 
         try:
-            command = 'pdftk '
+            if self._merge_shards is True:
+                self.__check_shards()
+
+            filenames = list()
+            docids = list()
             for session in self.sortedsessions:
-                for c in range(len(self.sorteddocs)):
-                    doc = self.documents[self.sorteddocs[c]]
-                    if doc.get_session() != session:
-                        continue
-
-                    filename = os.path.join(self.path, self.sorteddocs[c] + "-tag.pdf")
-                    if os.path.exists(filename):
-                        command = command + '"' + filename + '" '
+                for docid in self.schedule.get_documents(session):
+                    filename = os.path.join(self.path, docid + "-tag.pdf")
+                    if not os.path.exists(filename):
+                        filename = os.path.join(self.path, docid + ".pdf")
+                    filenames.append( filename )
+                    docids.append( docid )
+            outputname = os.path.join(self.path, "ALL-submissions.pdf")
+
+            key = None
+            if self._buildstate is not None:
+                tagpdf = self._create_tagpdf()
+                keys = list()
+                for docid, filename in zip(docids, filenames):
+                    tagkey = self.__get_tag_key( tagpdf, docid )
+                    if self._buildstate.is_uptodate( filename, tagkey ):
+                        keys.append( tagkey )
                     else:
-                        filename = os.path.join(self.path, self.sorteddocs[c] + ".pdf")
-                        command = command + '"' + filename + '" '
-            command += " output " + '"' + os.path.join(self.path, "ALL-submissions.pdf")+ '" '
-            ret = utils.run_command( command )
-            if len(ret.strip())>0:
-                raise IOError('pdftk can not merge files due to the following reason: \n'+ret)
+                        keys.append( self._buildstate.get_file_key( [filename] ) )
+                key = self._buildstate.get_key( keys )
+                if self._buildstate.is_uptodate( outputname, key ):
+                    logging.info('     ... %s is up-to-date.'%os.path.basename(outputname))
+                    return
+                self._buildstate.set_key( outputname, None )
+
+            utils.get_pdf_tool( self._prefsIO.GetValue('PDF_TOOL') ).merge( filenames, outputname )
+
+            if self._buildstate is not None:
+                self._buildstate.set_key( outputname, key )
         except Exception,e:
-            self._initialize()
-            wx.PostEvent(self._notify_window, ResultEvent(text='Can not merge files. No merged output. %s' % e, num=-1))
+            self._notify(text='Can not merge files. No merged output. %s' % e, num=-1)
             return 
 
     # End run_merge_pdf
@@ -331,60 +722,20 @@ class pdf_writer( Thread ):
         if not len(self.sortedsessions):
             return
 
-        self.tasktext = 'Create the table of contents.'
-        self.tasknum += 1
-        wx.PostEvent(self._notify_window, ResultEvent(text=self.tasktext, num=self.tasknum))
-
-        latex =  "\\thispagestyle{empty}\n"
-        latex += "\\pagestyle{empty}\n"
-        latex += '\\section*{'+title+'}\n'
-        latex += "\\begin{longtable}{p{15cm}p{1cm}}\n"
-
-        for session in self.sortedsessions:
-
-            # Add the session name only for sessions with documents
-            thissessiondoc = list()
-            for i in range(len(self.sorteddocs)):
-                doc = self.documents[self.sorteddocs[i]]
-                if doc.get_session() == session:
-                    thissessiondoc.append( doc )
-    
-            # Add documents
-            if len(thissessiondoc):
-
-                latex += "  &  \\\\ \n"
-                latex += "\\color{color3}{{\\bf " + session.get_session_name() + "}} &  \\\\ \n"
-                latex += "  &  \\\\ \n"
-                
-                for doc in thissessiondoc:
-                    if doc.get_session() != session:
-                        continue
-                    # first line : title, then page number
-                    #latex += "{\\bf " + self.documents[docid].get_title() + "} & "
-                    latex += "$ \\color{color1}{"+self.__get_sessionid_and_rank(doc.get_docid()) + "}$ {\\bf " + doc.get_title() + "} "
-                    latex += " & \\color{color2}{" + str(doc.get_page())  + "} \\\\ \n"
-                    # second line : complete list of authors
-                    latex +=" {\it "
-                    for author in doc.get_authors():
-                        latex += author.get_firstname()+" "+author.get_lastname()+", "
-                    latex = latex[:-2] + "} & \\\\ \n"
-                    # an empty line between 2 documents
-                    latex += "  &  \\\\ \n"
+        self._start_task( 'Create the table of contents.' )
 
-                    if self._want_abort:
-                    # Use a result of None to acknowledge the abort.
-                        wx.PostEvent(self._notify_window, ResultEvent(text=None, num=-1))
-                        return
+        latex = self.__get_toc_latex( title )
+        if latex is None:
+            # Use a result of None to acknowledge the abort.
+            self._notify(text=None, num=-1)
+            return
 
-        latex +=  "\\end{longtable}\n"
-        latex = latex.replace('_', '\_')
         try:
-            # No header nor footer in the TOC 
-            self.__generate_latex( self._create_empty_tagpdf(), latex, os.path.join(self.path, "TableOfContent.pdf"), inc=False)
+            # No header nor footer in the TOC (so, no page number)
+            self.__generate_latex( self._create_empty_tagpdf(), latex, os.path.join(self.path, "TableOfContent.pdf"), 1 )
         except Exception,e:
-            self._initialize()
             logging.info('... Error. Can not create the TOC: %s'%str(e))
-            wx.PostEvent(self._notify_window, ResultEvent(text='Error. Can not create the table of contents.', num=-1))
+            self._notify(text='Error. Can not create the table of contents.', num=-1)
             return        
 
     # End run_toc
@@ -396,44 +747,29 @@ class pdf_writer( Thread ):
         Create the index of authors as a PDF file.
         """
 
-        self.tasktext = 'Create the index of authors.'
-        self.tasknum += 1
-        wx.PostEvent(self._notify_window, ResultEvent(text=self.tasktext, num=self.tasknum))
-
-        latex =  '\\section*{'+title+'}\n'
-        latex += "\\begin{longtable}{p{45mm}p{75mm}p{4cm}}\n"
-
-        for authorid in sorted(self.authors.keys(), key=lambda v: v.upper()):
-            author = self.authors[authorid]
-
-            pages = list()
-            for doc in self.documents.values():
-                if author in doc.get_authors():
-                    p = doc.get_page()
-                    if not p is None and not p == 0:
-                        pages.append( str(p) )
+        self._start_task( 'Create the index of authors.' )
 
-            if len(pages) > 0:
-                docspages = ", ".join(pages)
-                latex += author.get_lastname()+", "+self.__initials(author.get_firstname()) + ". & "
-                latex += "{\sf "+author.get_email() + "} & "
-                latex += docspages + " \\\\ \n"
-
-            if self._want_abort:
+        latex = self.__get_index_latex( title )
+        if latex is None:
             # Use a result of None to acknowledge the abort.
-                wx.PostEvent(self._notify_window, ResultEvent(text=None, num=-1))
-                return
-        latex +=  "\\end{longtable}\n"
+            self._notify(text=None, num=-1)
+            return
 
+        filename = os.path.join(self.path, "AuthorsIndex.pdf")
         try:
             tagpdf = self._create_tagpdf()
             #self.__unset_session_in_tag(tagpdf)
-            self.__generate_latex( tagpdf, latex, os.path.join(self.path, "AuthorsIndex.pdf") )
+            self.__generate_latex( tagpdf, latex, filename, self._pagination.get_first_page( "AuthorsIndex.pdf" ) )
         except Exception,e:
-            self._initialize()
-            wx.PostEvent(self._notify_window, ResultEvent(text='Error. Can not create the index of authors.', num=-1))
+            self._notify(text='Error. Can not create the index of authors.', num=-1)
             return        
 
+        # The list of authors follows the index
+        pages = 0
+        if os.path.exists( filename ):
+            pages = self.__count_pages( filename )
+        self._pagination.set_pages( "AuthorsIndex.pdf", pages )
+
     # End run_index_authors
     # -----------------------------------------------------------------------
 
@@ -443,33 +779,20 @@ class pdf_writer( Thread ):
         Create the list of authors
         """
         
-        self.tasktext = 'Create the list of authors.'
-        self.tasknum += 1
-        wx.PostEvent(self._notify_window, ResultEvent(text=self.tasktext, num=self.tasknum))
-
-        latex =  '\\section*{'+title+'}\n'
-        latex += "\\begin{longtable}{p{8cm}p{8cm}}\n"
-        for authorid in sorted(self.authors.keys()):
-            author = self.authors[authorid]
-            # get only authors of a document!
-            for doc in self.documents.values():
-                if author in doc.get_authors():
-                    latex += author.get_lastname()+" "+author.get_firstname() + " & "
-                    latex += author.get_email() + " \\\\ \n"
+        self._start_task( 'Create the list of authors.' )
 
-                if self._want_abort:
-                # Use a result of None to acknowledge the abort.
-                    wx.PostEvent(self._notify_window, ResultEvent(text=None, num=-1))
-                    return
+        latex = self.__get_list_latex( title )
+        if latex is None:
+            # Use a result of None to acknowledge the abort.
+            self._notify(text=None, num=-1)
+            return
 
-        latex += "\\end{longtable}\n"
         try:
             tagpdf = self._create_tagpdf()
             self.__unset_session_in_tag(tagpdf)
-            self.__generate_latex( tagpdf, latex, os.path.join(self.path, "AuthorsList.pdf"), inc=False)
+            self.__generate_latex( tagpdf, latex, os.path.join(self.path, "AuthorsList.pdf"), self._pagination.get_first_page( "AuthorsList.pdf" ) )
         except Exception,e:
-            self._initialize()
-            wx.PostEvent(self._notify_window, ResultEvent(text='Error. Can not create the list of authors.', num=-1))
+            self._notify(text='Error. Can not create the list of authors.', num=-1)
             return        
 
     # End run_list_authors
@@ -481,64 +804,19 @@ class pdf_writer( Thread ):
         Create the program.
         """
 
-        self.tasktext = 'Create the program.'
-        self.tasknum += 1
-        wx.PostEvent(self._notify_window, ResultEvent(text=self.tasktext, num=self.tasknum))
-
-        # Necessarily the program is organized by dates!
-        self.sort_documents(sortbytype=False)
-
-        latex =  "\\thispagestyle{empty}\n"
-        latex += "\\pagestyle{empty}\n"
-        latex += '\\section*{'+title+'}\n'
-
-        for datesession in self.sorteddates:
-            if len(self.sorteddates)>1:
-                latex +=  "\\subsection*{ \\color{color2}{"+datesession.strftime('%A, %B %d %Y')+" } }\n"
-            latex += "\\begin{longtable}{p{35mm}p{125mm}}\n"
+        self._start_task( 'Create the program.' )
 
-            for session in self.sortedsessions:
-    
-                if session.get_date() == datesession:
-                    #latex += "\\hline \n"
-                    latex += " & \\\\ \n"
-                    # Add the hours info
-                    latex += "{\\bf " + session.get_h_deb()+" - "+session.get_h_fin()+"} & "
-                    # Add the Session Name
-                    latex += "\\color{color3}{{\\bf " + session.get_session_name() +"}} \\\\ \n"
-                    latex += " & \\\\ \n"
-    
-                    # Add the list of documents
-                    #if "PS" in session.get_session_name(): ######AMLAP: do not include posters in TOC
-                    #    continue
-                    for i in range(len(self.sorteddocs)):
-                        doc = self.documents[self.sorteddocs[i]]
-                        if doc.get_session() == session:
-                            latex +=" & "
-                            # first line : sessionid, title, then page number
-                            latex += "$ \\color{color1}{"+ self.__get_sessionid_and_rank(doc.get_docid()) + "} $ "
-                            latex += "{\\bf  "+ doc.get_title() + "} \\\\ \n"
-                            # second line : complete list of authors
-                            latex +=" & {\it "
-                            for author in doc.get_authors():
-                                latex += author.get_firstname()+" "+author.get_lastname()+", "
-                            latex = latex[:-2] + "} \\\\ \n"
-                    #latex += " & \\\\ \n"
-
-                    if self._want_abort:
-                    # Use a result of None to acknowledge the abort.
-                        wx.PostEvent(self._notify_window, ResultEvent(text=None, num=-1))
-                        return
-
-            latex +=  "\\end{longtable}\n"
-        latex = latex.replace('_', '\_')
+        latex = self.__get_program_latex( title )
+        if latex is None:
+            # Use a result of None to acknowledge the abort.
+            self._notify(text=None, num=-1)
+            return
 
         try:
-            self.__generate_latex( self._create_empty_tagpdf(), latex, os.path.join(self.path, "Program.pdf"), inc=False)
+            self.__generate_latex( self._create_empty_tagpdf(), latex, os.path.join(self.path, "Program.pdf"), 1 )
         except Exception, e:
-            self._initialize()
             logging.info('... Error. Can not create the Program: %s'%str(e))
-            wx.PostEvent(self._notify_window, ResultEvent(text='Error. Can not create the program.', num=-1))
+            self._notify(text='Error. Can not create the program.', num=-1)
             return        
 
     # End run_program
@@ -550,200 +828,117 @@ class pdf_writer( Thread ):
         Create the short program.
         """
 
-        self.tasktext = 'Create the program overview.'
-        self.tasknum += 1
-        wx.PostEvent(self._notify_window, ResultEvent(text=self.tasktext, num=self.tasknum))
-
-        # Necessarily the program is organized by dates!
-        self.sort_documents(sortbytype=False)
+        self._start_task( 'Create the program overview.' )
 
-        latex =  "\\thispagestyle{empty}\n"
-        latex += "\\pagestyle{empty}\n"
-        latex += '\\section*{'+title+'}\n'
-    
-        for datesession in self.sorteddates:
-            
-            if len(self.sorteddates)>1:
-                latex +=  "\\subsection*{ \\color{color2}{"+datesession.strftime('%A, %B %d %Y')+"} }\n"
-            latex += "\\begin{longtable}{|p{4cm}p{10cm}p{2cm}|}\n"
-            latex += "\\hline \n"
-    
-            for session in self.sortedsessions:
-
-                if session.get_date() == datesession:
-                    latex += " & & \\\\ \n"
-                    # Add the hours info
-                    latex += session.get_h_deb()+" - "+session.get_h_fin()+" & "
-                    # Add the sessionID only for sessions with documents
-                    withdoc = False
-
-                    for i in range(len(self.sorteddocs)):
-                        doc = self.documents[self.sorteddocs[i]]
-                        if doc.get_session() == session:
-                            withdoc = True
-
-                    if withdoc is True:
-                        latex += "\\color{color1}{" + session.get_sessionid()+"} "
-
-                    # Add the Session Name
-                    latex += "\\color{color3}{ " + session.get_session_name() + "} & "
-                    if session.get_location() is not None:
-                        latex += session.get_location()
-                    latex += " \\\\ \n"
-                    latex += " & & \\\\ \n"
-
-                    if self._want_abort:
-                    # Use a result of None to acknowledge the abort.
-                        wx.PostEvent(self._notify_window, ResultEvent(text=None, num=-1))
-                        return
-
-            latex += "\\hline \n"
-            latex +=  "\\end{longtable}\n"
-            latex +=  "\\pagebreak\n"
+        latex = self.__get_short_program_latex( title )
+        if latex is None:
+            # Use a result of None to acknowledge the abort.
+            self._notify(text=None, num=-1)
+            return
 
-        latex = latex.replace('_', '\_')
         try:
-            self.__generate_latex( self._create_empty_tagpdf(), latex, os.path.join(self.path, "ProgramOverview.pdf"), inc=False)
+            self.__generate_latex( self._create_empty_tagpdf(), latex, os.path.join(self.path, "ProgramOverview.pdf"), 1 )
         except Exception, e:
-            self._initialize()
-            wx.PostEvent(self._notify_window, ResultEvent(text='Error. Can not create the program overview.', num=-1))
+            self._notify(text='Error. Can not create the program overview.', num=-1)
             return        
 
     # End run_short_program
     # -----------------------------------------------------------------------
 
 
-    # -----------------------------------------------------------------------
-    # Private
-    # -----------------------------------------------------------------------
-
-
-    def sort_sessions_by_type(self):
+    def run_book(self):
         """
-        Sort all sessions depending on the date.
-        
-        If at least one date is missing, sort on alpha-numeric of keys.
+        Create the proceedings in a single book (Proceedings.pdf), with one
+        LaTeX job instead of tagging, merging and compiling each document.
+
+        The book contains the table of contents, the program and its
+        overview (without page numbers), the submissions with their
+        header/footer (included with pdfpages), the index of authors (on a
+        recto) and the list of authors, depending on the preferences. Page
+        numbers are computed by LaTeX: the table of contents and the index
+        refer to the label of the first page of each submission.
 
         """
-        self.sortedsessions = list()
+        self._start_task( 'Create the book.' )
+        self._book = self._prefsIO.GetValue('GENERATE_MERGED_SUBMISSIONS')
+
+        tagpdf = self._create_tagpdf()
+        parts = list()
+
+        # Front matter, without header/footer
+        for name, title, function in [ ('GENERATE_TABLEOFCONTENTS', 'TITLE_TABLEOFCONTENTS', self.__get_toc_latex),
+                                       ('GENERATE_PROGRAM', 'TITLE_PROGRAM', self.__get_program_latex),
+                                       ('GENERATE_PROGRAM_OVERVIEW', 'TITLE_PROGRAM_OVERVIEW', self.__get_short_program_latex) ]:
+            if self._prefsIO.GetValue(name) is True:
+                part = dict( (option, "") for option in TAG_OPTIONS )
+                part["content"] = function( self._prefsIO.GetValue(title) )
+                parts.append( part )
+
+        # Submissions, numbered from their planned first page
+        pdffiles = list()
+        if self._book is True:
+            for docid in self.sorteddocs:
+                part = self.__get_session_in_tag( tagpdf, docid )
+                part["pdffile"] = os.path.join(self.path, docid + ".pdf")
+                part["numberofpages"] = self._pagination.get_pages( docid )
+                part["label"] = self.__get_label( docid )
+                if len(pdffiles) == 0:
+                    part["pagenumber"] = self._pagination.get_first_page( docid )
+                parts.append( part )
+                pdffiles.append( part["pdffile"] )
 
-        # Keep all sessions types
-        alltypes = list()
-        for session in self.sessions.values():
-            sessionidkey = session.get_sessionid()
-            sessionidkey = sessionidkey.replace('[', '')
-            sessionidkey = sessionidkey.replace(']', '')
-            sessionidkey = sessionidkey[0:2]
-            if sessionidkey not in alltypes:
-                alltypes.append(sessionidkey)
-        # sort ID-keys
-        self.sortedidkeys = sorted(alltypes)
-
-        # sort sessions inside each type
-        for idtype in self.sortedidkeys:
-            
-            # keep all sessions of this type
-            sessionstype = list()
-            for session  in self.sessions.values():
-                if idtype in session.get_sessionid():
-                    sessionstype.append(session)
-
-            # keep all dates of this session-type in a list
-            alldates = list()
-            for session in sessionstype: #self.sessions.values():
-                sessiondate = session.get_date()
-                if sessiondate not in alldates:
-                    alldates.append(sessiondate)
-
-            # sort dates
-            self.sorteddates = sorted(alldates)
-            # sort sessions inside each date
-            for date in self.sorteddates:
-                # keep all sessions of this date
-                sessionsdate = list()
-                for session  in sessionstype: #self.sessions.values():
-                    if session.get_date() == date:
-                        sessionsdate.append(session)
-
-                # sort sessions of this date, with their rank
-                ranks = {}
-                r = 1000
-                for session in sessionsdate:
-                    if session.get_rank() != 0:
-                        ranks[session.get_rank()] = session
-                    else:
-                        # some missing ranks...
-                        # unsorted sessions at the end
-                        ranks[r] = session
-                        r = r+1
+        if self._prefsIO.GetValue('GENERATE_AUTHORS_INDEX') is True:
+            parts.append( { "content":self.__get_index_latex( self._prefsIO.GetValue('TITLE_AUTHORS_INDEX') ), "recto":True } )
 
-                    if self._want_abort:
-                    # Use a result of None to acknowledge the abort.
-                        wx.PostEvent(self._notify_window, ResultEvent(text=None, num=-1))
-                        return
-                            
-                for r in sorted(ranks.keys()):
-                    self.sortedsessions.append( ranks[r] )
-
-    # End sort_sessions_by_type
-    # -----------------------------------------------------------------------
+        if self._prefsIO.GetValue('GENERATE_AUTHORS_LIST') is True:
+            listpdf = self._create_tagpdf()
+            self.__unset_session_in_tag( listpdf )
+            part = dict( (option, listpdf.get_option(option)) for option in TAG_OPTIONS )
+            part["content"] = self.__get_list_latex( self._prefsIO.GetValue('TITLE_AUTHORS_LIST') )
+            parts.append( part )
 
+        if any( "content" in part and part["content"] is None for part in parts ):
+            # Use a result of None to acknowledge the abort.
+            self._notify(text=None, num=-1)
+            return
 
-    def sort_sessions_by_date(self):
-        """
-        Sort all sessions depending on the date.
-        
-        If at least one date is missing, sort on alpha-numeric of keys.
+        if len(parts) == 0:
+            return
 
-        """
-        self.sortedsessions = list()
+        # Contents are escaped as in separate documents (see __generate_latex)
+        for part in parts:
+            if "content" in part:
+                part["content"] = self.__format( part["content"] )
 
-        if len(self.validator.date_in_sessions()) > 0:
-            # Some missing dates in sessions...
-            self.sortedsessions = sorted(self.sessions.keys())
-            return False
+        filename = os.path.join(self.path, "Proceedings.pdf")
+        try:
+            key = None
+            if self._buildstate is not None:
+                key = self._buildstate.get_key( tagpdf.get_options(), parts, self._buildstate.get_file_key( pdffiles ) )
+                if self._buildstate.is_uptodate( filename, key ):
+                    logging.info('     ... %s is up-to-date.'%os.path.basename(filename))
+                    return
+                self._buildstate.set_key( filename, None )
 
-        # keep all dates in a list
-        alldates = list()
-        for session in self.sessions.values():
-            sessiondate = session.get_date()
-            if sessiondate not in alldates:
-                alldates.append(sessiondate)
-                
-        # sort dates
-        self.sorteddates = sorted(alldates)
-        
-        # sort sessions inside each date
-        for date in self.sorteddates:
-            
-            # keep all sessions of this date
-            sessionsdate = list()
-            for session  in self.sessions.values():
-                if session.get_date() == date:
-                    sessionsdate.append(session)
-
-            # sort sessions of this date, with their rank
-            ranks = {}
-            r = 1000
-            for session in sessionsdate:
-                if session.get_rank() != 0:
-                    ranks[session.get_rank()] = session
-                else:
-                    # unsorted sessions at the end
-                    ranks[r] = session
-                    r = r+1
+            tagpdf.set_parts( parts )
+            try:
+                tagpdf.exportPDF( filename )
+            finally:
+                tagpdf.set_parts( None )
 
-                if self._want_abort:
-                # Use a result of None to acknowledge the abort.
-                    wx.PostEvent(self._notify_window, ResultEvent(text=None, num=-1))
-                    return
+            if self._buildstate is not None:
+                self._buildstate.set_key( filename, key )
+        except Exception,e:
+            logging.info('... Error. Can not create the book: %s'%str(e))
+            self._notify(text='Error. Can not create the book. %s' % e, num=-1)
+            return
 
-            for r in sorted(ranks.keys()):
-                self.sortedsessions.append( ranks[r] )
+    # End run_book
+    # -----------------------------------------------------------------------
 
-        return True
 
-    # End sort_sessions_by_date
+    # -----------------------------------------------------------------------
+    # Private
     # -----------------------------------------------------------------------
 
 
@@ -755,54 +950,92 @@ class pdf_writer( Thread ):
         3. the rank.
         
         If at least one document is not assigned to a session, sort by docid.
+
+        The schedule of each kind of sort is created only once.
         
         """
+        self.schedule = self._get_schedule( sortbytype )
 
-        self.sorteddocs = list()
+        self.sortedsessions = self.schedule.sortedsessions
+        self.sorteddates    = self.schedule.sorteddates
+        self.sorteddocs     = self.schedule.sorteddocs
 
-        if len(self.validator.session_in_documents()) > 0:
-            # No sessions, sort by docid...
-            self.sorteddocs = sorted(self.documents.keys())
-            return False
+        return self.schedule.is_sorted()
 
-        # Sort by sessions
-        if sortbytype is False:
-            self.sort_sessions_by_date()
-        else:
-            self.sort_sessions_by_type()
+    # End sort_documents
+    # -----------------------------------------------------------------------
 
-        for s in self.sortedsessions:
-            
-            # List all docs of this sessions (the docid)
-            docs = list()
-            for d in self.documents.values():
-                if d.get_session() == s:
-                    docs.append(d.get_docid())
-
-            # then, sort these docs with their rank...
-            ranks = {}
-            ranks[0] = None
-            for docid in docs:
-                if self.documents[docid].get_rank() is None or self.documents[docid].get_rank() == 0:
-                    # some missing ranks... get the next good rank
-                    r = 1
-                    while r in ranks.keys():
-                        r = r+1
-                else:
-                    # get the given rank (except if duplicated!)
-                    if self.documents[docid].get_rank() not in ranks.keys():
-                        r = self.documents[docid].get_rank()
+
+    def _get_schedule(self, sortbytype=False):
+        # Return the schedule of a kind of sort, created only once.
+        # Stages use it instead of sort_documents, which modifies self.
+        with self._lock:
+            if not sortbytype in self._schedules:
+                self._schedules[sortbytype] = Schedule( self.documents, self.sessions, sortbytype, self.validator )
+            return self._schedules[sortbytype]
+
+    # End _get_schedule
+    # -----------------------------------------------------------------------
+
+
+    def _tag_document(self, job):
+        # Tag a document from a tuple (docid, header/footer options,
+        # background, first and last pages in the background). With no
+        # background, the header/footer pages are created for this document.
+        # Return the docid, the page number and an error message (or None).
+        # Executed by the workers of run_tag_pdf: it must not modify self.
+        docid, overlay, background, first, last = job
+        page = int( overlay["pagenumber"] )
+        try:
+            tagpdf = self._create_tagpdf()
+            for name, value in overlay.items():
+                tagpdf.set_option(name, value)
+
+            inputname = os.path.join(self.path, docid + ".pdf")
+            outputname, copies = self.__get_tag_names(docid)
+            logging.info('     ... tag: %s --> %s'%(docid,os.path.basename(copies[0])))
+
+            overlayname = None
+            if self._tagcache is not None:
+                overlayname = self._tagcache.get_overlay( tagpdf.get_options() )
+
+            fname = os.path.join(os.getcwd(), GenName().get_name())
+            try:
+                if overlayname is None:
+                    if background is None:
+                        tagpdf.exportPDF( fname+".pdf" )
                     else:
-                        r = 1
-                        while r in ranks.keys():
-                            r = r+1
-                ranks[r] = docid
-            for r in sorted(ranks.keys()):
-                if r > 0:
-                    self.sorteddocs.append( ranks[r] )
-        return True
+                        utils.extract_pages( background, first, last, fname+".pdf", self._prefsIO.GetValue('PDF_TOOL') )
+                    overlayname = fname+".pdf"
+                    if self._tagcache is not None:
+                        overlayname = self._tagcache.add_overlay( tagpdf.get_options(), overlayname )
+                tagpdf.stampFile( inputname,overlayname,outputname,copies )
+            finally:
+                self.__remove_files( fname, [".pdf",".tex"] )
+
+            if self._tagcache is not None:
+                self._tagcache.add_tagged( inputname, tagpdf.get_options(), outputname )
+        except Exception,e:
+            return (docid, page, str(e))
+
+        return (docid, page, None)
+
+    # -----------------------------------------------------------------------
+
+
+    def _get_workers(self):
+        # Return the number of workers to use (0 means: one per processor).
+        try:
+            workers = int( self._prefsIO.GetValue('NUMBER_OF_WORKERS') )
+        except Exception:
+            return 1
+        if workers < 1:
+            try:
+                workers = cpu_count()
+            except NotImplementedError:
+                workers = 1
+        return workers
 
-    # End sort_documents
     # -----------------------------------------------------------------------
 
 
@@ -811,6 +1044,9 @@ class pdf_writer( Thread ):
         tagpdf = tagPdfFile()
 
         tagpdf.set_paper_format( self._prefsIO.GetValue('PAGE_FORMAT') )
+        tagpdf.set_stamp_backend( self._prefsIO.GetValue('STAMP_BACKEND') )
+        tagpdf.set_direct_pdf( self._prefsIO.GetValue('DIRECT_OVERLAY') )
+        tagpdf.set_format_cache( self._formats )
         tagpdf.set_top_margin( self._prefsIO.GetValue('TOP_MARGIN') )
         tagpdf.set_bottom_margin( self._prefsIO.GetValue('BOTTOM_MARGIN') )
         tagpdf.set_head_size( self._prefsIO.GetValue('HEADER_SIZE') )
@@ -830,7 +1066,7 @@ class pdf_writer( Thread ):
         tagpdf.set_header_rule( self._prefsIO.GetValue('HEADER_RULER') )
         tagpdf.set_footer_rule( self._prefsIO.GetValue('FOOTER_RULER') )
 
-        tagpdf.set_page_number( self.nbpages )
+        tagpdf.set_page_number( 1 )
 
         return tagpdf
 
@@ -842,6 +1078,7 @@ class pdf_writer( Thread ):
         tagpdf = tagPdfFile()
 
         tagpdf.set_paper_format( self._prefsIO.GetValue('PAGE_FORMAT') )
+        tagpdf.set_format_cache( self._formats )
         tagpdf.set_top_margin( self._prefsIO.GetValue('TOP_MARGIN') )
         tagpdf.set_bottom_margin( self._prefsIO.GetValue('BOTTOM_MARGIN') )
         tagpdf.set_head_size( self._prefsIO.GetValue('HEADER_SIZE') )
@@ -861,13 +1098,23 @@ class pdf_writer( Thread ):
         tagpdf.set_header_rule( False )
         tagpdf.set_footer_rule( False )
 
-        tagpdf.set_page_number( self.nbpages )
+        tagpdf.set_page_number( 1 )
 
         return tagpdf
 
     # -----------------------------------------------------------------------
 
 
+    def __get_author_index(self):
+        # Return the index of the documents of each author (created once).
+        if self._authorindex is None:
+            self._authorindex = AuthorIndex( self.documents )
+        return self._authorindex
+
+    # End __get_author_index
+    # -----------------------------------------------------------------------
+
+
     def __get_sessionid_and_rank(self, docid):
         # Get the session
         __s = self.documents[docid].get_session()
@@ -890,31 +1137,104 @@ class pdf_writer( Thread ):
     # -----------------------------------------------------------------------
 
 
-    def __set_session_in_tag(self, tagpdf, docid):
+    def __get_session_in_tag(self, tagpdf, docid):
         # A LA SAUVAGE: on suppose que seuls les ID de sessions contiennent des []
-        
-        if "session" in tagpdf.get_option("rightheader").lower():
-            tagpdf.set_right_header( self.__get_sessionid_and_rank(docid) )
-            
-        if "session" in tagpdf.get_option("leftheader").lower():
-            tagpdf.set_left_header( self.__get_sessionid_and_rank(docid) )
-            
-        if "session" in tagpdf.get_option("centerheader").lower():
-            tagpdf.set_center_header( self.__get_sessionid_and_rank(docid) )
-            
-        if "session" in tagpdf.get_option("rightfooter").lower():
-            tagpdf.set_right_footer( self.__get_sessionid_and_rank(docid) )
-            
-        if "session" in tagpdf.get_option("leftfooter").lower():
-            tagpdf.set_left_footer( self.__get_sessionid_and_rank(docid) )
-            
-        if "session" in tagpdf.get_option("centerfooter").lower():
-            tagpdf.set_center_footer( self.__get_sessionid_and_rank(docid) )
+        # Return the header/footer options to be replaced by the session.
+        options = dict()
+        for name in ["rightheader", "leftheader", "centerheader", "rightfooter", "leftfooter", "centerfooter"]:
+            if "session" in tagpdf.get_option(name).lower():
+                options[name] = self.__get_sessionid_and_rank(docid)
+        return options
+
+    # End __get_session_in_tag
+    # -----------------------------------------------------------------------
+
+
+    def __set_session_in_tag(self, tagpdf, docid):
+        for name, value in self.__get_session_in_tag(tagpdf, docid).items():
+            tagpdf.set_option(name, value)
 
     # End __set_session_in_tag
     # -----------------------------------------------------------------------
 
 
+    def __get_overlay(self, tagpdf, docid, page, N):
+        # Return the options of the header/footer pages of a document.
+        overlay = self.__get_session_in_tag( tagpdf, docid )
+        overlay["pagenumber"]    = str(page)
+        overlay["numberofpages"] = N
+        return overlay
+
+    # End __get_overlay
+    # -----------------------------------------------------------------------
+
+
+    def __get_tag_options(self, tagpdf, overlay):
+        # Return all the options of the header/footer pages of a document.
+        options = dict( tagpdf.get_options() )
+        options.update( overlay )
+        return options
+
+    # End __get_tag_options
+    # -----------------------------------------------------------------------
+
+
+    def __get_tag_key(self, tagpdf, docid):
+        # Return the key of the tagged file of a document (see BuildState):
+        # the content of its PDF file and the options of its header/footer.
+        inputname = os.path.join(self.path, docid + ".pdf")
+        overlay = self.__get_overlay(tagpdf, docid, self._pagination.get_first_page( docid ), self._pagination.get_pages( docid ))
+        return self._buildstate.get_key( self._buildstate.get_file_key( [inputname] ), self.__get_tag_options(tagpdf, overlay), self._prefsIO.GetValue('STAMP_BACKEND') )
+
+    # End __get_tag_key
+    # -----------------------------------------------------------------------
+
+
+    def __get_tag_names(self, docid):
+        # Return the name of the tagged file, and the list of its copies.
+        s = self.__get_sessionid_and_rank(docid)
+        s = "Paper_" + s[1:-1] + ".pdf"
+        return os.path.join(self.path, docid + "-tag.pdf"), [os.path.join(self.path,s)]
+
+    # End __get_tag_names
+    # -----------------------------------------------------------------------
+
+
+    def __count_pages(self, filename):
+        # Number of pages of a PDF file, from the catalog if possible.
+        if self._catalog is not None:
+            return self._catalog.get_pages( filename, self._prefsIO.GetValue('PDF_TOOL') )
+        return utils.countPages( filename, self._prefsIO.GetValue('PDF_TOOL') )
+
+    # End __count_pages
+    # -----------------------------------------------------------------------
+
+
+    def __set_tagged(self, docid, page):
+        # Record the last tagged output of a document in the catalog.
+        if self._catalog is not None:
+            inputname = os.path.join(self.path, docid + ".pdf")
+            outputname, copies = self.__get_tag_names(docid)
+            digest = None
+            if self._shard is not None:
+                # checked by the merge of the shards (see __check_shards)
+                digest = self._catalog.get_hash( outputname )
+            self._catalog.set_values( inputname, { "tagged":(os.path.basename(outputname), page, digest) } )
+
+    # End __set_tagged
+    # -----------------------------------------------------------------------
+
+
+    def __remove_files(self, fname, extensions):
+        # Remove the files fname+extension, if existing.
+        for ext in extensions:
+            if os.path.exists(fname+ext):
+                os.remove(fname+ext)
+
+    # End __remove_files
+    # -----------------------------------------------------------------------
+
+
     def __unset_session_in_tag(self, tagpdf):
         # A LA SAUVAGE: on suppose que seuls les ID de sessions contiennent des []
         if "session" in tagpdf.get_option("rightheader").lower():
@@ -939,24 +1259,305 @@ class pdf_writer( Thread ):
     # -----------------------------------------------------------------------
 
 
-    def __generate_latex(self, tagpdf, latex, filename, inc=True):
-        # recto or verso? Supposed to be on a recto (impair number)
-        if inc is True and not self.nbpages%2:
-            self.nbpages += 1
+    def __generate_latex(self, tagpdf, latex, filename, page):
+        # Generate filename from a LaTeX content, from the given page number.
+        # Page numbers are planned by plan_pages.
+        tagpdf.set_page_number( page )
+        content = self.__format(latex)
 
-        tagpdf.set_page_number( self.nbpages )
-        tagpdf.set_tex_content( self.__format(latex) )
-        tagpdf.exportPDF( filename )
-        tagpdf.set_tex_content( None )
+        # Generate the file only if its content or its header/footer changed
+        key = None
+        if self._buildstate is not None:
+            key = self._buildstate.get_key( content, tagpdf.get_options() )
 
-        # update nbpages
-        if inc is True and os.path.exists( filename ):
-            self.nbpages += utils.countPages( filename )
+        if key is not None and self._buildstate.is_uptodate( filename, key ):
+            logging.info('     ... %s is up-to-date.'%os.path.basename(filename))
+        else:
+            if key is not None:
+                self._buildstate.set_key( filename, None )
+            tagpdf.set_tex_content( content )
+            tagpdf.exportPDF( filename )
+            tagpdf.set_tex_content( None )
+            if key is not None:
+                self._buildstate.set_key( filename, key )
 
     # End __generate_latex
     # -----------------------------------------------------------------------
 
 
+    def __get_toc_latex(self, title):
+        # Return the LaTeX content of the table of contents, or None if aborted.
+        latex =  "\\thispagestyle{empty}\n"
+        latex += "\\pagestyle{empty}\n"
+        latex += '\\section*{'+title+'}\n'
+        latex += "\\begin{longtable}{p{15cm}p{1cm}}\n"
+
+        for session in self.sortedsessions:
+
+            # Add the session name only for sessions with documents
+            thissessiondoc = [ self.documents[docid] for docid in self.schedule.get_documents(session) ]
+    
+            # Add documents
+            if len(thissessiondoc):
+
+                latex += "  &  \\\\ \n"
+                latex += "\\color{color3}{{\\bf " + session.get_session_name() + "}} &  \\\\ \n"
+                latex += "  &  \\\\ \n"
+                
+                for doc in thissessiondoc:
+                    # first line : title, then page number
+                    #latex += "{\\bf " + self.documents[docid].get_title() + "} & "
+                    latex += "$ \\color{color1}{"+self.__get_sessionid_and_rank(doc.get_docid()) + "}$ {\\bf " + doc.get_title() + "} "
+                    latex += " & \\color{color2}{" + self.__get_page_text(doc.get_docid())  + "} \\\\ \n"
+                    # second line : complete list of authors
+                    latex +=" {\it "
+                    for author in doc.get_authors():
+                        latex += author.get_firstname()+" "+author.get_lastname()+", "
+                    latex = latex[:-2] + "} & \\\\ \n"
+                    # an empty line between 2 documents
+                    latex += "  &  \\\\ \n"
+
+                    if self._want_abort:
+                        return None
+
+        latex +=  "\\end{longtable}\n"
+        latex = latex.replace('_', '\_')
+        return latex
+
+    # End __get_toc_latex
+    # -----------------------------------------------------------------------
+
+
+    def __get_index_latex(self, title):
+        # Return the LaTeX content of the index of authors, or None if aborted.
+        latex =  '\\section*{'+title+'}\n'
+        latex += "\\begin{longtable}{p{45mm}p{75mm}p{4cm}}\n"
+
+        for authorid in sorted(self.authors.keys(), key=lambda v: v.upper()):
+            author = self.authors[authorid]
+
+            pages = list()
+            for docid in self.__get_author_index().get_documents( author.get_authorid() ):
+                p = self.documents[docid].get_page()
+                if self._book is True or (not p is None and not p == 0):
+                    pages.append( self.__get_page_text(docid) )
+
+            if len(pages) > 0:
+                docspages = ", ".join(pages)
+                latex += author.get_lastname()+", "+self.__initials(author.get_firstname()) + ". & "
+                latex += "{\sf "+author.get_email() + "} & "
+                latex += docspages + " \\\\ \n"
+
+            if self._want_abort:
+                return None
+        latex +=  "\\end{longtable}\n"
+        return latex
+
+    # End __get_index_latex
+    # -----------------------------------------------------------------------
+
+
+    def __get_list_latex(self, title):
+        # Return the LaTeX content of the list of authors, or None if aborted.
+        latex =  '\\section*{'+title+'}\n'
+        latex += "\\begin{longtable}{p{8cm}p{8cm}}\n"
+        for authorid in sorted(self.authors.keys()):
+            author = self.authors[authorid]
+            # get only authors of a document!
+            for docid in self.__get_author_index().get_documents( author.get_authorid() ):
+                latex += author.get_lastname()+" "+author.get_firstname() + " & "
+                latex += author.get_email() + " \\\\ \n"
+
+            if self._want_abort:
+                return None
+
+        latex += "\\end{longtable}\n"
+        return latex
+
+    # End __get_list_latex
+    # -----------------------------------------------------------------------
+
+
+    def __get_program_latex(self, title):
+        # Return the LaTeX content of the program, or None if aborted.
+        # Necessarily the program is organized by dates!
+        schedule = self._get_schedule(sortbytype=False)
+
+        latex =  "\\thispagestyle{empty}\n"
+        latex += "\\pagestyle{empty}\n"
+        latex += '\\section*{'+title+'}\n'
+
+        for datesession in schedule.sorteddates:
+            if len(schedule.sorteddates)>1:
+                latex +=  "\\subsection*{ \\color{color2}{"+datesession.strftime('%A, %B %d %Y')+" } }\n"
+            latex += "\\begin{longtable}{p{35mm}p{125mm}}\n"
+
+            for session in schedule.get_sessions(datesession):
+                #latex += "\\hline \n"
+                latex += " & \\\\ \n"
+                # Add the hours info
+                latex += "{\\bf " + session.get_h_deb()+" - "+session.get_h_fin()+"} & "
+                # Add the Session Name
+                latex += "\\color{color3}{{\\bf " + session.get_session_name() +"}} \\\\ \n"
+                latex += " & \\\\ \n"
+    
+                # Add the list of documents
+                #if "PS" in session.get_session_name(): ######AMLAP: do not include posters in TOC
+                #    continue
+                for docid in schedule.get_documents(session):
+                    doc = self.documents[docid]
+                    latex +=" & "
+                    # first line : sessionid, title, then page number
+                    latex += "$ \\color{color1}{"+ self.__get_sessionid_and_rank(doc.get_docid()) + "} $ "
+                    latex += "{\\bf  "+ doc.get_title() + "} \\\\ \n"
+                    # second line : complete list of authors
+                    latex +=" & {\it "
+                    for author in doc.get_authors():
+                        latex += author.get_firstname()+" "+author.get_lastname()+", "
+                    latex = latex[:-2] + "} \\\\ \n"
+                #latex += " & \\\\ \n"
+
+                if self._want_abort:
+                    return None
+
+            latex +=  "\\end{longtable}\n"
+        latex = latex.replace('_', '\_')
+        return latex
+
+    # End __get_program_latex
+    # -----------------------------------------------------------------------
+
+
+    def __get_short_program_latex(self, title):
+        # Return the LaTeX content of the program overview, or None if aborted.
+        # Necessarily the program is organized by dates!
+        schedule = self._get_schedule(sortbytype=False)
+
+        latex =  "\\thispagestyle{empty}\n"
+        latex += "\\pagestyle{empty}\n"
+        latex += '\\section*{'+title+'}\n'
+    
+        for datesession in schedule.sorteddates:
+            
+            if len(schedule.sorteddates)>1:
+                latex +=  "\\subsection*{ \\color{color2}{"+datesession.strftime('%A, %B %d %Y')+"} }\n"
+            latex += "\\begin{longtable}{|p{4cm}p{10cm}p{2cm}|}\n"
+            latex += "\\hline \n"
+    
+            for session in schedule.get_sessions(datesession):
+                latex += " & & \\\\ \n"
+                # Add the hours info
+                latex += session.get_h_deb()+" - "+session.get_h_fin()+" & "
+                # Add the sessionID only for sessions with documents
+                withdoc = len(schedule.get_documents(session)) > 0
+
+                if withdoc is True:
+                    latex += "\\color{color1}{" + session.get_sessionid()+"} "
+
+                # Add the Session Name
+                latex += "\\color{color3}{ " + session.get_session_name() + "} & "
+                if session.get_location() is not None:
+                    latex += session.get_location()
+                latex += " \\\\ \n"
+                latex += " & & \\\\ \n"
+
+                if self._want_abort:
+                    return None
+
+            latex += "\\hline \n"
+            latex +=  "\\end{longtable}\n"
+            latex +=  "\\pagebreak\n"
+
+        latex = latex.replace('_', '\_')
+        return latex
+
+    # End __get_short_program_latex
+    # -----------------------------------------------------------------------
+
+
+    def __get_page_text(self, docid):
+        # Return the page number of a document, as a LaTeX text: in a book,
+        # the page is a reference to the label of the document.
+        if self._book is True:
+            return "\\pageref{"+self.__get_label(docid)+"}"
+        return str( self.documents[docid].get_page() )
+
+    # End __get_page_text
+    # -----------------------------------------------------------------------
+
+
+    def __get_label(self, docid):
+        # Return the LaTeX label of the first page of a document in a book
+        # (without any character to be escaped in the table of contents).
+        return "doc%d" % self.sorteddocs.index(docid)
+
+    # End __get_label
+    # -----------------------------------------------------------------------
+
+
+    def __get_catalog(self):
+        # Return the catalog of PDF files, stored in the data directory.
+        # It is always stored (entries are checked with the size and the
+        # modification time of the files): PDF files are read only once.
+        # The catalog of a shard also records its tagged files for the
+        # merge.
+        catalogname = os.path.join(self.path, CACHE_DIRNAME, "catalog")
+        if self._shard is not None:
+            # shards are saved at the same time, by other machines
+            catalogname += "-%d-%d" % (self._shard[0]+1, self._shard[1])
+        return PdfCatalog( catalogname )
+
+    # End __get_catalog
+    # -----------------------------------------------------------------------
+
+
+    def __check_shards(self):
+        # Check that the tagged file of each submission was created by a
+        # shard, with the first page of the current plan: raise IOError
+        # for a missing, stale or modified tagged file.
+        dirname = os.path.join(self.path, CACHE_DIRNAME)
+        catalogs = list()
+        if os.path.isdir(dirname):
+            for name in sorted(os.listdir(dirname)):
+                if re.match(r"^catalog-\d+-\d+$", name):
+                    catalogs.append( PdfCatalog(os.path.join(dirname, name)) )
+        if not len(catalogs):
+            raise IOError('No shard was tagged.')
+
+        for docid in self.sorteddocs:
+            inputname = os.path.join(self.path, docid + ".pdf")
+            outputname = os.path.join(self.path, docid + "-tag.pdf")
+            if not os.path.exists(outputname):
+                raise IOError('Submission %s was not tagged by its shard.' % docid)
+            expected = (os.path.basename(outputname), self._pagination.get_first_page(docid), self._catalog.get_hash(outputname))
+            if not any( (catalog.get_entry(inputname) or {}).get("tagged") == expected for catalog in catalogs ):
+                raise IOError('Submission %s was not tagged by a shard of the current plan (page %d).' % (docid, expected[1]))
+
+    # End __check_shards
+    # -----------------------------------------------------------------------
+
+
+    def __get_shard_documents(self):
+        # Return the documents of the shard to tag (see set_shard).
+        index, count = self._shard
+        pagination = self.plan_pages()
+        return pagination.split( self.sorteddocs, count )[index]
+
+    # End __get_shard_documents
+    # -----------------------------------------------------------------------
+
+
+    def __get_stage(self, message, function, *args):
+        # Return a stage of run: log the message then call the function.
+        def stage():
+            logging.info( message )
+            function( *args )
+        return stage
+
+    # End __get_stage
+    # -----------------------------------------------------------------------
+
+
     def __initials(self, name):
         """ Get upper characters of name, separated by a dot. """
         return ".".join([x for x in name if x.isupper()])
@@ -52,6 +52,8 @@ import csv
 import Manager.consts as consts
 
 import Manager.models.readers as readers
+from Manager.models.authorindex  import AuthorIndex
+from Manager.models.validate     import Validate
 from Manager.models.datasession  import Session
 from Manager.models.dataauthor   import Author
 from Manager.models.datadocument import Document
@@ -109,6 +111,8 @@ class NotebookPanel( wx.Panel ):
         self._dataPages = {}
         for p in consts.PAGESLIST:
             self._dataPages[p] = dict()
+        self._authorIndex = AuthorIndex()
+        self._validator   = Validate( self._dataPages['Documents'], self._dataPages['Authors'], self._dataPages['Sessions'] )
 
         # information
         self._isSaved = True
@@ -139,6 +143,26 @@ class NotebookPanel( wx.Panel ):
     # -----------------------------------------------------------------------
 
 
+    def GetAuthorIndex(self):
+        """
+        Return the index of the documents of each author.
+        It must be updated each time the authors of a document are changed.
+        """
+        return self._authorIndex
+
+    # -----------------------------------------------------------------------
+
+
+    def GetValidator(self):
+        """
+        Return the diagnostics of the data.
+        It must be updated each time a document or a session is changed.
+        """
+        return self._validator
+
+    # -----------------------------------------------------------------------
+
+
     # -----------------------------------------------------------------------
     # Callbacks of the notebook
     # -----------------------------------------------------------------------
@@ -263,7 +287,7 @@ class NotebookPanel( wx.Panel ):
             return
 
         logging.debug('Check')
-        dlg = CheckFrame(self, -1, "Data Verification...", self._dataPages['Documents'], self._dataPages['Authors'], self._dataPages['Sessions'], self._path)
+        dlg = CheckFrame(self, -1, "Data Verification...", self._dataPages['Documents'], self._dataPages['Authors'], self._dataPages['Sessions'], self._path, self._validator)
         dlg.ShowModal()
 
     # End OnCheck
@@ -332,6 +356,8 @@ class NotebookPanel( wx.Panel ):
                     doc = Document( eltid, authors=list() )
                     # update data
                     self._dataPages[self._selectedPage][doc.get_docid()] = doc
+                    self._authorIndex.add_document( doc )
+                    self._validator.update_document( doc.get_docid() )
                     # update wx.grid
                     self._pages[self._selectedPage].AddData([eltid])
                     self._isSaved = False
@@ -353,6 +379,7 @@ class NotebookPanel( wx.Panel ):
                         return
                     # update data
                     self._dataPages[self._selectedPage][doc.get_sessionid()] = doc
+                    self._validator.update_session( doc.get_sessionid() )
                     # update wx.grid
                     self._pages[self._selectedPage].AddData([eltid])
                     self._isSaved = False
@@ -402,24 +429,29 @@ class NotebookPanel( wx.Panel ):
 
             # removing an author only if there is no related document
             if self._selectedPage == "Authors":
-                for doc in self._dataPages['Documents'].values():
-                    for auth in doc.get_authors():
-                        if auth.get_authorid() == eltid:
-                            dlg = wx.MessageDialog(self, "This author can not be removed because there are documents associated.", "Error", wx.OK | wx.ICON_EXCLAMATION)
-                            retCode = dlg.ShowModal()
-                            logging.debug('   ---> '+auth.get_authorid()+" not removed.")
-                            return
+                if self._authorIndex.has_documents(eltid):
+                    dlg = wx.MessageDialog(self, "This author can not be removed because there are documents associated.", "Error", wx.OK | wx.ICON_EXCLAMATION)
+                    retCode = dlg.ShowModal()
+                    logging.debug('   ---> '+eltid+" not removed.")
+                    return
+            if self._selectedPage == "Documents":
+                self._authorIndex.remove_document(eltid)
             # removing a session implies to update documents' sessions
             if self._selectedPage == "Sessions":
                 for doc in self._dataPages['Documents'].values():
                     session = doc.get_session()
                     if isinstance(session,Session) and session.get_sessionid() == eltid:
                         doc.set_session(None)
+                        self._validator.update_document( doc.get_docid() )
                         logging.debug('   ---> session of document: '+str(doc.get_docid())+" removed.")
             # update grid
             self._pages[self._selectedPage].UnsetSelectedData()
             # delete the data
             del self._dataPages[self._selectedPage][eltid]
+            if self._selectedPage == "Documents":
+                self._validator.update_document(eltid)
+            if self._selectedPage == "Sessions":
+                self._validator.update_session(eltid)
             self._isSaved = False
             self.GetTopLevelParent().UnsetSelected()
             self.GetTopLevelParent().GetStatusBar().SetStatusText('An entry was deleted.')
@@ -456,76 +488,16 @@ class NotebookPanel( wx.Panel ):
 
     def useCSVFile(self, path):
 
-        DocDict     = dict()
-        SessionDict = dict()
-        AuthorDict  = dict()
-
-        ################# Lecture du fichier DOCUMENTS.csv ###################
-        logging.debug("Read the file: Documents.csv")
-        docreader = readers.documents_csv_reader( os.path.join(path,self.findCSV(path,"Documents")) )
-
-        for docid in docreader.get_all_ids():
-
-            authorslist = []
-            session     = ""
-            title       = ""
-            rank        = ""
-            page_number = ""
-
-            for row in docreader.get_ById(docid):
-
-                author = docreader.get_Author(row)
-                if author not in AuthorDict.keys():
-                    authorslist.append(author)
-
-                if session == "" and docreader.get_Session(row) != "":
-                    session = docreader.get_Session(row)
-                    if session not in SessionDict.keys():
-                        SessionDict[session.get_sessionid()] = session
-
-                if title == "" and docreader.get_DocTitle(row) != "":
-                    title = docreader.get_DocTitle(row)
-
-                if rank == "" and docreader.get_Rank(row) != "":
-                    rank = docreader.get_Rank(row)
-
-                if page_number == "" and docreader.get_NumPage(row) != "":
-                    page_number = docreader.get_NumPage(row)
-
-            doc = Document(docid, title, authorslist, session, rank, page_number)
-            DocDict[doc.get_docid()] = doc
+        logging.debug("Read the files: Documents.csv, Sessions.csv, Authors.csv")
+        DocDict, SessionDict, AuthorDict = readers.read_csv_files( os.path.join(path,self.findCSV(path,"Documents")),
+                                                                   os.path.join(path,self.findCSV(path,"Sessions")),
+                                                                   os.path.join(path,self.findCSV(path,"Authors")) )
 
         self._dataPages['Documents'] = DocDict
-
-
-        #################### Lecture du fichier SESSIONS.csv #################
-        logging.debug("Read the file: Sessions.csv")
-
-        sessionreader = readers.sessions_csv_reader( os.path.join(path,self.findCSV(path,"Sessions") ))
-
-        for sessionid in sessionreader.get_AllId():
-            session_row = sessionreader.get_ById(sessionid)[0]
-            session     = Session(sessionid, sessionreader.get_SessionName(session_row), sessionreader.get_Rank(session_row), sessionreader.get_Date(session_row), sessionreader.get_Heure_Deb(session_row), sessionreader.get_Heure_Fin(session_row), sessionreader.get_Chairman(session_row), sessionreader.get_Location(session_row))
-            SessionDict[sessionid] = session
-
-        self._dataPages['Sessions'] = SessionDict
-
-
-        ################## Lecture du fichier AUTHORS.csv ####################
-        logging.debug("Read the file: Authors.csv")
-
-        author_reader = readers.authors_csv_reader( os.path.join(path,self.findCSV(path,"Authors")) )
-
-        for lastname, firstname in author_reader.get_all_names():
-            rowList = author_reader.get_ByNames(lastname, firstname)
-            a_row = rowList.pop()
-            auth = Author(lastname,firstname, author_reader.get_email(a_row), author_reader.get_Affiliation(a_row))
-            for row in rowList: ### all the authors which have the same name !!
-                Other_auth = Author(lastname,firstname, author_reader.get_email(row), author_reader.get_Affiliation(row))
-                auth.compare_and_update(Other_auth)## we use this function because there could be the same other twice in the AUTHORS.csv file, so we merge the information
-            AuthorDict[auth.get_authorid()] = auth
-
-        self._dataPages['Authors'] = AuthorDict
+        self._dataPages['Sessions']  = SessionDict
+        self._dataPages['Authors']   = AuthorDict
+        self._authorIndex = AuthorIndex( DocDict )
+        self._validator   = Validate( DocDict, AuthorDict, SessionDict )
         logging.debug(" [ OK ] ")
 
 
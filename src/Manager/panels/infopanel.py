@@ -215,11 +215,9 @@ class InformationPanel( wx.Panel ):
         self.__addTextInfo("Affiliation: \t", affiliation)
 
         ############ DOCUMENTS ############
-        # TODO: trouver une façon PROPRE d'obtenir la liste des docs...
         docs = ""
-        for d in self.GetTopLevelParent().nbp._dataPages['Documents'].values():
-            if AuthorObject in d.get_authors():
-                docs = docs + d.get_docid() + ", "
+        for docid in self.GetTopLevelParent().nbp.GetAuthorIndex().get_documents( AuthorObject.get_authorid() ):
+            docs = docs + docid + ", "
         self.__addTextInfo("Documents ID: \t", docs)
 
         self.Layout()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+import os
+import pickle
+import logging
+import threading
+
+import utils
+
+# ---------------------------------------------------------------------------
+
+class PdfCatalog:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Persistent catalog of the metadata of PDF files.
+
+    For each PDF file, the catalog stores what was already read from it:
+    its hash, its number of pages, its paper format, the result of the
+    preflight, its last tagged output... An entry is valid while the size
+    and the modification time of the file are unchanged: the file is then
+    not read again, even by another run of the application.
+
+    """
+
+    def __init__(self, filename=None):
+        """
+        Creates a new PdfCatalog instance, from a file (if existing).
+
+        @param filename (string) File of the catalog (None: not saved).
+
+        """
+        self._filename = filename
+        self._entries = {}
+        self._modified = False
+        self._lock = threading.Lock()
+        if filename is not None:
+            try:
+                with open(filename, "rb") as f:
+                    self._entries = pickle.load(f)
+            except Exception:
+                self._entries = {}
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def get_entry(self, filename):
+        """
+        Return a copy of the entry of a file (a dict, empty if the file is
+        not in the catalog or if it has changed), or None if the file does
+        not exist.
+
+        @param filename (string) Name of the PDF file.
+
+        """
+        key = self.__file_key( filename )
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get( os.path.abspath(filename) )
+            if entry is None or entry["key"] != key:
+                return {}
+            return dict( (k,v) for k,v in entry.items() if k != "key" )
+
+    # End get_entry
+    # -------------------------------------------------------------------------
+
+
+    def set_values(self, filename, values):
+        """
+        Add values to the entry of a file.
+
+        @param filename (string) Name of the PDF file.
+        @param values (dict) Values to store.
+
+        """
+        key = self.__file_key( filename )
+        if key is None:
+            return
+        name = os.path.abspath(filename)
+        with self._lock:
+            entry = self._entries.get( name )
+            if entry is None or entry["key"] != key:
+                entry = { "key":key }
+                self._entries[name] = entry
+            entry.update( values )
+            self._modified = True
+
+    # End set_values
+    # -------------------------------------------------------------------------
+
+
+    def get_hash(self, filename):
+        """
+        Return the SHA-1 hash of the content of a file (see utils.hash_file).
+
+        @param filename (string) Name of the PDF file.
+
+        """
+        return self.__get_value( filename, "hash", utils.hash_file )
+
+    # End get_hash
+    # -------------------------------------------------------------------------
+
+
+    def get_pages(self, filename, tool="auto"):
+        """
+        Return the number of pages of a file (see utils.countPages).
+
+        @param filename (string) Name of the PDF file.
+        @param tool (string) External tool to use if the file can't be read.
+
+        """
+        return self.__get_value( filename, "pages", lambda f: utils.countPages(f, tool) )
+
+    # End get_pages
+    # -------------------------------------------------------------------------
+
+
+    def get_paper(self, filename):
+        """
+        Return the paper format of a file (see utils.formatPages), or None.
+
+        @param filename (string) Name of the PDF file.
+
+        """
+        return self.__get_value( filename, "paper", self.__format_pages )
+
+    # End get_paper
+    # -------------------------------------------------------------------------
+
+
+    def save(self):
+        """
+        Save the catalog, if it was modified.
+
+        The catalog is only an optimization: errors are ignored.
+
+        """
+        if self._filename is None or self._modified is False:
+            return
+        try:
+            dirname = os.path.dirname(self._filename)
+            if len(dirname) > 0 and not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            with self._lock:
+                with open(self._filename, "wb") as f:
+                    pickle.dump(self._entries, f, pickle.HIGHEST_PROTOCOL)
+                self._modified = False
+        except Exception, e:
+            logging.info('PDF catalog not saved: %s'%str(e))
+
+    # End save
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __file_key(self, filename):
+        # The size and the modification time of a file, or None.
+        try:
+            st = os.stat( filename )
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime)
+
+
+    def __get_value(self, filename, name, function):
+        # Return a value of the entry of a file, or get it with a function.
+        entry = self.get_entry( filename )
+        if entry is not None and name in entry:
+            return entry[name]
+        value = function( filename )
+        self.set_values( filename, { name:value } )
+        return value
+
+
+    def __format_pages(self, filename):
+        # formatPages returns IOError if there is no media box.
+        fsize = utils.formatPages( filename )
+        if fsize is IOError:
+            return None
+        return fsize
+
+# ---------------------------------------------------------------------------
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+# Widths of the characters of the standard PDF fonts (from the Adobe
+# Font Metrics files), in thousandths of the font size.
+# Characters are the ones of WinAnsiEncoding (Windows code page 1252),
+# from code 32 (space) to code 255; undefined codes have a null width.
+# ---------------------------------------------------------------------------
+
+FIRST_CHAR = 32
+
+WIDTHS = {}
+
+WIDTHS["Times-Roman"] = (
+    250,333,408,500,500,833,778,180,333,333,500,564,250,333,250,278,
+    500,500,500,500,500,500,500,500,500,500,278,278,564,564,564,444,
+    921,722,667,667,722,611,556,722,722,333,389,722,611,889,722,722,
+    556,722,667,556,611,722,722,944,722,722,611,333,278,333,469,500,
+    333,444,500,444,500,444,333,500,500,278,278,500,278,778,500,500,
+    500,500,333,389,278,500,500,722,500,500,444,480,200,480,541,0,
+    500,0,333,500,444,1000,500,500,333,1000,556,333,889,0,611,0,
+    0,333,333,444,444,350,500,1000,333,980,389,333,722,0,444,722,
+    250,333,500,500,500,500,200,500,333,760,276,500,564,333,760,333,
+    400,564,300,300,333,500,453,250,333,300,310,500,750,750,750,444,
+    722,722,722,722,722,722,889,667,611,611,611,611,333,333,333,333,
+    722,722,722,722,722,722,722,564,722,722,722,722,722,722,556,500,
+    444,444,444,444,444,444,667,444,444,444,444,444,278,278,278,278,
+    500,500,500,500,500,500,500,564,500,500,500,500,500,500,500,500,
+)
+
+WIDTHS["Times-Bold"] = (
+    250,333,555,500,500,1000,833,278,333,333,500,570,250,333,250,278,
+    500,500,500,500,500,500,500,500,500,500,333,333,570,570,570,500,
+    930,722,667,722,722,667,611,778,778,389,500,778,667,944,722,778,
+    611,778,722,556,667,722,722,1000,722,722,667,333,278,333,581,500,
+    333,500,556,444,556,444,333,500,556,278,333,556,278,833,556,500,
+    556,556,444,389,333,556,500,722,500,500,444,394,220,394,520,0,
+    500,0,333,500,500,1000,500,500,333,1000,556,333,1000,0,667,0,
+    0,333,333,500,500,350,500,1000,333,1000,389,333,722,0,444,722,
+    250,333,500,500,500,500,220,500,333,747,300,500,570,333,747,333,
+    400,570,300,300,333,556,540,250,333,300,330,500,750,750,750,500,
+    722,722,722,722,722,722,1000,722,667,667,667,667,389,389,389,389,
+    722,722,778,778,778,778,778,570,778,722,722,722,722,722,611,556,
+    500,500,500,500,500,500,722,444,444,444,444,444,278,278,278,278,
+    500,556,500,500,500,500,500,570,500,556,556,556,556,500,556,500,
+)
+
+WIDTHS["Times-Italic"] = (
+    250,333,420,500,500,833,778,214,333,333,500,675,250,333,250,278,
+    500,500,500,500,500,500,500,500,500,500,333,333,675,675,675,500,
+    920,611,611,667,722,611,611,722,722,333,444,667,556,833,667,722,
+    611,722,611,500,556,722,611,833,611,556,556,389,278,389,422,500,
+    333,500,500,444,500,444,278,500,500,278,278,444,278,722,500,500,
+    500,500,389,389,278,500,444,667,444,444,389,400,275,400,541,0,
+    500,0,333,500,556,889,500,500,333,1000,500,333,944,0,556,0,
+    0,333,333,556,556,350,500,889,333,980,389,333,667,0,389,556,
+    250,389,500,500,500,500,275,500,333,760,276,500,675,333,760,333,
+    400,675,300,300,333,500,523,250,333,300,310,500,750,750,750,500,
+    611,611,611,611,611,611,889,667,611,611,611,611,333,333,333,333,
+    722,667,722,722,722,722,722,675,722,722,722,722,722,556,611,500,
+    500,500,500,500,500,500,667,444,444,444,444,444,278,278,278,278,
+    500,500,500,500,500,500,500,675,500,500,500,500,500,444,500,444,
+)
+
+WIDTHS["Helvetica"] = (
+    278,278,355,556,556,889,667,191,333,333,389,584,278,333,278,278,
+    556,556,556,556,556,556,556,556,556,556,278,278,584,584,584,556,
+    1015,667,667,722,722,667,611,778,722,278,500,667,556,833,722,778,
+    667,778,722,667,611,722,667,944,667,667,611,278,278,278,469,556,
+    333,556,556,500,556,556,278,556,556,222,222,500,222,833,556,556,
+    556,556,333,500,278,556,500,722,500,500,500,334,260,334,584,0,
+    556,0,222,556,333,1000,556,556,333,1000,667,333,1000,0,611,0,
+    0,222,222,333,333,350,556,1000,333,1000,500,333,944,0,500,667,
+    278,333,556,556,556,556,260,556,333,737,370,556,584,333,737,333,
+    400,584,333,333,333,556,537,278,333,333,365,556,834,834,834,611,
+    667,667,667,667,667,667,1000,722,667,667,667,667,278,278,278,278,
+    722,722,778,778,778,778,778,584,778,722,722,722,722,667,667,611,
+    556,556,556,556,556,556,889,500,556,556,556,556,278,278,278,278,
+    556,556,556,556,556,556,556,584,611,556,556,556,556,500,556,500,
+)
+
+# All characters of Courier have the same width
+WIDTHS["Courier"] = (600,)*(256-FIRST_CHAR)
+
+# ---------------------------------------------------------------------------
+
+
+def get_text_width(fontname, text, size):
+    """
+    Return the width of a text, in PDF units.
+
+    @param fontname (string) One of the standard fonts of WIDTHS
+    @param text (string) cp1252 encoded text
+    @param size (float) font size
+
+    """
+    widths = WIDTHS[fontname]
+    total = 0
+    for c in text:
+        code = ord(c)
+        if code >= FIRST_CHAR:
+            total += widths[code-FIRST_CHAR]
+    return total * size / 1000.
+
+# ---------------------------------------------------------------------------
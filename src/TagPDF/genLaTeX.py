@@ -40,6 +40,8 @@ __docformat__ = "epytext"
 
 # ---------------------------------------------------------------------------
 
+import os
+import re
 import sys
 import codecs
 import getopt
@@ -47,6 +49,16 @@ import logging
 
 # ---------------------------------------------------------------------------
 
+# Texts requiring the tipa package: its commands, and IPA characters
+# (declared by tipa for inputenc).
+RXTIPA = re.compile(u"\\\\(textipa|tipa)|[\u0250-\u02af]", re.UNICODE)
+
+# Header and footer options
+HEADERS = ["leftheader", "centerheader", "rightheader"]
+FOOTERS = ["leftfooter", "centerfooter", "rightfooter"]
+
+# ---------------------------------------------------------------------------
+
 class GenLaTeXFile:
     """
     @authors: Brigitte Bigi
@@ -91,6 +103,7 @@ class GenLaTeXFile:
         self.__options["footerstyle"]  = ""
         self.__options["pagenumber"]   = "1"
         self.__options["numberofpages"] = 1
+        self.__options["directpdf"]    = False # empty pages without LaTeX (see GenPdfFile)
         # For TALN:
         #self.__options["color1"] = "30,120,200" # cyan (= light blue)
         #self.__options["color2"] = "0,60,150"   # blue
@@ -103,6 +116,12 @@ class GenLaTeXFile:
         # A possible text to add into the file
         self.__content = None
 
+        # A possible list of overlays to put into the file
+        self.__overlays = None
+
+        # A possible list of parts (texts and PDF files) of a book
+        self.__parts = None
+
     # End __init__
     # ------------------------------------------------------------------------
 
@@ -374,6 +393,46 @@ class GenLaTeXFile:
     # ------------------------------------------------------------------------
 
 
+    def set_overlays(self, overlays):
+        """
+        Fix a list of overlays to put into the file.
+
+        @param overlays (list): each overlay is a dictionary of options
+        (at least "pagenumber" and "numberofpages", and any header/footer
+        option) which override the current options for this overlay.
+
+        THE CONTENT AND THE OPTIONS "PAGE NUMBER" AND "NUMBER OF PAGES" WILL
+        BE IGNORED.
+
+        """
+        self.__overlays = overlays
+
+    # End set_overlays
+    # ------------------------------------------------------------------------
+
+
+    def set_parts(self, parts):
+        """
+        Fix a list of parts to put one after the other into the file, as
+        a book: the pages are numbered by LaTeX.
+
+        @param parts (list): each part is a dictionary of options which
+        override the current options for this part (header/footer...), and:
+            - "content": a LaTeX text, or
+            - "pdffile": a PDF file to include with pdfpages, its number of
+              pages in "numberofpages", and a "label" on its first page;
+            - "recto": True to start the part on a recto (odd) page;
+            - "pagenumber": to fix the number of the first page of the part.
+
+        THE CONTENT AND THE OVERLAYS WILL BE IGNORED.
+
+        """
+        self.__parts = parts
+
+    # End set_parts
+    # ------------------------------------------------------------------------
+
+
     def set_header_rule(self, boolean):
         """
         Activate/Disable the header rule.
@@ -448,6 +507,36 @@ class GenLaTeXFile:
     # ------------------------------------------------------------------------
 
 
+    def get_tex_content(self):
+        """
+        Return the LaTeX text added into the file, or None for empty pages.
+        """
+        return self.__content
+
+    # End get_tex_content
+    # ------------------------------------------------------------------------
+
+
+    def get_overlays(self):
+        """
+        Return the list of overlays fixed by set_overlays, or None.
+        """
+        return self.__overlays
+
+    # End get_overlays
+    # ------------------------------------------------------------------------
+
+
+    def get_parts(self):
+        """
+        Return the list of parts fixed by set_parts, or None.
+        """
+        return self.__parts
+
+    # End get_parts
+    # ------------------------------------------------------------------------
+
+
     def get_option(self, optionname):
         """
         Return any option from its name.
@@ -466,11 +555,13 @@ class GenLaTeXFile:
     # ------------------------------------------------------------------------
 
 
-    def exportLaTeX(self,filename):
+    def exportLaTeX(self,filename,preamble=True):
         """
         Save the LaTeX file.
 
         @param filename (string): the output file pointer
+        @param preamble (bool): False to not load the packages, when the
+        file is compiled with a format of get_preamble().
 
         """
         if filename is not None:
@@ -479,44 +570,210 @@ class GenLaTeXFile:
         else:
             fp = sys.stdout
 
-        self.save(fp)
+        self.save(fp, preamble)
         fp.close()
 
     # End export_LaTeX
     # -------------------------------------------------------------------------
 
 
-    def save(self,fp):
+    def save(self,fp,preamble=True):
         """
         Save the LaTeX file.
 
         @param fp (filepointer): the output file
+        @param preamble (bool): False to not load the packages
+
+        """
+        if self.__parts is not None:
+            self.save_parts(fp, preamble)
+            return
+        if self.__overlays is not None:
+            self.save_overlays(fp, preamble)
+            return
+
+        self.__save_preamble(fp, preamble)
+
+        fp.write( " \\begin{document} \n" )
+        fp.write( " \\setcounter{page}{"+str(self.__options["pagenumber"])+"} \n")
+        fp.write( "    \\pagestyle{fancy} \n" )
+
+        self.__save_header_footer(fp, self.__options)
+
+        # Create pages!
+        if self.__content is None:
+            # Create as many empty pages as it is fixed by "numberofpages"
+            fp.write( "    \\  \\cleardoublepage\n"*self.__options["numberofpages"] )
+        else:
+            # Simply put the LaTeX content.
+            fp.write( self.__content )
+        fp.write( " \n" )
+        fp.write( " \end{document} \n" )
+
+    # End save
+    # -------------------------------------------------------------------------
+
+
+    def save_overlays(self,fp,preamble=True):
+        """
+        Save the LaTeX file of all overlays fixed by set_overlays.
+
+        Each overlay is a set of empty pages, with its own first page
+        number and its own header/footer: the document contains all pages
+        of the first overlay, then all pages of the second one, etc.
+
+        @param fp (filepointer): the output file
+        @param preamble (bool): False to not load the packages
+
+        """
+        self.__save_preamble(fp, preamble)
+
+        fp.write( " \\begin{document} \n" )
+        fp.write( "    \\pagestyle{fancy} \n" )
+
+        for overlay in self.__overlays:
+            options = dict(self.__options)
+            options.update(overlay)
+
+            fp.write( " \\fancyhead{} \n")
+            fp.write( " \\fancyfoot{} \n")
+            fp.write( " \\setcounter{page}{"+str(options["pagenumber"])+"} \n")
+            self.__save_header_footer(fp, options)
+            fp.write( "    \\  \\cleardoublepage\n"*int(options["numberofpages"]) )
+
+        fp.write( " \n" )
+        fp.write( " \end{document} \n" )
+
+    # End save_overlays
+    # -------------------------------------------------------------------------
+
+
+    def save_parts(self,fp,preamble=True):
+        """
+        Save the LaTeX file of all parts fixed by set_parts.
+
+        Each part starts on a new page, with its own header/footer. A PDF
+        file is included with pdfpages: its first page can be referenced
+        by its label (with \pageref), which requires two compilations.
+
+        @param fp (filepointer): the output file
+        @param preamble (bool): False to not load the packages
+
+        """
+        self.__save_preamble(fp, preamble)
+
+        fp.write( " \\begin{document} \n" )
+
+        for part in self.__parts:
+            options = dict(self.__options)
+            options.update(part)
+
+            fp.write( " \\clearpage \n")
+            if part.get("recto", False) is True:
+                fp.write( " \\ifodd\\value{page}\\else \\thispagestyle{empty} \\ \\newpage\\fi \n")
+            if "pagenumber" in part:
+                fp.write( " \\setcounter{page}{"+str(part["pagenumber"])+"} \n")
+            fp.write( " \\fancyhead{} \n")
+            fp.write( " \\fancyfoot{} \n")
+            fp.write( "    \\pagestyle{fancy} \n" )
+            self.__save_header_footer(fp, options)
+
+            if "pdffile" in part:
+                pdffile = self.__get_filename( part["pdffile"] )
+                pages = [ ("-", "") ]
+                if "label" in part:
+                    pages = [ ("1", "\\label{"+part["label"]+"}") ]
+                    if int(options["numberofpages"]) > 1:
+                        pages.append( ("2-", "") )
+                for p, command in pages:
+                    fp.write( " \\includepdf[pages="+p+",pagecommand={\\thispagestyle{fancy}"+command+"}]{"+pdffile+"} \n")
+            else:
+                fp.write( part.get("content", "") )
+                fp.write( " \n" )
+
+        fp.write( " \n" )
+        fp.write( " \end{document} \n" )
+
+    # End save_parts
+    # -------------------------------------------------------------------------
+
+
+    def __get_filename(self, filename):
+        """
+        Return a file name to be read by LaTeX: special characters (spaces,
+        underscores...) are not interpreted.
+
+        @param filename (string): the file name
+        @raise ValueError if the file name can't be read by LaTeX.
+
+        """
+        for c in "%{}#\\":
+            if c in filename.replace(os.sep, "/"):
+                raise ValueError("File name not supported by LaTeX: %s" % filename)
+        return "\\detokenize{" + filename.replace(os.sep, "/") + "}"
+
+    # End __get_filename
+    # -------------------------------------------------------------------------
+
+
+    def get_preamble(self):
+        """
+        Return the beginning of the preamble: the document class and the
+        packages. It depends only on the paper, the margins and the packages
+        used by the texts, so that it can be precompiled in a LaTeX format
+        (see FormatCache).
+
+        """
+        used = self.__get_used()
+
+        preamble  = " \\documentclass[12pt," + self.__options["paper"] + "]{article} \n\n"
+        preamble += " \\usepackage[utf8]{inputenc}\n"
+        preamble += " \\usepackage[T1]{fontenc} %% get hyphenation and accented letters right\n"
+        if "tipa" in used:
+            preamble += " \\usepackage{tipa} \n"
+        if "xcolor" in used:
+            preamble += " \\usepackage{xcolor} \n"
+        if "longtable" in used:
+            preamble += " \\usepackage{longtable} \n"
+        if "pdfpages" in used:
+            preamble += " \\usepackage{pdfpages} \n"
+        preamble += " \\usepackage{fancyhdr} \n"
+        preamble += " \\usepackage[left=20mm,right=20mm,top="+str(self.__options['topmargin'])+"mm,bottom="+str(self.__options['bottommargin'])+"mm,head="+str(self.__options['headsize'])+"pt,foot="+str(self.__options['footsize'])+"pt]{geometry} \n"
+        return preamble
+
+    # End get_preamble
+    # -------------------------------------------------------------------------
+
+
+    def __save_preamble(self,fp,preamble=True):
+        """
+        Save the LaTeX preamble (everything before begin document).
+
+        @param fp (filepointer): the output file
+        @param preamble (bool): False to not load the packages (the file is
+        compiled with a format which already contains them)
 
         """
         fp.write( " % This file was automatically generated by Proceed. \n" )
         fp.write( " % A program written by Brigitte Bigi \n" )
         fp.write( " % License: GPL.\n\n" )
-        fp.write( " \\documentclass[12pt," )
-        fp.write( self.__options["paper"] )
-        fp.write( "]{article} \n\n")
-        fp.write( " \\usepackage[utf8]{inputenc}\n")
-        fp.write( " \\usepackage[T1]{fontenc} %% get hyphenation and accented letters right\n")
-        fp.write( " \\usepackage{tipa} \n" )
-        fp.write( " \\usepackage{xcolor} \n" )
-        fp.write( " \\usepackage{longtable} \n" )
-        fp.write( " \\usepackage{fancyhdr} \n" )
-        fp.write( " \\usepackage[left=20mm,right=20mm,top="+str(self.__options['topmargin'])+"mm,bottom="+str(self.__options['bottommargin'])+"mm,head="+str(self.__options['headsize'])+"pt,foot="+str(self.__options['footsize'])+"pt]{geometry} \n")
+        if preamble is True:
+            fp.write( self.get_preamble() )
         fp.write( " \\fancyhead{} \n")
         fp.write( " \\fancyfoot{} \n")
 
+        used = self.__get_used()
+
         # Fix Header and Footer color
-        fp.write( " \\definecolor{HeaderColor}{RGB}{"+self.__options["headercolor"]+"} \n")
-        fp.write( " \\definecolor{FooterColor}{RGB}{"+self.__options["footercolor"]+"} \n")
+        if "HeaderColor" in used:
+            fp.write( " \\definecolor{HeaderColor}{RGB}{"+self.__options["headercolor"]+"} \n")
+        if "FooterColor" in used:
+            fp.write( " \\definecolor{FooterColor}{RGB}{"+self.__options["footercolor"]+"} \n")
 
         # Define 3 other colors to be used as needed in the content
-        fp.write( " \\definecolor{color1}{RGB}{"+self.__options["color1"]+"} \n")
-        fp.write( " \\definecolor{color2}{RGB}{"+self.__options["color2"]+"} \n")
-        fp.write( " \\definecolor{color3}{RGB}{"+self.__options["color3"]+"} \n")
+        for color in ["color1", "color2", "color3"]:
+            if color in used:
+                fp.write( " \\definecolor{"+color+"}{RGB}{"+self.__options[color]+"} \n")
 
         # Fix the Header Rule (YES/NO)
         if self.__options["headerrule"] == True:
@@ -530,37 +787,88 @@ class GenLaTeXFile:
         else:
             fp.write(" \\renewcommand{\\footrulewidth}{0pt} \n")
 
-        fp.write( " \\begin{document} \n" )
-        fp.write( " \\setcounter{page}{"+str(self.__options["pagenumber"])+"} \n")
-        fp.write( "    \\pagestyle{fancy} \n" )
+    # End __save_preamble
+    # -------------------------------------------------------------------------
 
-        # Then, fix Header (Left,Center,Right)
-        if len(self.__options["leftheader"])>0:
-            fp.write( "    \\lhead{\\color{HeaderColor}{"+self.__options["headerstyle"]+"{\small "+self.__options["leftheader"]+"}}}\n")
-        if len(self.__options["centerheader"])>0:
-            fp.write( "    \\chead{\\color{HeaderColor}{"+self.__options["headerstyle"]+"{\small "+self.__options["centerheader"]+"}}}\n")
-        if len(self.__options["rightheader"])>0:
-            fp.write( "    \\rhead{\\color{HeaderColor}{"+self.__options["headerstyle"]+"{\small "+self.__options["rightheader"]+"}}}\n")
 
-        # Then, fix Footer (Left,Center,Right)
-        if len(self.__options["leftfooter"])>0:
-            fp.write( "    \\lfoot{\\color{FooterColor}{"+self.__options["footerstyle"]+"{"+self.__options["leftfooter"]+"}}}\n")
-        if len(self.__options["centerfooter"])>0:
-            fp.write( "    \\cfoot{\\color{FooterColor}{"+self.__options["footerstyle"]+"{"+self.__options["centerfooter"]+"}}}\n")
-        if len(self.__options["rightfooter"])>0:
-            fp.write( "    \\rfoot{\\color{FooterColor}{"+self.__options["footerstyle"]+"{"+self.__options["rightfooter"]+"}}}\n")
+    def __get_used(self):
+        """
+        Return the set of packages and colors used by the texts of the
+        file: the content, and the headers/footers of all pages.
 
-        # Create pages!
-        if self.__content is None:
-            # Create as many empty pages as it is fixed by "numberofpages"
-            fp.write( "    \\  \\cleardoublepage\n"*self.__options["numberofpages"] )
+        """
+        optionslist = [ self.__options ]
+        texts = []
+        used = set()
+        if self.__parts is not None:
+            optionslist = []
+            for part in self.__parts:
+                options = dict(self.__options)
+                options.update(part)
+                optionslist.append( options )
+                if "pdffile" in part:
+                    used.add( "pdfpages" )
+                elif "content" in part:
+                    texts.append( part["content"] )
         else:
-            # Simply put the LaTeX content.
-            fp.write( self.__content )
-        fp.write( " \n" )
-        fp.write( " \end{document} \n" )
+            if self.__overlays is not None:
+                optionslist = []
+                for overlay in self.__overlays:
+                    options = dict(self.__options)
+                    options.update(overlay)
+                    optionslist.append( options )
+            if self.__content is not None:
+                texts.append( self.__content )
+        for options in optionslist:
+            for names, color in [ (HEADERS, "HeaderColor"), (FOOTERS, "FooterColor") ]:
+                for name in names:
+                    if len(options[name]) > 0:
+                        texts.append( options[name] )
+                        used.add( color )
+
+        text = u" ".join( t.decode('utf-8') if isinstance(t, str) else t for t in texts )
+        if RXTIPA.search( text ) is not None:
+            used.add( "tipa" )
+        if "{longtable}" in text:
+            used.add( "longtable" )
+        for color in ["color1", "color2", "color3"]:
+            if "{"+color+"}" in text:
+                used.add( color )
+        colors = used - set(["tipa", "longtable", "pdfpages"])
+        if len(colors) > 0 or "\\color" in text or "\\textcolor" in text:
+            used.add( "xcolor" )
+
+        return used
+
+    # End __get_used
+    # -------------------------------------------------------------------------
 
-    # End save
+
+    def __save_header_footer(self,fp,options):
+        """
+        Save the header and footer definitions.
+
+        @param fp (filepointer): the output file
+        @param options (dict): the options to get texts and styles from
+
+        """
+        # Then, fix Header (Left,Center,Right)
+        if len(options["leftheader"])>0:
+            fp.write( "    \\lhead{\\color{HeaderColor}{"+options["headerstyle"]+"{\small "+options["leftheader"]+"}}}\n")
+        if len(options["centerheader"])>0:
+            fp.write( "    \\chead{\\color{HeaderColor}{"+options["headerstyle"]+"{\small "+options["centerheader"]+"}}}\n")
+        if len(options["rightheader"])>0:
+            fp.write( "    \\rhead{\\color{HeaderColor}{"+options["headerstyle"]+"{\small "+options["rightheader"]+"}}}\n")
+
+        # Then, fix Footer (Left,Center,Right)
+        if len(options["leftfooter"])>0:
+            fp.write( "    \\lfoot{\\color{FooterColor}{"+options["footerstyle"]+"{"+options["leftfooter"]+"}}}\n")
+        if len(options["centerfooter"])>0:
+            fp.write( "    \\cfoot{\\color{FooterColor}{"+options["footerstyle"]+"{"+options["centerfooter"]+"}}}\n")
+        if len(options["rightfooter"])>0:
+            fp.write( "    \\rfoot{\\color{FooterColor}{"+options["footerstyle"]+"{"+options["rightfooter"]+"}}}\n")
+
+    # End __save_header_footer
     # -------------------------------------------------------------------------
 
 
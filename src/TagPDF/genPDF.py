@@ -47,6 +47,7 @@ import getopt
 import logging
 
 from genLaTeX import GenLaTeXFile
+from overlay import PdfOverlay
 from name import GenName
 import utils
 
@@ -63,6 +64,9 @@ class GenPdfFile( GenLaTeXFile ):
     Represents a class to generate an empty pdf file.
     An header and a footer can be specified.
 
+    Empty pages are written directly in PDF (see PdfOverlay) if their
+    header/footer texts can be, otherwise pdflatex is used.
+
     """
 
     def __init__(self):
@@ -70,30 +74,85 @@ class GenPdfFile( GenLaTeXFile ):
         Creates a new GenPdfFile instance.
         """
         GenLaTeXFile.__init__(self)
+        self.__formats = None
 
     # End __init__
     # -------------------------------------------------------------------------
 
 
+    def set_format_cache(self, formats):
+        """
+        Fix the cache of precompiled LaTeX formats to compile with.
+
+        @param formats (FormatCache) or None to load the packages at each
+        compilation.
+
+        """
+        self.__formats = formats
+
+    # End set_format_cache
+    # -------------------------------------------------------------------------
+
+
+    def set_direct_pdf(self, boolean):
+        """
+        Fix if empty pages can be written without pdflatex (see PdfOverlay).
+        The texts are then not exactly placed as by LaTeX, and not with the
+        same font: it is disabled by default.
+
+        @param boolean (bool) True to not use pdflatex if possible.
+
+        """
+        self.set_option("directpdf", bool(boolean))
+
+    # End set_direct_pdf
+    # -------------------------------------------------------------------------
+
+
     def exportPDF(self, filename):
         """
         Creates a PDF file.
 
         @param filename (string) Output file name.
 
-        This functions requires 'pdflatex' to be installed.
+        This functions requires 'pdflatex' to be installed, except for empty
+        pages with a plain text header/footer.
 
         """
+        if self.get_tex_content() is None and self.get_parts() is None and self.get_option("directpdf") is True:
+            overlay = PdfOverlay( self.get_options(), self.get_overlays() )
+            if overlay.is_supported():
+                overlay.export( filename )
+                return
+            logging.debug('Header/footer written with pdflatex: %s' % overlay.get_error())
+
+        fmt = None
+        if self.__formats is not None:
+            fmt = self.__formats.get_format( self.get_preamble() )
+
         # Create a temporary LaTeX file
         fname = os.path.join(os.getcwd(), GenName().get_name())
-        self.exportLaTeX(fname+".tex")
+        self.exportLaTeX(fname+".tex", fmt is None)
 
         # Execute pdflatex to convert to pdf
-        command = 'pdflatex -halt-on-error -interaction nonstopmode '
-        command += '"' + fname+'.tex" '
-
+        command = self.__get_command( fname, fmt )
         ret = utils.run_command( command ) # first compilation
-        ret = utils.run_command( command ) # second compilation
+        if fmt is not None and not os.path.exists(fname+".pdf"):
+            # Compile again with the packages. The format is not used
+            # anymore only if pdflatex could not load it.
+            logging.debug('Compilation with the format %s failed: %s' % (fmt, ret))
+            if self.__format_failed( ret, fname+".log" ) is True:
+                self.__formats.discard_format( self.get_preamble() )
+            fmt = None
+            self.exportLaTeX(fname+".tex")
+            command = self.__get_command( fname, fmt )
+            ret = utils.run_command( command )
+        # Next compilations: labels of a book may be stable only after
+        # the widths of its tables
+        compilations = 1
+        while compilations < 3 and self.__rerun_required( fname+".log" ) is True:
+            ret = utils.run_command( command )
+            compilations += 1
 
         if not len(ret):
             logging.debug(ret)
@@ -102,18 +161,92 @@ class GenPdfFile( GenLaTeXFile ):
         # Manage output
         if os.path.exists(fname+".pdf"):
             os.rename(fname+".pdf", filename)
-            os.rename(fname+".tex", filename[:-4]+".tex")
+            if fmt is None:
+                os.rename(fname+".tex", filename[:-4]+".tex")
+            else:
+                # keep a LaTeX file which can be compiled without the format
+                os.remove(fname+".tex")
+                self.exportLaTeX(filename[:-4]+".tex")
         else:
             raise IOError('Error: pdflatex produced no output with command: %s'%command)
 
+        # Remove pdflatex outputs (.aux, .log...) of this file only: other
+        # files with the same prefix can be in use by another worker.
         for f in os.listdir(os.getcwd()):
-            if os.path.basename(fname) in f and not f.endswith(".tex"):
+            if os.path.splitext(f)[0] == os.path.basename(fname) and not f.endswith(".tex"):
                 os.remove(f)
 
     # End exportPDF
     # -------------------------------------------------------------------------
 
 
+    def __get_command(self, fname, fmt):
+        """
+        Return the pdflatex command to compile a file.
+
+        @param fname (string) LaTeX file name, without extension.
+        @param fmt (string) Format file name, or None.
+
+        """
+        command = 'pdflatex -halt-on-error -interaction nonstopmode '
+        if fmt is not None:
+            command += '-fmt="' + fmt + '" '
+        command += '"' + fname+'.tex" '
+        return command
+
+    # End __get_command
+    # -------------------------------------------------------------------------
+
+
+    def __rerun_required(self, logname):
+        """
+        Return True if pdflatex must compile the file a second time.
+
+        Empty pages (header/footer only) have no references nor tables, so
+        that one compilation is enough. Otherwise (a content or the parts of
+        a book), LaTeX writes a "Rerun" warning in the log file if the output
+        is not stable yet (longtable widths, labels...).
+
+        @param logname (string) pdflatex log file of the first compilation.
+
+        """
+        if self.get_tex_content() is None and self.get_parts() is None:
+            return False
+
+        try:
+            with open(logname, "r") as fp:
+                log = fp.read()
+        except IOError:
+            return True
+
+        return "Rerun" in log
+
+    # End __rerun_required
+    # -------------------------------------------------------------------------
+
+
+    def __format_failed(self, output, logname):
+        """
+        Return True if pdflatex could not load the format file: the format
+        is missing, or it was dumped by another version of pdflatex.
+
+        @param output (string) Output of the pdflatex command.
+        @param logname (string) pdflatex log file (if any).
+
+        """
+        log = output
+        try:
+            with open(logname, "r") as fp:
+                log += fp.read()
+        except IOError:
+            pass
+
+        return "Fatal format file error" in log or "can't find the format file" in log
+
+    # End __format_failed
+    # -------------------------------------------------------------------------
+
+
 # ---------------------------------------------------------------------------
 # Main program to be used inline
 # ---------------------------------------------------------------------------
@@ -142,6 +275,7 @@ def usage(output):
     output.write('      -G "R,G,B"              Footer colot; Red,Green,Blue (Default: "100,100,100") \n')
     output.write('      --hrule                 Add a rule to separate the header\n')
     output.write('      --frule                 Add a rule to separate the footer\n')
+    output.write('      --direct                Write the pages without pdflatex if possible\n')
     output.write('      --help                  Print this help\n\n')
 
 
@@ -194,7 +328,7 @@ if __name__ == "__main__":
 
     # Get options (if any...)
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "l:c:r:L:C:R:p:n:N:s:S:g:G:o:", ["help","hrule","frule"])
+        opts, args = getopt.getopt(sys.argv[1:], "l:c:r:L:C:R:p:n:N:s:S:g:G:o:", ["help","hrule","frule","direct"])
     except getopt.GetoptError, err:
         # Print help information and exit:
         Quit("Error: "+str(err)+".\nUse option --help for any help.\n", 1)
@@ -241,6 +375,8 @@ if __name__ == "__main__":
                 pdffile.set_header_rule(True)
             elif o == "--frule":
                 pdffile.set_footer_rule(True)
+            elif o == "--direct":
+                pdffile.set_direct_pdf(True)
             elif o == "--help": # need help
                 print 'Help'
                 usage(sys.stdout)
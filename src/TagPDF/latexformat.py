@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+
+import os
+import codecs
+import hashlib
+import logging
+import threading
+
+from name import GenName
+import utils
+
+# ---------------------------------------------------------------------------
+
+class FormatCache:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Persistent cache of precompiled LaTeX formats.
+
+    All the LaTeX files generated by Proceed start with the same document
+    class and packages (see GenLaTeXFile.get_preamble), and loading them
+    takes most of the time of pdflatex for small files. This preamble is
+    compiled once in a format file ("pdflatex -ini ... \\dump"), which is
+    then given to pdflatex with the option -fmt.
+
+    Formats are stored in a directory, and named by the hash of the
+    preamble and of the version of pdflatex. A format which can't be built
+    or loaded is not tried again by the same instance: None is returned,
+    and the file must be compiled with its preamble.
+
+    """
+
+    def __init__(self, dirname):
+        """
+        Creates a new FormatCache instance.
+
+        @param dirname (string) Directory of the formats (created if needed).
+
+        """
+        self._dirname = dirname
+        self._formats = {}      # key -> format name, or None
+        self._version = None
+        self._lock = threading.Lock()
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def get_format(self, preamble):
+        """
+        Return the format of a preamble, built if needed.
+
+        @param preamble (string) Document class and packages.
+        @return the format file name, without the .fmt extension, or None
+
+        """
+        with self._lock:
+            key = self.__get_key( preamble )
+            if key not in self._formats:
+                self._formats[key] = self.__build( key, preamble )
+            return self._formats[key]
+
+    # End get_format
+    # -------------------------------------------------------------------------
+
+
+    def discard_format(self, preamble):
+        """
+        Do not use the format of a preamble anymore in this instance
+        (pdflatex could not load it). The format file is not removed: it
+        can be in use by other workers.
+
+        @param preamble (string) Document class and packages.
+
+        """
+        with self._lock:
+            key = self.__get_key( preamble )
+            self._formats[key] = None
+
+    # End discard_format
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __get_key(self, preamble):
+        # Hash of the preamble and of the version of pdflatex: a format can
+        # only be loaded by the program which dumped it.
+        if self._version is None:
+            status, ret = utils.run_command_status( 'pdflatex --version' )
+            self._version = ret.splitlines()[0] if status == 0 and len(ret) > 0 else ""
+
+        if isinstance(preamble, unicode):
+            preamble = preamble.encode('utf-8')
+        h = hashlib.sha1()
+        h.update( self._version )
+        h.update( preamble )
+        return h.hexdigest()
+
+
+    def __build(self, key, preamble):
+        # Dump the format of a preamble, if not already done.
+        fmtname = os.path.join(self._dirname, key)
+        if os.path.exists( fmtname + ".fmt" ):
+            return fmtname
+
+        if not os.path.exists( self._dirname ):
+            os.makedirs( self._dirname )
+
+        # Dump with a temporary name: another process can use the same
+        # directory.
+        jobname = key + "-" + GenName().get_name()
+        with codecs.open( os.path.join(self._dirname, jobname + ".tex"), 'w', 'utf-8' ) as fp:
+            fp.write( preamble )
+
+        command = 'pdflatex -ini -halt-on-error -interaction nonstopmode '
+        command += '-jobname="' + jobname + '" '
+        command += '"&pdflatex ' + jobname + '.tex\\dump"'
+        status, ret = utils.run_command_status( command, self._dirname )
+
+        try:
+            if status == 0 and os.path.exists( os.path.join(self._dirname, jobname + ".fmt") ):
+                os.rename( os.path.join(self._dirname, jobname + ".fmt"), fmtname + ".fmt" )
+                logging.debug('LaTeX format created: %s' % fmtname)
+                return fmtname
+            logging.debug('LaTeX format not created: %s' % ret)
+            return None
+        finally:
+            for ext in [".tex", ".log", ".fmt"]:
+                if os.path.exists( os.path.join(self._dirname, jobname + ext) ):
+                    os.remove( os.path.join(self._dirname, jobname + ext) )
+
+# ---------------------------------------------------------------------------
@@ -44,6 +44,7 @@ import sys
 import os
 import random
 import tempfile
+import threading
 from datetime import date
 
 # ---------------------------------------------------------------------------
@@ -70,11 +71,13 @@ class GenName():
         randval  = str(int(random.random()*10000))
         # process pid
         pid      = str(os.getpid())
+        # thread id (names are created by concurrent workers)
+        tid      = str(threading.current_thread().ident)
         # today's date
         today    = str(date.today())
 
         # filename
-        filename = "tmp_"+today+"_"+pid+"_"+randval
+        filename = "tmp_"+today+"_"+pid+"_"+tid+"_"+randval
 
         # final file name is path/filename
         self.name = filename + extension
@@ -0,0 +1,420 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+
+import re
+import unicodedata
+
+from fontmetrics import get_text_width
+
+# ---------------------------------------------------------------------------
+
+# Units: PDF points per millimeter and per TeX point
+MM = 72. / 25.4
+PT = 72. / 72.27
+
+# Paper sizes, in millimeters
+PAPERS = {
+    "a4paper":     (210., 297.),
+    "letterpaper": (215.9, 279.4),
+    "b5paper":     (176., 250.),
+    "a5paper":     (148., 210.)
+    }
+
+# Standard PDF font of each text style (the LaTeX fonts are not available)
+STYLES = {
+    "":       "Times-Roman",
+    "\\rm":   "Times-Roman",
+    "\\it":   "Times-Italic",
+    "\\em":   "Times-Italic",
+    "\\emph": "Times-Italic",
+    "\\sl":   "Times-Italic",
+    "\\bf":   "Times-Bold",
+    "\\sf":   "Helvetica",
+    "\\sc":   "Times-Roman",
+    "\\tt":   "Courier"
+    }
+
+# Layout of the article class (12pt) with fancyhdr: font sizes, distance
+# between the header and the body, depth of the lines, height of a line.
+HEADER_FONTSIZE = 10.95 * PT   # \small
+FOOTER_FONTSIZE = 12.   * PT   # \normalsize
+HEADSEP         = 25.   * PT
+STRUTDEPTH      = 4.35  * PT
+STRUTHEIGHT     = 10.15 * PT
+RULEWIDTH       = 0.5   * PT
+SIDEMARGIN      = 20.   * MM
+
+# Placeholder of the page number in a converted text
+PAGENUMBER = u"\x00"
+
+# LaTeX commands of the header/footer texts which can be converted
+SYMBOLS = {
+    "thepage": PAGENUMBER,
+    "&": u"&", "%": u"%", "$": u"$", "#": u"#", "_": u"_",
+    "{": u"{", "}": u"}", " ": u" ", ",": u" ", "-": u"",
+    "ldots": u"\u2026", "dots": u"\u2026",
+    "oe": u"\u0153", "OE": u"\u0152", "ae": u"\xe6", "AE": u"\xc6",
+    "aa": u"\xe5", "AA": u"\xc5", "o": u"\xf8", "O": u"\xd8",
+    "ss": u"\xdf", "i": u"i", "S": u"\xa7", "P": u"\xb6",
+    "textendash": u"\u2013", "textemdash": u"\u2014",
+    "copyright": u"\xa9", "textregistered": u"\xae", "texttrademark": u"\u2122",
+    "euro": u"\u20ac", "textdegree": u"\xb0",
+    "guillemotleft": u"\xab", "guillemotright": u"\xbb"
+    }
+
+# Accents: LaTeX command -> unicode combining character
+ACCENTS = {
+    "'": u"\u0301", "`": u"\u0300", "^": u"\u0302", '"': u"\u0308",
+    "~": u"\u0303", "=": u"\u0304", ".": u"\u0307", "c": u"\u0327",
+    "u": u"\u0306", "v": u"\u030c", "H": u"\u030b", "r": u"\u030a"
+    }
+
+# Ligatures of the T1 font encoding
+LIGATURES = {
+    u"---": u"\u2014", u"--": u"\u2013", u"``": u"\u201c", u"''": u"\u201d",
+    u"`": u"\u2018", u"'": u"\u2019", u"<<": u"\xab", u">>": u"\xbb",
+    u"~": u"\xa0"
+    }
+
+RXTOKEN = re.compile(ur"\\([A-Za-z]+)\s*|\\(.)|(---|--|``|''|<<|>>|\s+|.)", re.S)
+
+# ---------------------------------------------------------------------------
+
+
+def tex_to_unicode(tex):
+    """
+    Convert the LaTeX text of a header/footer into a unicode string.
+
+    Only plain text is supported, with accents, special characters and
+    \\thepage (replaced by PAGENUMBER). A ValueError is raised for any
+    other LaTeX command.
+
+    @param tex (string) LaTeX text
+
+    """
+    if isinstance(tex, str):
+        tex = tex.decode('utf-8')
+
+    result = []
+    pos = 0
+    while pos < len(tex):
+        m = RXTOKEN.match(tex, pos)
+        pos = m.end()
+        word, symbol, char = m.groups()
+        name = word or symbol
+        if name is not None:
+            if name in ACCENTS:
+                base, pos = _get_argument(tex, pos)
+                result.append( unicodedata.normalize('NFC', base + ACCENTS[name]) )
+            elif name in SYMBOLS:
+                result.append( SYMBOLS[name] )
+            else:
+                raise ValueError("Unsupported LaTeX command: \\%s" % name)
+        elif char in LIGATURES:
+            result.append( LIGATURES[char] )
+        elif char.isspace():
+            result.append( u" " )
+        elif char in u"{}":
+            continue
+        elif char in u"\\$^_%&#":
+            raise ValueError("Unsupported LaTeX character: %s" % char)
+        else:
+            result.append( char )
+
+    return u"".join(result).strip()
+
+# ---------------------------------------------------------------------------
+
+
+def _get_argument(tex, pos):
+    # Return the converted argument of a command at a given position,
+    # and the position after the argument.
+    if pos >= len(tex):
+        raise ValueError("Missing argument of a LaTeX command.")
+
+    if tex[pos] != u"{":
+        m = RXTOKEN.match(tex, pos)
+        return tex_to_unicode(m.group(0)), m.end()
+
+    depth = 0
+    for i in range(pos, len(tex)):
+        if tex[i] == u"{" and tex[i-1] != u"\\":
+            depth += 1
+        elif tex[i] == u"}" and tex[i-1] != u"\\":
+            depth -= 1
+            if depth == 0:
+                return tex_to_unicode(tex[pos+1:i]), i+1
+    raise ValueError("Unbalanced braces in a LaTeX text.")
+
+# ---------------------------------------------------------------------------
+
+
+class PdfOverlay:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Write header/footer pages directly in PDF, without LaTeX.
+
+    The pages are the ones of GenPdfFile when it has no content: the same
+    paper, margins, texts, styles, colors and rules. Texts are written with
+    the standard PDF fonts (Times, Helvetica or Courier), which don't need
+    to be embedded in the file.
+
+    Only texts without LaTeX commands (except accents, special characters
+    and \\thepage) can be written: is_supported() must be checked first,
+    pdflatex is required for the other ones.
+
+    """
+
+    def __init__(self, options, overlays=None):
+        """
+        Creates a new PdfOverlay instance.
+
+        @param options (dict) Options of a GenLaTeXFile (see get_options).
+        @param overlays (list) Options to update for each set of pages,
+        like in GenLaTeXFile.set_overlays, or None for only one set.
+
+        """
+        if overlays is None:
+            overlays = [ {} ]
+
+        self.__options = []
+        for overlay in overlays:
+            o = dict(options)
+            o.update(overlay)
+            self.__options.append( o )
+
+        self.__fonts = []
+        self.__error = None
+        try:
+            self.__layouts = [ self.__get_layout(o) for o in self.__options ]
+        except (ValueError, KeyError, UnicodeError), e:
+            self.__error = str(e)
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def is_supported(self):
+        """
+        Return True if all headers/footers can be written without LaTeX.
+
+        """
+        return self.__error is None
+
+    # End is_supported
+    # -------------------------------------------------------------------------
+
+
+    def get_error(self):
+        """
+        Return the reason why the overlay can't be written, or None.
+
+        """
+        return self.__error
+
+    # End get_error
+    # -------------------------------------------------------------------------
+
+
+    def export(self, filename):
+        """
+        Write the PDF file.
+
+        @param filename (string) Output file name.
+
+        """
+        if self.__error is not None:
+            raise ValueError(self.__error)
+
+        # Objects 1 and 2 are the catalog and the page tree, then fonts.
+        objects = [ None, None ]
+        for fontname in self.__fonts:
+            objects.append( "<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % fontname )
+
+        kids = []
+        for options, layout in zip(self.__options, self.__layouts):
+            width, height = layout[0]
+            first = int(options["pagenumber"])
+            for page in range( first, first+int(options["numberofpages"]) ):
+                content = self.__get_content( layout, page )
+                objects.append( "<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content) )
+                objects.append( "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %s %s] /Contents %d 0 R >>" % (self.__number(width), self.__number(height), len(objects)) )
+                kids.append( "%d 0 R" % len(objects) )
+
+        fonts = " ".join( "/F%d %d 0 R" % (i+1, i+3) for i in range(len(self.__fonts)) )
+        objects[0] = "<< /Type /Catalog /Pages 2 0 R >>"
+        objects[1] = "<< /Type /Pages /Kids [%s] /Count %d /Resources << /Font << %s >> /ProcSet [/PDF /Text] >> >>" % (" ".join(kids), len(kids), fonts)
+
+        with open(filename, "wb") as fp:
+            fp.write( "%PDF-1.4\n%\xe2\xe3\xcf\xd3\n" )
+            offsets = []
+            for i, obj in enumerate(objects):
+                offsets.append( fp.tell() )
+                fp.write( "%d 0 obj\n%s\nendobj\n" % (i+1, obj) )
+            startxref = fp.tell()
+            fp.write( "xref\n0 %d\n0000000000 65535 f \n" % (len(objects)+1) )
+            for offset in offsets:
+                fp.write( "%010d 00000 n \n" % offset )
+            fp.write( "trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects)+1, startxref) )
+
+    # End export
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __get_layout(self, options):
+        # Return the page size, and the texts and rules of the header and
+        # the footer: what is not depending on the page number.
+        if options["paper"] not in PAPERS:
+            raise ValueError("Unsupported paper: %s" % options["paper"])
+        width  = PAPERS[options["paper"]][0] * MM
+        height = PAPERS[options["paper"]][1] * MM
+
+        top    = height - float(options["topmargin"]) * MM + HEADSEP
+        bottom = float(options["bottommargin"]) * MM - float(options["footsize"]) * PT
+
+        texts = []
+        for name, x, align in [ ("left", SIDEMARGIN, 0), ("center", width/2., 0.5), ("right", width-SIDEMARGIN, 1) ]:
+            texts.append( self.__get_text(options[name+"header"], options["headerstyle"], options["headercolor"], HEADER_FONTSIZE, x, top+STRUTDEPTH, align) )
+            texts.append( self.__get_text(options[name+"footer"], options["footerstyle"], options["footercolor"], FOOTER_FONTSIZE, x, bottom, align) )
+
+        rules = []
+        if options["headerrule"] is True:
+            rules.append( (SIDEMARGIN, top-RULEWIDTH, width-2*SIDEMARGIN, RULEWIDTH) )
+        if options["footerrule"] is True:
+            rules.append( (SIDEMARGIN, bottom+STRUTHEIGHT+STRUTDEPTH, width-2*SIDEMARGIN, RULEWIDTH) )
+
+        return (width, height), [ t for t in texts if t is not None ], rules
+
+    # End __get_layout
+    # -------------------------------------------------------------------------
+
+
+    def __get_text(self, tex, style, color, size, x, y, align):
+        # Return the description of a text, or None if it is empty.
+        text = tex_to_unicode( tex )
+        if len(text) == 0:
+            return None
+        # check that the text can be encoded (with any page number)
+        text.replace(PAGENUMBER, u"").encode('cp1252')
+
+        if style not in STYLES:
+            raise ValueError("Unsupported text style: %s" % style)
+        fontname = STYLES[style]
+        if fontname not in self.__fonts:
+            self.__fonts.append( fontname )
+
+        rgb = [ int(c)/255. for c in color.split(",") ]
+        if len(rgb) != 3:
+            raise ValueError("Unsupported color: %s" % color)
+
+        return (text, style == "\\sc", fontname, rgb, size, x, y, align)
+
+    # End __get_text
+    # -------------------------------------------------------------------------
+
+
+    def __get_content(self, layout, page):
+        # Return the content stream of a page.
+        content = []
+        for text, smallcaps, fontname, rgb, size, x, y, align in layout[1]:
+            runs = self.__get_runs( text.replace(PAGENUMBER, unicode(page)), smallcaps, size )
+            width = sum( get_text_width(fontname, s, fsize) for s, fsize in runs )
+            font = "/F%d" % (self.__fonts.index(fontname)+1)
+            content.append( "BT %s rg" % " ".join(self.__number(c) for c in rgb) )
+            content.append( "1 0 0 1 %s %s Tm" % (self.__number(x - align*width), self.__number(y)) )
+            for s, fsize in runs:
+                content.append( "%s %s Tf (%s) Tj" % (font, self.__number(fsize), self.__escape(s)) )
+            content.append( "ET" )
+
+        for x, y, w, h in layout[2]:
+            content.append( "0 g %s %s %s %s re f" % tuple(self.__number(v) for v in (x, y, w, h)) )
+
+        return "\n".join(content)
+
+    # End __get_content
+    # -------------------------------------------------------------------------
+
+
+    def __get_runs(self, text, smallcaps, size):
+        # Return the list of (cp1252 string, font size) to write a text.
+        # Small capitals are upper case letters with a smaller font size.
+        if smallcaps is False:
+            return [ (text.encode('cp1252'), size) ]
+
+        runs = []
+        for lower, chars in [ (c.islower(), c) for c in text ]:
+            if lower is True:
+                chars = chars.upper()
+            fsize = size * 0.8 if lower is True else size
+            if len(runs) > 0 and runs[-1][1] == fsize:
+                runs[-1] = (runs[-1][0] + chars.encode('cp1252'), fsize)
+            else:
+                runs.append( (chars.encode('cp1252'), fsize) )
+        return runs
+
+    # End __get_runs
+    # -------------------------------------------------------------------------
+
+
+    def __escape(self, s):
+        # Escape a string to be written in a PDF literal string.
+        return s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    # End __escape
+    # -------------------------------------------------------------------------
+
+
+    def __number(self, value):
+        # Format a number in a PDF content stream.
+        return ("%.3f" % value).rstrip("0").rstrip(".")
+
+    # End __number
+    # -------------------------------------------------------------------------
+
+# ---------------------------------------------------------------------------
@@ -0,0 +1,684 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+import os
+import re
+import mmap
+import zlib
+
+# ---------------------------------------------------------------------------
+
+# PDF white spaces and comments
+WHITESPACES = re.compile(r"(?:[\x00\t\n\x0c\r ]+|%[^\r\n]*)*")
+
+RXNAME      = re.compile(r"/([^\x00\t\n\x0c\r ()<>\[\]{}/%]*)")
+RXNUMBER    = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)")
+RXREFERENCE = re.compile(r"(\d+)[\x00\t\n\x0c\r ]+(\d+)[\x00\t\n\x0c\r ]+R(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])")
+RXKEYWORD   = re.compile(r"[^\x00\t\n\x0c\r ()<>\[\]{}/%]+")
+RXOBJECT    = re.compile(r"(\d+)[\x00\t\n\x0c\r ]+(\d+)[\x00\t\n\x0c\r ]+obj")
+RXXREFENTRY = re.compile(r"[\x00\t\n\x0c\r ]*(\d{1,10})[ ]+(\d{1,5})[ ]+([nf])")
+RXXREFRANGE = re.compile(r"[\x00\t\n\x0c\r ]*(\d+)[ ]+(\d+)")
+
+# Objects of the cross-reference table: in the file, or in an object stream
+IN_FILE   = 1
+IN_STREAM = 2
+
+# ---------------------------------------------------------------------------
+
+class Reference:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: An indirect reference to a PDF object ("12 0 R").
+
+    """
+
+    def __init__(self, num, gen):
+        self.num = num
+        self.gen = gen
+
+# ---------------------------------------------------------------------------
+
+
+class Name( str ):
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: A PDF name (/Type), without its slash.
+
+    """
+    pass
+
+# ---------------------------------------------------------------------------
+
+
+class String( str ):
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: A PDF string, as written in the file (without its delimiters).
+
+    """
+
+    def __new__(cls, value, hexa=False):
+        s = str.__new__(cls, value)
+        s.hexa = hexa
+        return s
+
+# ---------------------------------------------------------------------------
+
+
+class PdfInfo:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Read the number of pages and the media box of a PDF file.
+
+    The file is memory-mapped, and only the objects which are required are
+    read: the trailer and the cross-reference sections (tables or streams,
+    following /Prev), the catalog, then the page tree with its /Count and
+    its first page. Objects in compressed object streams are supported.
+
+    An IOError is raised if the file can't be read this way (damaged
+    cross-reference table, encrypted object streams...).
+
+    """
+
+    def __init__(self, filename):
+        """
+        Creates a new PdfInfo instance, and read the cross-reference of a file.
+
+        @param filename (string) PDF file name.
+
+        """
+        self._xref    = {}   # object number -> (IN_FILE, offset) or (IN_STREAM, stream, index)
+        self._trailer = {}
+        self._objects = {}   # object number -> object (already read)
+        self._streams = {}   # object stream number -> (data, offsets)
+        self._encrypted = False
+
+        with open(filename, "rb") as fp:
+            if os.fstat( fp.fileno() ).st_size == 0:
+                raise IOError("Empty file.")
+            self._data = mmap.mmap( fp.fileno(), 0, access=mmap.ACCESS_READ )
+        try:
+            if self._data.find("%PDF", 0, 1024) == -1:
+                raise IOError("Not a PDF file.")
+            self.__read_xref()
+        except Exception:
+            self.close()
+            raise
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def close(self):
+        """
+        Close the memory-mapped file.
+
+        """
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+    # End close
+    # -------------------------------------------------------------------------
+
+
+    def is_encrypted(self):
+        """
+        Return True if the file is encrypted.
+
+        """
+        return self._encrypted
+
+    # End is_encrypted
+    # -------------------------------------------------------------------------
+
+
+    def get_pages(self):
+        """
+        Return the number of pages (the /Count of the page tree).
+
+        """
+        count = self.resolve( self.__get_page_tree().get("Count") )
+        if not isinstance(count, (int,long)):
+            raise IOError("Bad number of pages.")
+        return count
+
+    # End get_pages
+    # -------------------------------------------------------------------------
+
+
+    def get_mediabox(self):
+        """
+        Return the media box of the first page, like "0 0 595.276 841.89",
+        or None.
+
+        """
+        node = self.__get_page_tree()
+        mediabox = None
+        for depth in range(64):
+            if "MediaBox" in node:
+                mediabox = self.resolve( node["MediaBox"] )
+            kids = self.resolve( node.get("Kids") )
+            if node.get("Type") == "Page" or not isinstance(kids, list) or len(kids) == 0:
+                break
+            node = self.resolve( kids[0] )
+            if not isinstance(node, dict):
+                break
+
+        if not isinstance(mediabox, list) or len(mediabox) != 4:
+            return None
+        return " ".join( "%g" % float(self.resolve(v)) for v in mediabox )
+
+    # End get_mediabox
+    # -------------------------------------------------------------------------
+
+
+    def get_page_list(self):
+        """
+        Return the list of the pages: each page is a tuple with the
+        reference and the dictionary of the page. Inherited attributes
+        (Resources, MediaBox, CropBox, Rotate) are added to the dictionary.
+
+        """
+        pages = list()
+        catalog = self.resolve( self._trailer["Root"] )
+        if not isinstance(catalog, dict):
+            raise IOError("Bad catalog.")
+        stack = [ (catalog.get("Pages"), {}, 0) ]
+        while len(stack) > 0:
+            ref, inherited, depth = stack.pop()
+            node = self.resolve( ref )
+            if not isinstance(node, dict) or depth > 64:
+                raise IOError("Bad page tree.")
+            attributes = dict( inherited )
+            for name in ["Resources", "MediaBox", "CropBox", "Rotate"]:
+                if name in node:
+                    attributes[name] = node[name]
+            if node.get("Type") == "Page" or "Kids" not in node:
+                page = dict( node )
+                page.update( attributes )
+                pages.append( (ref, page) )
+            else:
+                kids = self.resolve( node["Kids"] )
+                for kid in reversed(kids):
+                    stack.append( (kid, attributes, depth+1) )
+        return pages
+
+    # End get_page_list
+    # -------------------------------------------------------------------------
+
+
+    def get_trailer(self):
+        """
+        Return the trailer dictionary (of all cross-reference sections).
+
+        """
+        return dict( self._trailer )
+
+    # End get_trailer
+    # -------------------------------------------------------------------------
+
+
+    def get_size(self):
+        """
+        Return the number of objects (the /Size of the trailer).
+
+        """
+        size = self._trailer.get("Size", 0)
+        if len(self._xref) > 0:
+            size = max( size, max(self._xref.keys())+1 )
+        return size
+
+    # End get_size
+    # -------------------------------------------------------------------------
+
+
+    def get_startxref(self):
+        """
+        Return the offset of the last cross-reference section, and True if
+        it is a cross-reference stream.
+
+        """
+        return self._startxref, self._xrefstream
+
+    # End get_startxref
+    # -------------------------------------------------------------------------
+
+
+    def resolve(self, value):
+        """
+        Return the object of a reference, or the value itself.
+
+        @param value (Reference or any object)
+
+        """
+        for depth in range(32):
+            if not isinstance(value, Reference):
+                return value
+            value = self.__get_object( value.num )
+        raise IOError("Too many references.")
+
+    # End resolve
+    # -------------------------------------------------------------------------
+
+
+    def get_stream(self, ref):
+        """
+        Return an object and the raw (not decoded) data of its stream, or
+        None if the object is not a stream.
+
+        @param ref (Reference) Reference of the object.
+
+        """
+        entry = self._xref.get( ref.num )
+        if entry is None or entry[0] != IN_FILE:
+            return self.resolve( ref ), None
+        return self.__read_indirect( entry[1], decode=False )
+
+    # End get_stream
+    # -------------------------------------------------------------------------
+
+
+    def decode(self, d, data):
+        """
+        Decode the data of a stream (only FlateDecode is supported).
+
+        @param d (dict) Dictionary of the stream.
+        @param data (str) Raw data of the stream.
+
+        """
+        filters = d.get("Filter", [])
+        params  = d.get("DecodeParms", {})
+        if not isinstance(filters, list):
+            filters = [filters]
+        if not isinstance(params, list):
+            params = [params]
+        for i,name in enumerate(filters):
+            if name != "FlateDecode":
+                raise IOError("Unsupported filter: %s."%name)
+            try:
+                data = zlib.decompress( data )
+            except zlib.error:
+                # Some streams are truncated or followed by garbage
+                data = zlib.decompressobj().decompress( data )
+            p = params[i] if i < len(params) and isinstance(params[i], dict) else {}
+            if p.get("Predictor", 1) >= 10:
+                data = self.__unpredict( data, p.get("Columns", 1) )
+            elif p.get("Predictor", 1) > 1:
+                raise IOError("Unsupported predictor.")
+        return data
+
+    # End decode
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private: cross-reference
+    # -------------------------------------------------------------------------
+
+
+    def __read_xref(self):
+        # Read all cross-reference sections, from the last one.
+        start = self._data.rfind("startxref", max(0, len(self._data)-2048))
+        if start == -1:
+            raise IOError("No startxref.")
+        m = RXNUMBER.match( self._data, self.__skip(start+9) )
+        if m is None:
+            raise IOError("Bad startxref.")
+
+        self._startxref = int(m.group(0))
+        self._xrefstream = self._data[self.__skip(self._startxref):self.__skip(self._startxref)+4] != "xref"
+
+        offsets = [ self._startxref ]
+        done = set()
+        while len(offsets) > 0:
+            offset = offsets.pop(0)
+            if offset in done or offset < 0 or offset >= len(self._data):
+                continue
+            done.add( offset )
+
+            pos = self.__skip( offset )
+            if self._data[pos:pos+4] == "xref":
+                trailer = self.__read_xref_table( pos+4 )
+                # Hybrid files: the stream is read before the previous sections
+                if isinstance(trailer.get("XRefStm"), (int,long)):
+                    offsets.insert( 0, trailer["XRefStm"] )
+            else:
+                trailer = self.__read_xref_stream( pos )
+
+            if "Encrypt" in trailer:
+                self._encrypted = True
+            for key,value in trailer.items():
+                if key not in self._trailer:
+                    self._trailer[key] = value
+            if isinstance(trailer.get("Prev"), (int,long)):
+                offsets.append( trailer["Prev"] )
+
+        if not isinstance(self._trailer.get("Root"), Reference):
+            raise IOError("No catalog.")
+
+
+    def __read_xref_table(self, pos):
+        # Read a cross-reference table, and return its trailer.
+        while True:
+            pos = self.__skip( pos )
+            if self._data[pos:pos+7] == "trailer":
+                trailer, pos = self.__read_object( pos+7 )
+                if not isinstance(trailer, dict):
+                    raise IOError("Bad trailer.")
+                return trailer
+            m = RXXREFRANGE.match( self._data, pos )
+            if m is None:
+                raise IOError("Bad cross-reference table.")
+            first, count = int(m.group(1)), int(m.group(2))
+            pos = m.end()
+            for num in range(first, first+count):
+                m = RXXREFENTRY.match( self._data, pos )
+                if m is None:
+                    raise IOError("Bad cross-reference table.")
+                pos = m.end()
+                if m.group(3) == "n" and num not in self._xref:
+                    self._xref[num] = (IN_FILE, int(m.group(1)))
+
+
+    def __read_xref_stream(self, pos):
+        # Read a cross-reference stream, and return its dictionary.
+        d, data = self.__read_indirect( pos )
+        if not isinstance(d, dict) or d.get("Type") != "XRef" or data is None:
+            raise IOError("Bad cross-reference stream.")
+
+        widths = d.get("W")
+        if not isinstance(widths, list) or len(widths) != 3:
+            raise IOError("Bad cross-reference stream.")
+        index = d.get("Index", [0, d.get("Size", 0)])
+        size = sum(widths)
+
+        pos = 0
+        for i in range(0, len(index)-1, 2):
+            for num in range(index[i], index[i]+index[i+1]):
+                if pos+size > len(data):
+                    raise IOError("Bad cross-reference stream.")
+                fields = list()
+                for w in widths:
+                    value = 0
+                    for c in data[pos:pos+w]:
+                        value = (value << 8) + ord(c)
+                    fields.append( value )
+                    pos = pos + w
+                kind = fields[0] if widths[0] > 0 else IN_FILE
+                if num in self._xref:
+                    continue
+                if kind == IN_FILE:
+                    self._xref[num] = (IN_FILE, fields[1])
+                elif kind == IN_STREAM:
+                    self._xref[num] = (IN_STREAM, fields[1], fields[2])
+        return d
+
+
+    # -------------------------------------------------------------------------
+    # Private: objects
+    # -------------------------------------------------------------------------
+
+
+    def __get_page_tree(self):
+        # Return the root of the page tree.
+        catalog = self.resolve( self._trailer["Root"] )
+        if not isinstance(catalog, dict):
+            raise IOError("Bad catalog.")
+        pages = self.resolve( catalog.get("Pages") )
+        if not isinstance(pages, dict):
+            raise IOError("No page tree.")
+        return pages
+
+
+    def __get_object(self, num):
+        # Return an object from its number.
+        if num in self._objects:
+            return self._objects[num]
+        entry = self._xref.get( num )
+        if entry is None:
+            obj = None
+        elif entry[0] == IN_FILE:
+            m = RXOBJECT.match( self._data, self.__skip(entry[1]) )
+            if m is None or int(m.group(1)) != num:
+                raise IOError("Bad offset of object %d."%num)
+            obj, data = self.__read_indirect( entry[1], decode=False )
+        else:
+            data, offsets = self.__get_object_stream( entry[1] )
+            if entry[2] >= len(offsets) or offsets[entry[2]][0] != num:
+                raise IOError("Object %d is not in its stream."%num)
+            obj, pos = self.__read_object( offsets[entry[2]][1], data )
+        self._objects[num] = obj
+        return obj
+
+
+    def __get_object_stream(self, num):
+        # Return the decoded data of an object stream and the offsets of
+        # its objects.
+        if num not in self._streams:
+            entry = self._xref.get( num )
+            if entry is None or entry[0] != IN_FILE:
+                raise IOError("Bad object stream %d."%num)
+            d, data = self.__read_indirect( entry[1] )
+            if not isinstance(d, dict) or data is None:
+                raise IOError("Bad object stream %d."%num)
+            first, n = d.get("First", 0), d.get("N", 0)
+            header = data[:first].split()
+            offsets = [ (int(header[2*i]), first+int(header[2*i+1])) for i in range(min(n, len(header)//2)) ]
+            self._streams[num] = (data, offsets)
+        return self._streams[num]
+
+
+    def __read_indirect(self, pos, decode=True):
+        # Read an indirect object ("1 0 obj ... endobj") at a given offset.
+        # Return the object and the data of its stream (or None).
+        m = RXOBJECT.match( self._data, self.__skip(pos) )
+        if m is None:
+            raise IOError("Bad object at offset %d."%pos)
+        obj, pos = self.__read_object( m.end() )
+        pos = self.__skip( pos )
+        if not isinstance(obj, dict) or self._data[pos:pos+6] != "stream":
+            return obj, None
+
+        pos = pos + 6
+        if self._data[pos:pos+2] == "\r\n":
+            pos = pos + 2
+        elif self._data[pos:pos+1] in ["\n", "\r"]:
+            pos = pos + 1
+        length = obj.get("Length")
+        if isinstance(length, Reference):
+            length = self.resolve( length )
+        if not isinstance(length, (int,long)) or self._data[pos+length:pos+length+20].find("endstream") == -1:
+            end = self._data.find("endstream", pos)
+            if end == -1:
+                raise IOError("Bad stream at offset %d."%pos)
+            length = end - pos
+        if decode is False:
+            return obj, self._data[pos:pos+length]
+        return obj, self.decode( obj, self._data[pos:pos+length] )
+
+
+    def __unpredict(self, data, columns):
+        # Undo the PNG predictors (one byte per component).
+        rows = list()
+        previous = [0] * columns
+        for i in range(0, len(data) - columns, columns+1):
+            kind = ord( data[i] )
+            row = [ ord(c) for c in data[i+1:i+1+columns] ]
+            if kind == 1:
+                for j in range(1, columns):
+                    row[j] = (row[j] + row[j-1]) & 0xff
+            elif kind == 2:
+                row = [ (row[j] + previous[j]) & 0xff for j in range(columns) ]
+            elif kind == 3:
+                for j in range(columns):
+                    left = row[j-1] if j > 0 else 0
+                    row[j] = (row[j] + ((left + previous[j]) >> 1)) & 0xff
+            elif kind == 4:
+                for j in range(columns):
+                    a = row[j-1] if j > 0 else 0
+                    b = previous[j]
+                    c = previous[j-1] if j > 0 else 0
+                    p = a + b - c
+                    pa, pb, pc = abs(p-a), abs(p-b), abs(p-c)
+                    if pa <= pb and pa <= pc:
+                        row[j] = (row[j] + a) & 0xff
+                    elif pb <= pc:
+                        row[j] = (row[j] + b) & 0xff
+                    else:
+                        row[j] = (row[j] + c) & 0xff
+            elif kind != 0:
+                raise IOError("Unsupported predictor.")
+            rows.append( "".join( chr(c) for c in row ) )
+            previous = row
+        return "".join( rows )
+
+
+    # -------------------------------------------------------------------------
+    # Private: parser
+    # -------------------------------------------------------------------------
+
+
+    def __skip(self, pos, data=None):
+        # Return the position after white spaces and comments.
+        if data is None:
+            data = self._data
+        return WHITESPACES.match( data, pos ).end()
+
+
+    def __read_object(self, pos, data=None):
+        # Read a direct object. Return the object and the position after it.
+        # Strings are returned as written in the file.
+        if data is None:
+            data = self._data
+        pos = self.__skip( pos, data )
+        c = data[pos:pos+1]
+
+        if c == "<" and data[pos:pos+2] == "<<":
+            d = dict()
+            pos = pos + 2
+            while True:
+                pos = self.__skip( pos, data )
+                if data[pos:pos+2] == ">>":
+                    return d, pos+2
+                m = RXNAME.match( data, pos )
+                if m is None:
+                    raise IOError("Bad dictionary at offset %d."%pos)
+                value, pos = self.__read_object( m.end(), data )
+                d[ Name(self.__name(m.group(1))) ] = value
+
+        if c == "[":
+            a = list()
+            pos = pos + 1
+            while True:
+                pos = self.__skip( pos, data )
+                if data[pos:pos+1] == "]":
+                    return a, pos+1
+                value, pos = self.__read_object( pos, data )
+                a.append( value )
+
+        if c == "/":
+            m = RXNAME.match( data, pos )
+            return Name(self.__name(m.group(1))), m.end()
+
+        if c == "(":
+            depth = 0
+            start = pos
+            while pos < len(data):
+                c = data[pos]
+                if c == "\\":
+                    pos = pos + 1
+                elif c == "(":
+                    depth = depth + 1
+                elif c == ")":
+                    depth = depth - 1
+                    if depth == 0:
+                        return String(data[start+1:pos]), pos+1
+                pos = pos + 1
+            raise IOError("Bad string at offset %d."%start)
+
+        if c == "<":
+            end = data.find(">", pos)
+            if end == -1:
+                raise IOError("Bad string at offset %d."%pos)
+            return String(data[pos+1:end], True), end+1
+
+        m = RXREFERENCE.match( data, pos )
+        if m is not None:
+            return Reference( int(m.group(1)), int(m.group(2)) ), m.end()
+
+        m = RXNUMBER.match( data, pos )
+        if m is not None:
+            s = m.group(0)
+            if "." in s:
+                return float(s), m.end()
+            return int(s), m.end()
+
+        m = RXKEYWORD.match( data, pos )
+        if m is None:
+            raise IOError("Bad object at offset %d."%pos)
+        keyword = m.group(0)
+        if keyword == "true":
+            return True, m.end()
+        if keyword == "false":
+            return False, m.end()
+        if keyword == "null":
+            return None, m.end()
+        raise IOError("Unexpected keyword at offset %d: %s."%(pos,keyword))
+
+
+    def __name(self, name):
+        # Decode the #xx characters of a name.
+        if "#" in name:
+            name = re.sub(r"#([0-9A-Fa-f]{2})", lambda m: chr(int(m.group(1),16)), name)
+        return name
+
+# ---------------------------------------------------------------------------
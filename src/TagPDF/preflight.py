@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+
+import os
+import re
+from itertools import imap
+from multiprocessing.pool import ThreadPool
+
+import utils
+from pdfinfo import PdfInfo
+from catalog import PdfCatalog
+
+# ---------------------------------------------------------------------------
+
+class Preflight:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Check PDF files before tagging and merging them.
+
+    For each PDF file, the preflight gets:
+
+        - pages: the number of pages (as utils.countPages),
+        - paper: the paper format of the first media box (as utils.formatPages),
+        - encrypted: True if the file is encrypted,
+        - error: None, or the reason why the file can't be processed.
+
+    Files are read with PdfInfo. The external tool (see utils.get_pdf_tool)
+    is run only for the files PdfInfo can't read: it fails if it can't
+    process them later.
+
+    Files are checked by a pool of workers, and valid results are stored
+    in a catalog: a file is checked again only if its size or its
+    modification time has changed.
+
+    """
+
+    def __init__(self, catalog=None, tool=None):
+        """
+        Creates a new Preflight instance.
+
+        @param catalog (PdfCatalog) Catalog of the results.
+        @param tool (PdfTool) External tool which will process the files.
+
+        """
+        if catalog is None:
+            catalog = PdfCatalog()
+        if tool is None:
+            tool = utils.get_pdf_tool()
+        self._catalog = catalog
+        self._tool = tool
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def check(self, filenames, workers=1):
+        """
+        Check a list of PDF files, and store the results in the catalog.
+
+        @param filenames (list) Names of the PDF files.
+        @param workers (int) Number of files checked at the same time.
+        @return a dictionary with key=filename, value=result (dict).
+
+        """
+        todo = [ f for f in filenames if self.get_result(f) is None ]
+        if workers > 1 and len(todo) > 1:
+            pool = ThreadPool( min(workers, len(todo)) )
+            try:
+                results = pool.map( self.__check_file, todo )
+            finally:
+                pool.terminate()
+        else:
+            results = list( imap( self.__check_file, todo ) )
+
+        for filename, result in results:
+            # Failures are not stored: the tool may be fixed meanwhile
+            if result["error"] is None:
+                values = dict( (k, result[k]) for k in ["pages", "paper", "encrypted"] )
+                values["preflight"] = True
+                self._catalog.set_values( filename, values )
+        self._catalog.save()
+
+        checked = dict( results )
+        return dict( (f, checked[f] if f in checked else self.get_result(f)) for f in filenames )
+
+    # End check
+    # -------------------------------------------------------------------------
+
+
+    def get_result(self, filename):
+        """
+        Return the stored result of a file, or None if the file was not
+        checked or if it has changed since.
+
+        @param filename (string) Name of the PDF file.
+
+        """
+        entry = self._catalog.get_entry( filename )
+        if entry is None or entry.get("preflight") is not True:
+            return None
+        return { "pages":entry["pages"], "paper":entry["paper"], "encrypted":entry["encrypted"], "error":None }
+
+    # End get_result
+    # -------------------------------------------------------------------------
+
+
+    def get_pages(self, filename):
+        """
+        Return the number of pages of a file (checked if needed).
+
+        @param filename (string) Name of the PDF file.
+
+        """
+        result = self.get_result( filename )
+        if result is None:
+            result = self.check( [filename] )[filename]
+        if result["error"] is not None:
+            raise IOError( result["error"] )
+        return result["pages"]
+
+    # End get_pages
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __check_file(self, filename):
+        # Return the file name and its result.
+        # Executed by the workers: it must not modify self.
+        result = { "pages":0, "paper":None, "encrypted":False, "error":None }
+        if not os.path.isfile( filename ):
+            result["error"] = "Missing file."
+            return (filename, result)
+
+        try:
+            try:
+                pdfinfo = PdfInfo( filename )
+                try:
+                    result["encrypted"] = pdfinfo.is_encrypted()
+                    result["pages"] = pdfinfo.get_pages()
+                    mediabox = pdfinfo.get_mediabox()
+                finally:
+                    pdfinfo.close()
+            except Exception:
+                # Damaged file: search in the whole file, and ask the
+                # tool (it fails here if it can't tag the file later).
+                with open(filename, "rb") as fp:
+                    data = fp.read()
+                if "%PDF" not in data[:1024]:
+                    raise IOError("Not a PDF file.")
+                result["encrypted"] = re.search(r"/Encrypt\b", data) is not None
+                result["pages"] = len(re.findall(r"/Type\s*/Page([^s]|$)", data, re.MULTILINE))
+                mediabox = re.search(r"/MediaBox\s*\[([^\]]*)\]", data)
+                if mediabox is not None:
+                    mediabox = " ".join( mediabox.group(1).split() )
+                toolpages = self._tool.count_pages( filename )
+                if result["pages"] == 0:
+                    result["pages"] = toolpages
+            if mediabox is not None:
+                result["paper"] = utils.paperFormat( mediabox )
+
+            if result["encrypted"] is True:
+                raise IOError("Encrypted file.")
+            if result["pages"] < 1:
+                raise IOError("Bad number of pages.")
+        except Exception, e:
+            result["error"] = str(e)
+
+        return (filename, result)
+
+# ---------------------------------------------------------------------------
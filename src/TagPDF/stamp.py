@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+# ---------------------------------------------------------------------------
+
+import os
+import re
+import zlib
+import shutil
+
+from pdfinfo import PdfInfo, Reference, Name, String
+
+# ---------------------------------------------------------------------------
+
+# Characters of a name to be written as #xx
+RXNAMECHARS = re.compile(r"[^!-~]|[#()<>\[\]{}/%]")
+
+# ---------------------------------------------------------------------------
+
+class PdfStamper:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Stamp a PDF file with background pages, without pdftk.
+
+    This is the equivalent of "pdftk input multibackground background":
+    page i of the background file is drawn under page i of the input file
+    (the last background page is used for the next ones).
+
+    The input file is not re-written: the stamped pages are added at the
+    end of a copy of the file, as an incremental update. Each background
+    page becomes a form XObject (its objects are copied from the background
+    file), drawn first in the content of the page. The background is scaled
+    to fit the page, and rotated like the page.
+
+    Encrypted files, and files which can't be read by PdfInfo, are not
+    supported: an IOError is raised.
+
+    """
+
+    def __init__(self):
+        """
+        Creates a new PdfStamper instance.
+
+        """
+        self._objects = {}   # number -> (object, stream data or None)
+        self._copied  = {}   # number in the background file -> new number
+        self._next    = 0
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def stamp(self, inputname, backgroundname, outputname):
+        """
+        Stamp a PDF file with a background PDF file.
+
+        @param inputname (string) PDF input file name.
+        @param backgroundname (string) PDF file with the background pages.
+        @param outputname (string) PDF output file name.
+
+        """
+        self._objects = {}
+        self._copied  = {}
+
+        pdfinput = PdfInfo( inputname )
+        try:
+            pdfbackground = PdfInfo( backgroundname )
+            try:
+                if pdfinput.is_encrypted() or pdfbackground.is_encrypted():
+                    raise IOError("Encrypted files are not supported.")
+                self._next = pdfinput.get_size()
+                self.__stamp_pages( pdfinput, pdfbackground )
+                startxref, xrefstream = pdfinput.get_startxref()
+                trailer = pdfinput.get_trailer()
+            finally:
+                pdfbackground.close()
+        finally:
+            pdfinput.close()
+
+        tmpname = outputname + ".tmp"
+        try:
+            shutil.copyfile( inputname, tmpname )
+            with open(tmpname, "ab") as fp:
+                self.__write_update( fp, os.path.getsize(inputname), trailer, startxref, xrefstream )
+            os.rename( tmpname, outputname )
+        finally:
+            if os.path.exists( tmpname ):
+                os.remove( tmpname )
+
+    # End stamp
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __stamp_pages(self, pdfinput, pdfbackground):
+        # Create the new objects: forms of the background pages, and pages.
+        backgrounds = pdfbackground.get_page_list()
+        if len(backgrounds) == 0:
+            raise IOError("No background page.")
+
+        forms = {}
+        for i, (ref, page) in enumerate( pdfinput.get_page_list() ):
+            j = min(i, len(backgrounds)-1)
+            if j not in forms:
+                background = backgrounds[j][1]
+                forms[j] = (self.__create_form(pdfbackground, background), self.__get_box(pdfbackground, background))
+            formref, bbox = forms[j]
+
+            resources = pdfinput.resolve( page.get("Resources") )
+            resources = dict( resources ) if isinstance(resources, dict) else {}
+            xobjects = pdfinput.resolve( resources.get("XObject") )
+            xobjects = dict( xobjects ) if isinstance(xobjects, dict) else {}
+            name = "ProceedBackground"
+            while name in xobjects:
+                name = name + "0"
+            xobjects[ Name(name) ] = formref
+            resources[ Name("XObject") ] = xobjects
+
+            content  = "q " + self.__get_matrix( pdfinput, page, bbox )
+            content += " /" + name + " Do Q\n"
+            contents = [ self.__add_object({ Name("Length"):len(content) }, content) ]
+            original = page.get("Contents")
+            if isinstance(original, Reference) and isinstance(pdfinput.resolve(original), list):
+                original = pdfinput.resolve( original )
+            if isinstance(original, list):
+                contents.extend( original )
+            elif original is not None:
+                contents.append( original )
+
+            page = dict( page )
+            page[ Name("Resources") ] = resources
+            page[ Name("Contents") ] = contents
+            self._objects[ ref.num ] = (page, None, ref.gen)
+
+
+    def __create_form(self, pdf, page):
+        # Create a form XObject from a background page. Return its reference.
+        d = { Name("Type"):Name("XObject"), Name("Subtype"):Name("Form") }
+        d[ Name("BBox") ] = [ float(v) for v in self.__get_box(pdf, page) ]
+        d[ Name("Resources") ] = self.__copy( pdf, pdf.resolve(page.get("Resources", {})) )
+
+        contents = page.get("Contents")
+        if isinstance(contents, Reference) and isinstance(pdf.resolve(contents), list):
+            contents = pdf.resolve( contents )
+        if isinstance(contents, list) and len(contents) == 1:
+            contents = contents[0]
+        if isinstance(contents, Reference):
+            stream, data = pdf.get_stream( contents )
+            if data is None:
+                raise IOError("Bad content of a background page.")
+            for name in ["Filter", "DecodeParms"]:
+                if name in stream:
+                    d[ Name(name) ] = self.__copy( pdf, stream[name] )
+        else:
+            # Several streams are merged into a single one
+            data = ""
+            for ref in (contents or []):
+                stream, raw = pdf.get_stream( ref )
+                if raw is None:
+                    raise IOError("Bad content of a background page.")
+                data = data + pdf.decode( stream, raw ) + "\n"
+            data = zlib.compress( data )
+            d[ Name("Filter") ] = Name("FlateDecode")
+
+        d[ Name("Length") ] = len(data)
+        return self.__add_object( d, data )
+
+
+    def __get_box(self, pdf, page):
+        # Return the media box of a page, as 4 floats.
+        box = pdf.resolve( page.get("MediaBox") )
+        if not isinstance(box, list) or len(box) != 4:
+            return [0.0, 0.0, 612.0, 792.0]
+        box = [ float(pdf.resolve(v)) for v in box ]
+        return [ min(box[0],box[2]), min(box[1],box[3]), max(box[0],box[2]), max(box[1],box[3]) ]
+
+
+    def __get_matrix(self, pdf, page, bbox):
+        # Return the "cm" operators to draw the background on a page: it is
+        # scaled to fit the page, and rotated like the page.
+        x0, y0, x1, y1 = self.__get_box( pdf, page )
+        rotate = pdf.resolve( page.get("Rotate", 0) )
+        rotate = int(rotate) % 360 if isinstance(rotate, (int,long,float)) else 0
+
+        # Size of the page, as it is displayed
+        width, height = x1-x0, y1-y0
+        if rotate in [90, 270]:
+            width, height = height, width
+
+        bwidth, bheight = bbox[2]-bbox[0], bbox[3]-bbox[1]
+        scale = min( width/bwidth, height/bheight )
+        if abs(scale-1.) < 0.001:
+            scale = 1.
+        tx = (width - bwidth*scale) / 2. - bbox[0]*scale
+        ty = (height - bheight*scale) / 2. - bbox[1]*scale
+
+        rotations = { 0:[1,0,0,1,x0,y0], 90:[0,1,-1,0,x1,y0], 180:[-1,0,0,-1,x1,y1], 270:[0,-1,1,0,x0,y1] }
+        matrices = [ rotations.get(rotate, rotations[0]), [scale,0,0,scale,tx,ty] ]
+        return " ".join( " ".join(self.__format(v) for v in m) + " cm" for m in matrices )
+
+
+    def __copy(self, pdf, value):
+        # Copy a value of the background file: referenced objects are copied
+        # with a new number.
+        if isinstance(value, Reference):
+            if value.num not in self._copied:
+                obj, data = pdf.get_stream( value )
+                if isinstance(obj, dict) and obj.get("Type") in ["Page", "Pages"]:
+                    return None
+                self._copied[value.num] = self._next
+                self._next = self._next + 1
+                if data is not None:
+                    obj = dict( obj )
+                    obj[ Name("Length") ] = len(data)
+                self._objects[ self._copied[value.num] ] = (self.__copy(pdf, obj), data, 0)
+            return Reference( self._copied[value.num], 0 )
+        if isinstance(value, dict):
+            return dict( (k, self.__copy(pdf, v)) for k,v in value.items() )
+        if isinstance(value, list):
+            return [ self.__copy(pdf, v) for v in value ]
+        return value
+
+
+    def __add_object(self, obj, data=None):
+        # Add a new object. Return its reference.
+        num = self._next
+        self._next = self._next + 1
+        self._objects[num] = (obj, data, 0)
+        return Reference( num, 0 )
+
+
+    def __write_update(self, fp, offset, trailer, startxref, xrefstream):
+        # Write the new objects, their cross-reference and the trailer.
+        offsets = {}
+        fp.write( "\n" )
+        offset = offset + 1
+        for num in sorted( self._objects.keys() ):
+            obj, data, gen = self._objects[num]
+            s = "%d %d obj\n%s\n" % (num, gen, self.__format(obj))
+            if data is not None:
+                s = s + "stream\n" + data + "\nendstream\n"
+            s = s + "endobj\n"
+            offsets[num] = (offset, gen)
+            fp.write( s )
+            offset = offset + len(s)
+
+        d = dict( (Name(k), trailer[k]) for k in ["Root", "Info", "ID"] if k in trailer )
+        d[ Name("Prev") ] = startxref
+        d[ Name("Size") ] = self._next
+
+        if xrefstream is True:
+            # The update of a file with a cross-reference stream must have
+            # a cross-reference stream too
+            num = self._next
+            offsets[num] = (offset, 0)
+            d[ Name("Size") ] = num + 1
+            d[ Name("Type") ] = Name("XRef")
+            d[ Name("W") ] = [1, 4, 2]
+            d[ Name("Index") ] = list()
+            data = ""
+            for first, count in self.__get_ranges( offsets ):
+                d[ Name("Index") ].extend( [first, count] )
+                for n in range(first, first+count):
+                    data = data + chr(1) + "".join( chr((offsets[n][0] >> s) & 0xff) for s in [24,16,8,0] )
+                    data = data + chr((offsets[n][1] >> 8) & 0xff) + chr(offsets[n][1] & 0xff)
+            d[ Name("Length") ] = len(data)
+            fp.write( "%d 0 obj\n%s\nstream\n%s\nendstream\nendobj\n" % (num, self.__format(d), data) )
+        else:
+            fp.write( "xref\n" )
+            for first, count in self.__get_ranges( offsets ):
+                fp.write( "%d %d\n" % (first, count) )
+                for n in range(first, first+count):
+                    fp.write( "%010d %05d n \n" % offsets[n] )
+            fp.write( "trailer\n%s\n" % self.__format(d) )
+
+        fp.write( "startxref\n%d\n%%%%EOF\n" % offset )
+
+
+    def __get_ranges(self, offsets):
+        # Return the ranges (first, count) of consecutive object numbers.
+        ranges = list()
+        for num in sorted( offsets.keys() ):
+            if len(ranges) > 0 and ranges[-1][0] + ranges[-1][1] == num:
+                ranges[-1][1] = ranges[-1][1] + 1
+            else:
+                ranges.append( [num, 1] )
+        return ranges
+
+
+    def __format(self, value):
+        # Write a PDF object.
+        if isinstance(value, Reference):
+            return "%d %d R" % (value.num, value.gen)
+        if isinstance(value, Name):
+            return "/" + RXNAMECHARS.sub( lambda m: "#%02X" % ord(m.group(0)), value )
+        if isinstance(value, String):
+            if value.hexa is True:
+                return "<" + value + ">"
+            return "(" + value + ")"
+        if isinstance(value, bool):
+            return "true" if value is True else "false"
+        if isinstance(value, (int,long)):
+            return str(value)
+        if isinstance(value, float):
+            s = ("%.5f" % value).rstrip("0").rstrip(".")
+            if s in ["", "-0"]:
+                return "0"
+            return s
+        if isinstance(value, list):
+            return "[" + " ".join( self.__format(v) for v in value ) + "]"
+        if isinstance(value, dict):
+            return "<<" + " ".join( self.__format(Name(k)) + " " + self.__format(v) for k,v in value.items() ) + ">>"
+        if value is None:
+            return "null"
+        raise TypeError("Unsupported PDF object: %r" % value)
+
+# ---------------------------------------------------------------------------
@@ -42,6 +42,7 @@ __docformat__ = "epytext"
 
 from genPDF import GenPdfFile
 from name import GenName
+from stamp import PdfStamper
 import utils
 import os
 import logging
@@ -63,11 +64,52 @@ class tagPdfFile( GenPdfFile ):
 
         """
         GenPdfFile.__init__(self)
+        self.__stampbackends = ["auto", "pdftk", "qpdf", "python"]
+        self.__stampbackend  = "auto"
 
     # End __init__
     # -------------------------------------------------------------------------
 
 
+    def set_stamp_backend(self, backend):
+        """
+        Fix the program used to stamp the header/footer on a PDF file.
+
+        @param backend (string) one of auto (the fastest external tool, see
+        utils.get_pdf_tool), pdftk, qpdf, or python (in-process, see
+        PdfStamper).
+
+        """
+        if backend not in self.__stampbackends:
+            raise TypeError
+        self.__stampbackend = backend
+
+    # End set_stamp_backend
+    # -------------------------------------------------------------------------
+
+
+    def get_stamp_backend(self):
+        """
+        Return the program used to stamp the header/footer.
+
+        """
+        return self.__stampbackend
+
+    # End get_stamp_backend
+    # -------------------------------------------------------------------------
+
+
+    def get_list_stamp_backends(self):
+        """
+        Return the list of accepted stamp backends.
+
+        """
+        return self.__stampbackends
+
+    # End get_list_stamp_backends
+    # -------------------------------------------------------------------------
+
+
     def tagDir(self, inputname, outputname):
         """
         Tag all PDF files of a directory.
@@ -101,43 +143,115 @@ class tagPdfFile( GenPdfFile ):
     # -------------------------------------------------------------------------
 
 
-    def tagFile(self, inputname, outputname):
+    def tagFile(self, inputname, outputname, copies=None):
         """
         Tag a PDF file.
-        This function requires 'pdftk' to be installed.
+        This function requires 'pdflatex' and 'pdftk' or 'qpdf' to be
+        installed.
+
+        The header/footer is created and stamped only once, even if the
+        result is expected in several files: copies are hard links (or
+        real copies if links are not supported).
 
         @param inputname (string) PDF input file name (including path).
         @param outputname (string) PDF output file name (including path).
+        @param copies (list) Other output file names (including path).
         @return The number of pages of the pdf file.
 
         """
-        N = utils.countPages( inputname )
+        N = utils.countPages( inputname, self.__get_pdf_tool() )
         self.set_number_of_pages( N )
 
         # Create an empty PDF file, with only the Header and Footer
         fname = os.path.join(os.getcwd(), GenName().get_name())
         self.exportPDF(fname+".pdf")
-        
-        # Program name:
-        # pdftk [pdf-file] background [background-file] output [result-file]
-        command  = 'pdftk '
-        command += '"'+ inputname + '" multibackground '
-        command += '"' + fname+'.pdf" '
-        command += " output "
-        command += '"'+outputname+'"'
-
-        ret = utils.run_command( command )
-
-        if len(ret.strip())>0:
-            if os.path.exists(outputname):
-                os.remove(outputname)
-            raise IOError('pdftk failed to tag the file: '+ret)
-
-        if not os.path.exists(outputname):
-            raise IOError('File not created.')
-        os.remove(fname+".pdf")
+
+        try:
+            self.stampFile( inputname, fname+".pdf", outputname, copies )
+        finally:
+            if os.path.exists(fname+".pdf"):
+                os.remove(fname+".pdf")
 
         return N
 
     # End tagFile
     # -------------------------------------------------------------------------
+
+
+    def exportOverlays(self, filename, overlays):
+        """
+        Create the header/footer pages of several PDF files at once.
+        This function requires 'pdflatex' to be installed.
+
+        All overlays are compiled in a single PDF file: overlay i is made
+        of the pages returned at index i.
+
+        @param filename (string) PDF output file name (including path).
+        @param overlays (list) Dictionaries of options (see set_overlays).
+        @return The list of (first page, last page) of each overlay.
+
+        """
+        self.set_overlays( overlays )
+        try:
+            self.exportPDF( filename )
+        finally:
+            self.set_overlays( None )
+
+        ranges = list()
+        first  = 1
+        for overlay in overlays:
+            last = first + int(overlay["numberofpages"]) - 1
+            ranges.append( (first,last) )
+            first = last + 1
+
+        if utils.countPages( filename, self.__get_pdf_tool() ) != first-1:
+            raise IOError('pdflatex did not create the expected number of pages.')
+
+        return ranges
+
+    # End exportOverlays
+    # -------------------------------------------------------------------------
+
+
+    def stampFile(self, inputname, backgroundname, outputname, copies=None):
+        """
+        Stamp a PDF file with an existing header/footer PDF file.
+        Except with the python stamp backend, this function requires
+        'pdftk' or 'qpdf' to be installed.
+
+        @param inputname (string) PDF input file name (including path).
+        @param backgroundname (string) PDF file with the header/footer pages.
+        @param outputname (string) PDF output file name (including path).
+        @param copies (list) Other output file names (including path).
+
+        """
+        # Do not write into a file which is possibly linked to a copy
+        if os.path.exists(outputname):
+            os.remove(outputname)
+
+        if self.__stampbackend == "python":
+            PdfStamper().stamp( inputname, backgroundname, outputname )
+        else:
+            utils.get_pdf_tool( self.__stampbackend ).stamp( inputname, backgroundname, outputname )
+
+        for copyname in (copies or []):
+            utils.link_or_copy( outputname, copyname )
+
+    # End stampFile
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __get_pdf_tool(self):
+        # Return the name of the external tool of the stamp backend (see
+        # utils.get_pdf_tool), used when a file can't be read.
+        if self.__stampbackend in utils.PDF_TOOLS:
+            return self.__stampbackend
+        return "auto"
+
+    # End __get_pdf_tool
+    # -------------------------------------------------------------------------
@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf8 -*-
+# ---------------------------------------------------------------------------
+#         ___    __    ___    ___  ____  ____   __
+#         |  \  |  \  |   |  /     |     |     |  \   Automatic
+#         |__/  |__/  |   |  |     |__   |__   |   |    Conference
+#         |     |\_   |   |  |     |     |     |   |    Proceedings
+#         |     |  \  |___|  \___  |___  |___  |__/   Generator
+#        ==========================================================
+#
+#           http://www.lpl-aix.fr/~bigi/
+#
+# ---------------------------------------------------------------------------
+# developed at:
+#
+#       Laboratoire Parole et Langage
+#
+#       Copyright (C) 2013-2014  Brigitte Bigi
+#
+#       Use of this software is governed by the GPL, v3
+#       This banner notice must not be removed
+# ---------------------------------------------------------------------------
+#
+# Proceed is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Proceed is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Proceed. If not, see <http://www.gnu.org/licenses/>.
+#
+# ---------------------------------------------------------------------------
+
+__docformat__ = "epytext"
+
+# ---------------------------------------------------------------------------
+
+import os
+import hashlib
+import threading
+
+import utils
+
+# ---------------------------------------------------------------------------
+
+class TagCache:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Persistent cache of tagged PDF files.
+
+    A tagged file depends on two things: the content of the input PDF
+    file, and the options of its header/footer (page number, texts, colors,
+    paper...). Both are hashed separately, so that the header/footer pages
+    (the overlay) can be re-used when only the input file has changed:
+
+        - overlays/<overlaykey>.pdf is the header/footer of a file,
+        - tagged/<inputkey>-<overlaykey>.pdf is the tagged file.
+
+    """
+
+    def __init__(self, dirname, catalog=None):
+        """
+        Creates a new TagCache instance.
+
+        @param dirname (string) Directory of the cache (created if needed).
+        @param catalog (PdfCatalog) Catalog of the hash of the input files.
+
+        """
+        self._dirname = dirname
+        self._catalog = catalog
+        for subdir in ["overlays", "tagged"]:
+            if not os.path.isdir( os.path.join(dirname, subdir) ):
+                os.makedirs( os.path.join(dirname, subdir) )
+
+        # Hash of the input files, and the cached files used by this session
+        self._inputkeys = {}
+        self._used = set()
+        self._lock = threading.Lock()
+
+    # End __init__
+    # -------------------------------------------------------------------------
+
+
+    def get_overlay(self, options):
+        """
+        Return the file name of the header/footer pages, or None.
+
+        @param options (dict) Options of the header/footer (see get_options).
+
+        """
+        filename = self.__overlay_name( options )
+        if os.path.exists( filename ):
+            self._used.add( filename )
+            return filename
+        return None
+
+    # End get_overlay
+    # -------------------------------------------------------------------------
+
+
+    def add_overlay(self, options, filename):
+        """
+        Store the header/footer pages; the file is moved into the cache.
+
+        @param options (dict) Options of the header/footer (see get_options).
+        @param filename (string) PDF file to store.
+        @return The file name in the cache.
+
+        """
+        cachename = self.__overlay_name( options )
+        self.__store( filename, cachename )
+        return cachename
+
+    # End add_overlay
+    # -------------------------------------------------------------------------
+
+
+    def get_tagged(self, inputname, options, outputname, copies=None):
+        """
+        Copy a tagged file from the cache to its outputs.
+
+        @param inputname (string) PDF input file name.
+        @param options (dict) Options of the header/footer (see get_options).
+        @param outputname (string) PDF output file name.
+        @param copies (list) Other output file names.
+        @return True if the file was in the cache.
+
+        """
+        cachename = self.__tagged_name( inputname, options )
+        if not os.path.exists( cachename ):
+            return False
+
+        self._used.add( cachename )
+        for name in [outputname] + (copies or []):
+            utils.link_or_copy( cachename, name )
+        return True
+
+    # End get_tagged
+    # -------------------------------------------------------------------------
+
+
+    def add_tagged(self, inputname, options, outputname):
+        """
+        Store a copy of a tagged file.
+
+        @param inputname (string) PDF input file name.
+        @param options (dict) Options of the header/footer (see get_options).
+        @param outputname (string) Tagged PDF file.
+
+        """
+        cachename = self.__tagged_name( inputname, options )
+        tmpname = cachename + ".tmp" + str(threading.current_thread().ident)
+        utils.link_or_copy( outputname, tmpname )
+        self.__store( tmpname, cachename )
+
+    # End add_tagged
+    # -------------------------------------------------------------------------
+
+
+    def clean(self):
+        """
+        Remove all cached files which were not used by this session.
+        """
+        for subdir in ["overlays", "tagged"]:
+            dirname = os.path.join(self._dirname, subdir)
+            for f in os.listdir( dirname ):
+                filename = os.path.join(dirname, f)
+                if filename not in self._used:
+                    os.remove( filename )
+
+    # End clean
+    # -------------------------------------------------------------------------
+
+
+    # -------------------------------------------------------------------------
+    # Private
+    # -------------------------------------------------------------------------
+
+
+    def __store(self, filename, cachename):
+        # Move a file into the cache (replacing a previous version).
+        if os.path.exists( cachename ):
+            os.remove( cachename )
+        os.rename( filename, cachename )
+        self._used.add( cachename )
+
+
+    def __overlay_name(self, options):
+        # Cache file name of the header/footer pages.
+        return os.path.join(self._dirname, "overlays", self.__options_key(options) + ".pdf")
+
+
+    def __tagged_name(self, inputname, options):
+        # Cache file name of a tagged file.
+        key = self.__input_key(inputname) + "-" + self.__options_key(options)
+        return os.path.join(self._dirname, "tagged", key + ".pdf")
+
+
+    def __options_key(self, options):
+        # Hash of the options of the header/footer pages.
+        h = hashlib.sha1()
+        for name in sorted(options.keys()):
+            value = options[name]
+            if isinstance(value, str):
+                value = value.decode('utf-8')
+            h.update( (u"%s=%s\n" % (name, value)).encode('utf-8') )
+        return h.hexdigest()
+
+
+    def __input_key(self, inputname):
+        # Hash of the content of an input file (computed once).
+        with self._lock:
+            if inputname in self._inputkeys:
+                return self._inputkeys[inputname]
+        if self._catalog is not None:
+            key = self._catalog.get_hash( inputname )
+        else:
+            key = utils.hash_file( inputname )
+        with self._lock:
+            self._inputkeys[inputname] = key
+        return key
+
+# ---------------------------------------------------------------------------
@@ -43,7 +43,12 @@ __docformat__ = "epytext"
 from subprocess import Popen, PIPE, STDOUT
 import re
 import codecs
+import hashlib
+import shutil
+import time
+import threading
 from name import GenName
+from pdfinfo import PdfInfo
 import os
 
 # ---------------------------------------------------------------------------
@@ -64,17 +69,102 @@ def run_command(command):
 # ------------------------------------------------------------------------
 
 
+def run_command_status(command, cwd=None):
+    """
+    Execute a command, wait, and return its exit status and its output.
+
+    @param command is a string to represent the command to execute
+    @param cwd is the working directory of the command (None for the current one)
+
+    """
+    p = Popen(command, shell=True, stdout=PIPE, stderr=STDOUT, cwd=cwd)
+    line = p.communicate()
+    return p.returncode, line[0]
+
+# End run_command_status
+# ------------------------------------------------------------------------
+
 
-def countPages(filename):
+def find_program(name):
+    """
+    Return the full name of a program of the PATH, or None.
+
+    @param name (string) Name of the program.
+
+    """
+    for dirname in os.environ.get("PATH", "").split(os.pathsep):
+        filename = os.path.join(dirname.strip('"'), name)
+        for ext in ["", ".exe"]:
+            if os.path.isfile(filename+ext) and os.access(filename+ext, os.X_OK):
+                return filename+ext
+    return None
+
+# End find_program
+# ------------------------------------------------------------------------
+
+
+
+def link_or_copy(src, dst):
+    """
+    Make dst a hard link to src, or a copy of src if links are not supported.
+
+    @param src (string) Existing file name.
+    @param dst (string) File name to create (removed first if existing).
+
+    """
+    if os.path.exists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+    except (OSError, AttributeError):
+        shutil.copyfile(src, dst)
+
+# End link_or_copy
+# ------------------------------------------------------------------------
+
+
+def hash_file(filename):
+    """
+    Return the SHA-1 hash of the content of a file (an hexadecimal string).
+
+    @param filename (string) File to be hashed.
+
+    """
+    h = hashlib.sha1()
+    with open(filename, "rb") as fp:
+        while True:
+            data = fp.read(1048576)
+            if not data:
+                break
+            h.update(data)
+    return h.hexdigest()
+
+# End hash_file
+# ------------------------------------------------------------------------
+
+
+def countPages(filename, tool="auto"):
     """
     Estimates the number of pages of a PDF document.
 
     @param filename (string) File to be counted.
+    @param tool (string) External tool to use (see get_pdf_tool).
     @return (int)
 
-    This function requires pdftk to be installed.
+    The number of pages is read from the page tree (see PdfInfo). If the
+    file can't be read this way, pages are counted in the whole file, and
+    the external tool is used if none is found.
 
     """
+    try:
+        pdfinfo = PdfInfo( filename )
+        try:
+            return pdfinfo.get_pages()
+        finally:
+            pdfinfo.close()
+    except Exception:
+        pass
+
     try:
         data = file(filename,"rb").read()
     except Exception,e:
@@ -83,19 +173,7 @@ def countPages(filename):
     rxcountpages = re.compile(r"/Type\s*/Page([^s]|$)", re.MULTILINE|re.DOTALL)
     nbpages = len(rxcountpages.findall(data))
     if nbpages == 0:
-        outputname = GenName().get_name()
-        # call pdftk!
-        command  = 'pdftk '
-        command += filename + ' dump_data output '
-        command += outputname
-        ret = run_command( command )
-        if not os.path.exists(outputname):
-            raise IOError
-        fp = open(outputname, 'r')
-        for line in fp:
-            if "NumberOfPages:" in line:
-                nbpages = int(line.split()[1])
-        os.remove(outputname)
+        nbpages = get_pdf_tool( tool ).count_pages( filename )
 
     return nbpages
 
@@ -103,6 +181,23 @@ def countPages(filename):
 # ------------------------------------------------------------------------
 
 
+def extract_pages(inputname, first, last, outputname, tool="auto"):
+    """
+    Copy a range of pages of a PDF document into a new PDF document.
+
+    @param inputname (string) PDF input file name.
+    @param first (int) First page to copy (the first page of the file is 1).
+    @param last (int) Last page to copy.
+    @param outputname (string) PDF output file name.
+    @param tool (string) External tool to use (see get_pdf_tool).
+
+    """
+    get_pdf_tool( tool ).extract_pages( inputname, first, last, outputname )
+
+# End extract_pages
+# ------------------------------------------------------------------------
+
+
 def formatPages(filename):
     """
     Convert the "numeric size" of a PDF document to a "paper format".
@@ -110,7 +205,16 @@ def formatPages(filename):
     @param filanem (string) File to be observed to get the size.
 
     """
-    mediabox = {"0 0 595 842":"a4paper", "0 0 595.276 841.89":"a4paper", "0 0 612 792":"letterpaper", "0 0 498.898 708.661":"b5paper", "0 0 419.528 595.276":"a5paper"}
+    try:
+        pdfinfo = PdfInfo( filename )
+        try:
+            fsize = pdfinfo.get_mediabox()
+        finally:
+            pdfinfo.close()
+        if fsize is not None:
+            return paperFormat(fsize)
+    except Exception:
+        pass
 
     #try:
     fp = open(filename, 'r')
@@ -132,6 +236,22 @@ def formatPages(filename):
     if fsize is None:
         return IOError
 
+    return paperFormat(fsize)
+
+# End formatPages
+# ------------------------------------------------------------------------
+
+
+def paperFormat(fsize):
+    """
+    Convert a media box to a "paper format".
+
+    @param fsize (string) Media box, like "0 0 595 842".
+    @return (string) one of a4paper, letterpaper, b5paper, a5paper
+
+    """
+    mediabox = {"0 0 595 842":"a4paper", "0 0 595.276 841.89":"a4paper", "0 0 612 792":"letterpaper", "0 0 498.898 708.661":"b5paper", "0 0 419.528 595.276":"a5paper"}
+
     # Nice: the format is exactly good!
     if fsize in mediabox:
         return mediabox[ fsize ]
@@ -145,5 +265,227 @@ def formatPages(filename):
 
     return "a4paper"
 
-# End formatPages
+# End paperFormat
+# ------------------------------------------------------------------------
+
+
+# ---------------------------------------------------------------------------
+# External tools to process PDF files
+# ---------------------------------------------------------------------------
+
+class PdfTool:
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Base class of the external tools to process PDF files.
+
+    A tool defines:
+
+        - stamp(inputname, backgroundname, outputname): draw page i of
+          backgroundname under page i of inputname,
+        - merge(filenames, outputname): concatenate PDF files,
+        - extract_pages(inputname, first, last, outputname): copy the
+          pages first to last of a PDF file,
+        - count_pages(filename): return the number of pages of a PDF file.
+
+    All of them raise an IOError if the tool failed.
+
+    """
+
+    name     = None
+    statuses = [0]  # Exit statuses of the program when it succeeded
+
+    def is_available(self):
+        """ Return True if the program of the tool is installed. """
+        return find_program( self.name ) is not None
+
+    def _run(self, command, outputname, message):
+        # Execute a command which creates outputname (if not None), and
+        # return its output.
+        status, ret = run_command_status( command )
+        if status not in self.statuses or (outputname is not None and not os.path.exists(outputname)):
+            if outputname is not None and os.path.exists(outputname):
+                os.remove(outputname)
+            raise IOError(message+ret.strip())
+        return ret
+
+# ---------------------------------------------------------------------------
+
+
+class PdftkTool( PdfTool ):
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Process PDF files with pdftk.
+
+    """
+
+    name = "pdftk"
+
+    def stamp(self, inputname, backgroundname, outputname):
+        # pdftk [pdf-file] multibackground [background-file] output [result-file]
+        command  = 'pdftk '
+        command += '"'+ inputname + '" multibackground '
+        command += '"' + backgroundname + '" '
+        command += " output "
+        command += '"'+outputname+'"'
+        self._run( command, outputname, 'pdftk failed to tag the file: ' )
+
+    def merge(self, filenames, outputname):
+        command = 'pdftk '
+        for filename in filenames:
+            command = command + '"' + filename + '" '
+        command += " output " + '"' + outputname + '" '
+        self._run( command, outputname, 'pdftk can not merge files due to the following reason: \n' )
+
+    def extract_pages(self, inputname, first, last, outputname):
+        command  = 'pdftk '
+        command += '"' + inputname + '" cat ' + str(first) + '-' + str(last)
+        command += ' output "' + outputname + '"'
+        self._run( command, outputname, 'pdftk failed to extract pages: ' )
+
+    def count_pages(self, filename):
+        ret = self._run( 'pdftk "' + filename + '" dump_data', None, "pdftk can't read the file: " )
+        m = re.search(r"^NumberOfPages:\s*(\d+)", ret, re.MULTILINE)
+        if m is None:
+            raise IOError("pdftk can't read the file: "+ret.strip())
+        return int( m.group(1) )
+
+# ---------------------------------------------------------------------------
+
+
+class QpdfTool( PdfTool ):
+    """
+    @authors: Brigitte Bigi
+    @contact: brigitte.bigi@gmail.com
+    @license: GPL
+    @summary: Process PDF files with qpdf.
+
+    qpdf exits with status 3 when it succeeded with warnings.
+
+    """
+
+    name     = "qpdf"
+    statuses = [0, 3]
+
+    def stamp(self, inputname, backgroundname, outputname):
+        # As pdftk multibackground, the last background page is repeated
+        command  = 'qpdf "' + inputname + '" '
+        command += '--underlay "' + backgroundname + '" --to=1-z --from=1-z --repeat=z -- '
+        command += '"' + outputname + '"'
+        self._run( command, outputname, 'qpdf failed to tag the file: ' )
+
+    def merge(self, filenames, outputname):
+        command = 'qpdf --empty --pages '
+        for filename in filenames:
+            command = command + '"' + filename + '" '
+        command += '-- "' + outputname + '"'
+        self._run( command, outputname, 'qpdf can not merge files due to the following reason: \n' )
+
+    def extract_pages(self, inputname, first, last, outputname):
+        command  = 'qpdf --empty --pages "' + inputname + '" ' + str(first) + '-' + str(last)
+        command += ' -- "' + outputname + '"'
+        self._run( command, outputname, 'qpdf failed to extract pages: ' )
+
+    def count_pages(self, filename):
+        ret = self._run( 'qpdf --show-npages "' + filename + '"', None, "qpdf can't read the file: " )
+        if not ret.strip().split("\n")[-1].isdigit():
+            raise IOError("qpdf can't read the file: "+ret.strip())
+        return int( ret.strip().split("\n")[-1] )
+
+# ---------------------------------------------------------------------------
+
+PDF_TOOLS = { "pdftk":PdftkTool, "qpdf":QpdfTool }
+
+# The fastest tool, found by select_pdf_tool
+_fastest_tool = None
+_fastest_lock = threading.Lock()
+
+# ---------------------------------------------------------------------------
+
+
+def get_empty_pdf():
+    """
+    Return a small valid PDF file (one empty page, with its cross-reference
+    table), to compare the tools: qpdf warns about a file without xref.
+
+    """
+    objects = [ "<< /Type /Catalog /Pages 2 0 R >>",
+                "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>" ]
+    data = "%PDF-1.4\n"
+    offsets = list()
+    for i, obj in enumerate(objects):
+        offsets.append( len(data) )
+        data += "%d 0 obj\n%s\nendobj\n" % (i+1, obj)
+    startxref = len(data)
+    data += "xref\n0 %d\n0000000000 65535 f \n" % (len(objects)+1)
+    for offset in offsets:
+        data += "%010d 00000 n \n" % offset
+    data += "trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects)+1, startxref)
+    return data
+
+# End get_empty_pdf
+# ------------------------------------------------------------------------
+
+
+def get_pdf_tool(name="auto"):
+    """
+    Return an external tool to process PDF files.
+
+    @param name (string) pdftk, qpdf, or auto for the fastest tool which is
+    installed (see select_pdf_tool).
+    @return a PdfTool
+
+    """
+    if name == "auto":
+        return select_pdf_tool()
+    if name not in PDF_TOOLS:
+        raise TypeError
+    return PDF_TOOLS[name]()
+
+# End get_pdf_tool
+# ------------------------------------------------------------------------
+
+
+def select_pdf_tool():
+    """
+    Return the fastest external tool which is installed.
+
+    Tools are compared once (the first time this function is called): each
+    tool counts the pages of a small PDF file. If no tool is installed,
+    pdftk is returned.
+
+    """
+    global _fastest_tool
+    with _fastest_lock:
+        if _fastest_tool is None:
+            tools = [ PDF_TOOLS[name]() for name in sorted(PDF_TOOLS.keys()) ]
+            tools = [ tool for tool in tools if tool.is_available() ]
+            if len(tools) == 0:
+                _fastest_tool = PdftkTool()
+            elif len(tools) == 1:
+                _fastest_tool = tools[0]
+            else:
+                fname = os.path.join(os.getcwd(), GenName().get_name()) + ".pdf"
+                with open(fname, "w") as fp:
+                    fp.write( get_empty_pdf() )
+                durations = list()
+                try:
+                    for tool in tools:
+                        start = time.time()
+                        try:
+                            for i in range(2):
+                                tool.count_pages( fname )
+                            durations.append( (time.time()-start, tool) )
+                        except Exception:
+                            pass
+                finally:
+                    os.remove( fname )
+                _fastest_tool = min(durations)[1] if len(durations) > 0 else tools[0]
+        return _fastest_tool
+
+# End select_pdf_tool
 # ------------------------------------------------------------------------